@@ -0,0 +1,106 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from ahp_function import ahp_weights, consistency
+
+# Batas jumlah hasil AHP yang disimpan di cache (LRU)
+MAX_ENTRIES = 256
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "evictions": 0, "seeded": 0}
+
+# Fungsi hash isi matriks dan label
+def matrix_hash(matrix, labels):
+    """Hash konten (blake2b) dari byte matriks float64, ukuran matriks dan label."""
+    matrix = np.ascontiguousarray(matrix, dtype=np.float64)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr(matrix.shape).encode())
+    digest.update(matrix.tobytes())
+    digest.update("\x1f".join(str(label) for label in labels).encode())
+    return digest.hexdigest()
+
+# Simpan hasil ke cache dan buang entri paling lama jika melebihi batas
+def _put(key, value):
+    _cache[key] = value
+    _cache.move_to_end(key)
+    while len(_cache) > MAX_ENTRIES:
+        _cache.popitem(last=False)
+        _stats["evictions"] += 1
+
+# Bekukan array bobot karena objek yang sama dibagikan ke semua pemanggil
+def _entry(weights, lambda_max, CI, CR, RI):
+    weights = np.array(weights, dtype=float)
+    weights.setflags(write=False)
+    return (weights, float(lambda_max), float(CI), float(CR), float(RI))
+
+# Fungsi untuk memasukkan hasil yang sudah dihitung ke cache
+def store(matrix, labels, weights, lambda_max, CI, CR, RI, method="geometric"):
+    key = (matrix_hash(matrix, labels), method)
+    with _lock:
+        _put(key, _entry(weights, lambda_max, CI, CR, RI))
+    return key[0]
+
+# Fungsi utama: bobot AHP dari cache, dihitung hanya jika belum ada
+def cached_ahp_weights(matrix, labels, method="geometric"):
+    """Mengembalikan (W, lambda_max, CI, CR, RI) tanpa membuat DataFrame."""
+    key = (matrix_hash(matrix, labels), method)
+    with _lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            _stats["hits"] += 1
+            return _cache[key]
+        _stats["misses"] += 1
+
+    matrix = np.asarray(matrix, dtype=float)
+    if matrix.shape[0] == 0:
+        raise ValueError("Matrix is empty. Please provide a valid comparison matrix.")
+    W_I, _ = ahp_weights(matrix, method=method)
+    lambda_max, CI, CR, RI = consistency(matrix, W_I)
+
+    value = _entry(W_I, lambda_max, CI, CR, RI)
+    with _lock:
+        _put(key, value)
+    return value
+
+# Muat bobot sub-kriteria yang tersimpan di file ke cache setelah hash-nya diverifikasi
+def seed_from_results(ahp_results):
+    """Mengisi cache dari ahp_results["sub_results"] yang memiliki "matrix_hash" cocok.
+
+    Mengembalikan jumlah hasil yang berhasil dimuat. Hasil tanpa hash (file lama)
+    atau yang hash-nya tidak cocok dengan matriks tersimpan akan dihitung ulang.
+    """
+    if not ahp_results or "sub_results" not in ahp_results:
+        return 0
+
+    seeded = 0
+    for criteria, sub_result in ahp_results["sub_results"].items():
+        saved_hash = sub_result.get("matrix_hash")
+        matrix = ahp_results.get("sub_matrices", {}).get(criteria)
+        labels = ahp_results.get("sub_criteria_dict", {}).get(criteria)
+        if saved_hash is None or matrix is None or labels is None:
+            continue
+        if matrix_hash(matrix, labels) != saved_hash:
+            continue
+        with _lock:
+            _put((saved_hash, "geometric"), _entry(
+                sub_result["weights_sub"], sub_result["lambda_max_sub"],
+                sub_result["CI_sub"], sub_result["CR_sub"], sub_result["RI_sub"]
+            ))
+            _stats["seeded"] += 1
+        seeded += 1
+    return seeded
+
+# Statistik cache untuk melihat penghematan perhitungan
+def cache_info():
+    with _lock:
+        return {**_stats, "size": len(_cache), "max_entries": MAX_ENTRIES}
+
+def cache_clear():
+    with _lock:
+        _cache.clear()
+        for key in _stats:
+            _stats[key] = 0
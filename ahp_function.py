@@ -1,15 +1,15 @@
 import numpy as np
 
+from ahp_solver import priority_vector
+
 # Fungsi untuk menghitung bobot
-def ahp_weights(matrix_comparism):
+def ahp_weights(matrix_comparism, method="geometric", tol=1e-12):
     # Pastikan matrix_comparism berupa numpy.ndarray
     if not isinstance(matrix_comparism, np.ndarray):
         matrix_comparism = np.array(matrix_comparism)
 
-    n = matrix_comparism.shape[0]
-    M_I = np.prod(matrix_comparism, axis=1)
-    W_bar_I = np.power(M_I, 1/n)
-    W_I = W_bar_I / np.sum(W_bar_I)
+    # Rata-rata geometrik dihitung di ruang log (lihat ahp_solver) agar tidak overflow untuk n besar
+    W_I, W_bar_I = priority_vector(matrix_comparism, method=method, tol=tol)
     return W_I, W_bar_I
 
 # Dictionary Random Index (RI)
@@ -46,7 +46,7 @@ def consistency(matrix_comparism, W_I):
     return lambda_max, CI, CR, RI
 
 # Fungsi utama untuk AHP
-def ahp_rumus(matrix_comparism, labels):
+def ahp_rumus(matrix_comparism, labels, method="geometric", tol=1e-12):
     # Pastikan matrix_comparism berupa numpy.ndarray
     if not isinstance(matrix_comparism, np.ndarray):
         matrix_comparism = np.array(matrix_comparism)
@@ -54,7 +54,7 @@ def ahp_rumus(matrix_comparism, labels):
     if matrix_comparism.shape[0] == 0:  # Matriks kosong
         raise ValueError("Matrix is empty. Please provide a valid comparison matrix.")
 
-    W_I, W_bar_I = ahp_weights(matrix_comparism)
+    W_I, W_bar_I = ahp_weights(matrix_comparism, method=method, tol=tol)
     lambda_max, CI, CR, RI = consistency(matrix_comparism, W_I)
     
     # Buat DataFrame hasil
@@ -63,3 +63,99 @@ def ahp_rumus(matrix_comparism, labels):
     df['Weight'] = W_I
 
     return df, W_I, lambda_max, CI, CR, RI
+
+# ----------------- Versi batch (banyak matriks sekaligus) -----------------
+
+# Susun daftar matriks (boleh berbeda ukuran) menjadi tensor (k, n, n) berpadding
+def stack_matrices(matrices, sizes=None):
+    """Mengembalikan (tensor [k, n, n], sizes [k]) dengan padding nilai 1."""
+    if isinstance(matrices, np.ndarray) and matrices.ndim == 3:
+        stack = matrices.astype(float, copy=False)
+        if sizes is None:
+            sizes = np.full(stack.shape[0], stack.shape[1], dtype=np.intp)
+        return stack, np.asarray(sizes, dtype=np.intp)
+
+    matrices = [np.asarray(m, dtype=float) for m in matrices]
+    sizes = np.array([m.shape[0] for m in matrices], dtype=np.intp)
+    n_max = int(sizes.max()) if len(sizes) else 0
+    stack = np.ones((len(matrices), n_max, n_max), dtype=float)
+    for i, m in enumerate(matrices):
+        stack[i, :m.shape[0], :m.shape[0]] = m
+    return stack, sizes
+
+# Fungsi untuk menghitung bobot seluruh matriks sekaligus
+def ahp_weights_batch(stack, sizes, method="geometric", tol=1e-12):
+    """Versi batch dari ahp_weights; bobot pada posisi padding bernilai 0."""
+    return priority_vector(stack, method=method, sizes=sizes, tol=tol)
+
+# Tabel RI dalam bentuk array agar bisa diambil sekaligus
+_RI_TABLE = np.array([Dict_RI.get(n, 0) for n in range(max(Dict_RI) + 1)], dtype=float)
+
+# Fungsi untuk menghitung konsistensi seluruh matriks sekaligus
+def consistency_batch(stack, sizes, W_I):
+    """Versi batch dari consistency; mengembalikan array lambda_max, CI, CR, RI."""
+    n_max = stack.shape[1]
+    mask = np.arange(n_max) < sizes[:, None]
+
+    A = np.where(mask[:, :, None] & mask[:, None, :], stack, 0.0)
+    AW = np.einsum("kij,kj->ki", A, W_I)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(mask, AW / (sizes[:, None] * W_I), 0.0)
+    lambda_max = np.sum(ratio, axis=1)
+
+    n = sizes.astype(float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        CI = np.where(sizes > 1, (lambda_max - n) / (n - 1), 0.0)
+        RI = np.where(sizes < len(_RI_TABLE), _RI_TABLE[np.minimum(sizes, len(_RI_TABLE) - 1)], 0.0)
+        CR = np.where(RI != 0, CI / RI, 0.0)
+    return lambda_max, CI, CR, RI
+
+# Fungsi utama AHP versi batch
+def ahp_rumus_batch(matrices, labels=None, sizes=None, with_df=False, method="geometric", tol=1e-12):
+    """Menghitung AHP untuk banyak matriks dalam satu proses vektor.
+
+    `matrices` berupa tensor (k, n, n) berpadding (dengan `sizes`) atau daftar
+    matriks dengan ukuran berbeda. DataFrame hanya dibuat jika `with_df=True`
+    (memerlukan `labels` per matriks). `method` dan `tol` diteruskan ke
+    ahp_solver.priority_vector. Mengembalikan
+    (daftar df atau None, W [k, n], lambda_max [k], CI [k], CR [k], RI [k]).
+    """
+    stack, sizes = stack_matrices(matrices, sizes)
+    if stack.shape[0] == 0 or np.any(sizes == 0):
+        raise ValueError("Matrix is empty. Please provide a valid comparison matrix.")
+
+    W_I, _ = ahp_weights_batch(stack, sizes, method=method, tol=tol)
+    lambda_max, CI, CR, RI = consistency_batch(stack, sizes, W_I)
+
+    dfs = None
+    if with_df:
+        import pandas as pd
+        if labels is None:
+            raise ValueError("Parameter 'labels' diperlukan untuk membuat DataFrame.")
+        dfs = []
+        for i, n in enumerate(sizes):
+            df = pd.DataFrame(stack[i, :n, :n], index=labels[i], columns=labels[i])
+            df['Weight'] = W_I[i, :n]
+            dfs.append(df)
+
+    return dfs, W_I, lambda_max, CI, CR, RI
+
+# Lengkapi matriks perbandingan resiprokal dari isian editor tabel
+def reciprocal_matrix(edited, original):
+    """Matriks resiprokal (a_ji = 1 / a_ij) dari `edited` hasil editor tabel.
+
+    Segitiga atas dipakai apa adanya; sel segitiga bawah yang diubah
+    (sementara pasangannya di segitiga atas tidak) dibalik ke segitiga atas.
+    Sel kosong atau tidak positif kembali ke nilai `original`, diagonal selalu 1.
+    """
+    original = np.asarray(original, dtype=float)
+    edited = np.asarray(edited, dtype=float)
+    values = np.where(np.isfinite(edited) & (edited > 0), edited, original)
+    changed = values != original
+
+    rows, cols = np.triu_indices(original.shape[0], 1)
+    upper = np.where(changed[cols, rows] & ~changed[rows, cols], 1 / values[cols, rows], values[rows, cols])
+    matrix = np.ones_like(original)
+    matrix[rows, cols] = upper
+    matrix[cols, rows] = 1 / upper
+    return matrix
@@ -0,0 +1,78 @@
+import numpy as np
+
+# Metode perhitungan vektor prioritas yang tersedia
+METHODS = ("geometric", "eigen")
+
+# Buat mask elemen valid untuk matriks tunggal (n, n) atau tumpukan berpadding (k, n, n)
+def _valid_mask(matrix, sizes=None):
+    n = matrix.shape[-1]
+    if sizes is None:
+        return np.ones(matrix.shape[:-1], dtype=bool)
+    return np.arange(n) < np.asarray(sizes)[:, None]
+
+# Rata-rata geometrik dalam ruang log
+def geometric_mean(matrix, sizes=None):
+    """Bobot rata-rata geometrik per baris yang dihitung dengan log agar tidak overflow/underflow.
+
+    Mengembalikan (W_I ternormalisasi, W_bar_I). Mendukung matriks (n, n) maupun
+    tumpukan (k, n, n) berpadding dengan `sizes`; bobot padding bernilai 0.
+    """
+    matrix = np.asarray(matrix, dtype=float)
+    mask = _valid_mask(matrix, sizes)
+    valid = mask[..., :, None] & mask[..., None, :]
+    if np.any(matrix[np.broadcast_to(valid, matrix.shape)] <= 0):
+        raise ValueError("Nilai matriks perbandingan harus lebih besar dari 0.")
+
+    n = mask.sum(axis=-1, keepdims=True)
+    log_matrix = np.log(np.where(valid, matrix, 1.0))
+
+    # exp(rata-rata log) selalu berada di antara nilai minimum dan maksimum baris
+    W_bar_I = np.where(mask, np.exp(np.sum(log_matrix, axis=-1) / np.maximum(n, 1)), 0.0)
+    W_I = W_bar_I / np.sum(W_bar_I, axis=-1, keepdims=True)
+    return W_I, W_bar_I
+
+# Vektor eigen utama dengan power iteration
+def principal_eigenvector(matrix, sizes=None, tol=1e-12, max_iter=1000, w0=None):
+    """Vektor eigen utama (Perron) dengan power iteration yang dimulai dari `w0`.
+
+    Jika `w0` tidak diberikan, iterasi dimulai dari bobot rata-rata geometrik
+    yang sudah dekat dengan solusi untuk matriks yang hampir konsisten.
+    Mengembalikan (W_I, lambda_max, jumlah iterasi).
+    """
+    matrix = np.asarray(matrix, dtype=float)
+    mask = _valid_mask(matrix, sizes)
+
+    if w0 is None:
+        W_I, _ = geometric_mean(matrix, sizes)
+    else:
+        W_I = np.where(mask, np.asarray(w0, dtype=float), 0.0)
+        W_I = W_I / np.sum(W_I, axis=-1, keepdims=True)
+
+    if sizes is not None:
+        matrix = np.where(mask[..., :, None] & mask[..., None, :], matrix, 0.0)
+
+    lambda_max = np.zeros(matrix.shape[:-2])
+    for iteration in range(1, max_iter + 1):
+        AW = np.einsum("...ij,...j->...i", matrix, W_I)
+        lambda_max = np.sum(AW, axis=-1)
+        W_next = AW / lambda_max[..., None]
+        delta = np.max(np.abs(W_next - W_I))
+        W_I = W_next
+        if delta < tol:
+            return W_I, lambda_max, iteration
+
+    return W_I, lambda_max, max_iter
+
+# Fungsi utama untuk memilih metode vektor prioritas
+def priority_vector(matrix, method="geometric", sizes=None, tol=1e-12, max_iter=1000):
+    """Menghitung vektor prioritas dengan metode `geometric` atau `eigen`.
+
+    Mengembalikan (W_I, W_bar_I) seperti ahp_weights; untuk metode `eigen`
+    W_bar_I sama dengan W_I.
+    """
+    if method == "geometric":
+        return geometric_mean(matrix, sizes)
+    if method == "eigen":
+        W_I, _, _ = principal_eigenvector(matrix, sizes, tol=tol, max_iter=max_iter)
+        return W_I, W_I
+    raise ValueError(f"Metode '{method}' tidak dikenal. Pilih salah satu dari {METHODS}.")
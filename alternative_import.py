@@ -0,0 +1,128 @@
+import importlib.util
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+# Judul kolom yang dikenali sebagai nama alternatif (tanpa membedakan huruf besar/kecil)
+NAME_COLUMNS = ("Alternatif", "Nama Alternatif", "Nama")
+
+# Paket pembaca Excel per ekstensi (dipakai pandas.read_excel)
+EXCEL_READERS = {".xlsx": "openpyxl", ".xls": "xlrd"}
+
+# Ekstensi file yang bisa dibaca di lingkungan ini: CSV selalu, Excel hanya jika paket pembacanya terpasang
+def supported_extensions():
+    return [".csv"] + [extension for extension, package in EXCEL_READERS.items() if importlib.util.find_spec(package)]
+
+# Samakan judul kolom: huruf kecil dan spasi tunggal
+def _normalize(label):
+    return re.sub(r"\s+", " ", str(label)).strip().casefold()
+
+# Baca file CSV atau Excel sebagai teks; tipe data diperiksa kemudian per kolom
+def read_table(source, file_name=None):
+    """DataFrame berisi teks dari file CSV atau Excel (.xlsx/.xls).
+
+    `source` boleh berupa path atau file unggahan Streamlit; ekstensi diambil
+    dari `file_name`, atribut `name` milik file, atau path itu sendiri.
+    Membaca Excel memerlukan openpyxl (.xlsx) atau xlrd (.xls).
+    """
+    name = file_name or getattr(source, "name", None) or str(source)
+    extension = os.path.splitext(name)[1].lower()
+    if extension == ".csv":
+        return pd.read_csv(source, dtype=str, keep_default_na=False, skipinitialspace=True)
+    if extension in EXCEL_READERS:
+        try:
+            return pd.read_excel(source, dtype=str, keep_default_na=False)
+        except ImportError as e:
+            raise ImportError(f"Membaca file Excel memerlukan paket tambahan: {e}") from e
+    raise ValueError(f"Format file '{extension}' tidak didukung. Gunakan .csv, .xlsx atau .xls.")
+
+# Pasangkan kolom tabel dengan sub-kriteria berdasarkan judulnya
+def map_columns(columns, keys):
+    """Mengembalikan (kolom nama alternatif, {sub-kriteria: kolom}).
+
+    ValueError jika kolom nama alternatif atau salah satu sub-kriteria tidak ditemukan.
+    """
+    by_label = {}
+    for column in columns:
+        by_label.setdefault(_normalize(column), column)
+
+    name_column = next((by_label[_normalize(label)] for label in NAME_COLUMNS if _normalize(label) in by_label), None)
+    if name_column is None:
+        raise ValueError(f"Kolom nama alternatif tidak ditemukan. Gunakan salah satu judul: {', '.join(NAME_COLUMNS)}.")
+
+    mapping = {key: by_label[_normalize(key)] for key in keys if _normalize(key) in by_label}
+    missing = [key for key in keys if key not in mapping]
+    if missing:
+        raise ValueError(f"Kolom untuk sub-kriteria berikut tidak ditemukan: {', '.join(missing)}.")
+    return name_column, mapping
+
+# Validasi seluruh tabel sekaligus: satu operasi per blok kolom, bukan per sel
+def validate_table(table, keys, data_types):
+    """Mengembalikan (DataFrame alternatif, DataFrame galat).
+
+    DataFrame alternatif berindeks nama alternatif dengan kolom `keys`: kolom
+    "Numerik" berisi float, kolom lain berisi teks tanpa spasi di tepinya.
+    DataFrame galat berisi kolom Baris (nomor baris di file, judul = baris 1),
+    Kolom, Nilai dan Masalah; kosong jika semua nilai valid.
+    """
+    name_column, mapping = map_columns(table.columns, keys)
+    names = table[name_column].astype(str).str.strip()
+    numeric = [key for key in keys if data_types.get(key) == "Numerik"]
+    categorical = [key for key in keys if data_types.get(key) != "Numerik"]
+
+    frame = pd.DataFrame(index=table.index)
+    problems = []
+
+    # Nama alternatif wajib diisi dan tidak boleh kembar
+    problems.append(((names == "").to_numpy(), name_column, names.to_numpy(), "Nama alternatif kosong"))
+    problems.append(((names.duplicated(keep=False) & (names != "")).to_numpy(), name_column, names.to_numpy(), "Nama alternatif ganda"))
+
+    if numeric:
+        raw = table[[mapping[key] for key in numeric]].apply(lambda column: column.astype(str).str.strip())
+        values = raw.apply(pd.to_numeric, errors="coerce").astype(float)
+        invalid = (values.isna() | np.isinf(values)).to_numpy()
+        blank = (raw == "").to_numpy()
+        raw_values = raw.to_numpy()
+        for j, key in enumerate(numeric):
+            problems.append((blank[:, j], mapping[key], raw_values[:, j], "Nilai numerik kosong"))
+            problems.append((invalid[:, j] & ~blank[:, j], mapping[key], raw_values[:, j], "Bukan angka"))
+        frame[numeric] = values.to_numpy()
+
+    if categorical:
+        text = table[[mapping[key] for key in categorical]].apply(lambda column: column.astype(str).str.strip())
+        frame[categorical] = text.to_numpy()
+
+    rows, columns, found, reasons = [], [], [], []
+    for mask, column, raw_values, reason in problems:
+        positions = np.flatnonzero(mask)
+        rows.append(positions + 2)
+        columns.extend([column] * len(positions))
+        found.append(raw_values[positions])
+        reasons.extend([reason] * len(positions))
+    errors = pd.DataFrame({
+        "Baris": np.concatenate(rows).astype(int),
+        "Kolom": columns,
+        "Nilai": np.concatenate(found) if found else [],
+        "Masalah": reasons,
+    }).sort_values(["Baris", "Kolom"], kind="stable").reset_index(drop=True)
+
+    frame = frame[keys]
+    frame.index = pd.Index(names.to_numpy(), name="Alternatif")
+    return frame, errors
+
+def import_alternatives(source, keys, data_types, file_name=None):
+    """Membaca file alternatif dan mengembalikan (alternatif, galat).
+
+    `alternatif` berbentuk {nama: {sub-kriteria: nilai}} seperti input form,
+    siap dipakai untuk perangkingan; hanya berisi data jika `galat` kosong.
+    """
+    frame, errors = validate_table(read_table(source, file_name), list(keys), data_types)
+    if not errors.empty:
+        return {}, errors
+    # Kolom diubah ke list sekali, lalu dirangkai per baris (jauh lebih cepat dari to_dict("index"))
+    keys = list(frame.columns)
+    columns = [frame[key].tolist() for key in keys]
+    alternatives = {name: dict(zip(keys, row)) for name, row in zip(frame.index.tolist(), zip(*columns))}
+    return alternatives, errors
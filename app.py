@@ -2,32 +2,50 @@ import streamlit as st
 import numpy as np
 import pandas as pd
 import os
-import json
-import time
-from ahp_function import ahp_rumus
-from pm_function import profile_matching_with_ranges
-
-# Fungsi untuk membersihkan dan mengonversi data agar kompatibel dengan JSON
-def clean_session_state(state):
-    clean_data = {}
-    for key, value in state.items():
-        try:
-            # Coba serialisasi ke JSON langsung
-            json.dumps(value)
-            clean_data[key] = value
-        except TypeError:
-            # Konversi tipe data yang tidak didukung
-            if isinstance(value, np.ndarray):  # Konversi numpy array ke list
-                clean_data[key] = value.tolist()
-            elif isinstance(value, dict):  # Rekursif untuk dictionary
-                clean_data[key] = clean_session_state(value)
-            else:
-                st.warning(f"Tidak dapat menyimpan '{key}' karena tipe datanya tidak didukung.")
-    return clean_data
+import sqlite3
+import uuid
+from ahp_function import ahp_rumus_batch, reciprocal_matrix
+from pm_incremental import sync_scoring_state
+from smaa_function import smaa_from_ahp
+from ahp_cache import cached_ahp_weights, store as cache_store, cache_info
+from project_store import save_project
+from columnar_store import pm_records, sidecar_dir, write_columnar, remove_columnar
+from project_journal import compact, save_incremental
+from json_codec import to_builtin
+from alternative_import import import_alternatives, supported_extensions
+from result_export import EXPORT_JOBS_KEY, EXPORT_SESSION_KEY, export_status, session_export_path, start_export
+from result_view import result_table
+from project_index import invalidate
+from project_io import JOBS_KEY, job_watcher, submit
+
+# Jenis data sub-kriteria pada profil ideal
+DATA_TYPES = ["Numerik", "Kategorikal"]
+
+# Key session_state milik sesi berjalan yang tidak ikut disimpan ke file proyek
+SESSION_ONLY_KEYS = ["ahp_results", "pm_results", "pm_state", "shared_project", "pm_profile", "pm_alternatives", "view_data", JOBS_KEY, EXPORT_SESSION_KEY, EXPORT_JOBS_KEY, "export_file_name"]
+
+# Awalan key editor tabel matriks perbandingan; status editor hanya berlaku selama sesi
+GRID_KEY_PREFIX = "grid_"
+# Versi editor per matriks, dinaikkan setiap kali isian diterapkan
+GRID_VERSIONS_KEY = "grid_versions"
+
+# Awalan key tabel hasil perangkingan (pencarian, urutan, halaman) di halaman ini dan halaman View Data
+RESULT_VIEW_KEY = "pm_view"
+VIEW_DATA_RESULT_KEY = "view_pm"
+
+# Awalan key widget yang statusnya hanya berlaku selama sesi
+SESSION_ONLY_PREFIXES = (GRID_KEY_PREFIX, f"{RESULT_VIEW_KEY}_", f"{VIEW_DATA_RESULT_KEY}_")
+
+# Key yang ikut disimpan ke form_data file proyek
+def is_saved_key(key):
+    return key not in SESSION_ONLY_KEYS and not key.startswith(SESSION_ONLY_PREFIXES)
+
+# Nilai awal widget: dari proyek bersama yang dimuat sesi ini, selain itu nilai bawaan
+def form_default(key, fallback, options=None):
+    project = st.session_state.get("shared_project")
+    return fallback if project is None else project.form_value(key, fallback, options)
 
 def save_to_json(file_name):
-    file_path = os.path.join("data", file_name)
-
     data_to_save = {
         "ahp_results": st.session_state.get("ahp_results", None),
         "pm_results": st.session_state.get("pm_results", None),
@@ -44,9 +62,15 @@ def save_to_json(file_name):
         },
     }
 
+    # Nilai form proyek bersama yang tidak diubah sesi ini ikut disimpan apa adanya
+    shared = st.session_state.get("shared_project")
+    if shared is not None:
+        for key, value in shared.form_data.items():
+            if key not in st.session_state and is_saved_key(key):
+                data_to_save["form_data"][key] = value
 
     for key in st.session_state.keys():
-        if key not in ["ahp_results", "pm_results"]:
+        if is_saved_key(key):
             if key == "criteria_labels":
                 # Simpan hanya kriteria dengan nama valid
                 data_to_save["form_data"][key] = [c for c in st.session_state[key] if c.strip()]
@@ -64,70 +88,98 @@ def save_to_json(file_name):
                 data_to_save["form_data"][key] = st.session_state[key]
 
 
-    # Konversi semua NumPy array ke list agar bisa disimpan
-    if data_to_save["ahp_results"]:
-        if "sub_matrices" in data_to_save["ahp_results"]:
-            data_to_save["ahp_results"]["sub_matrices"] = {
-                key: value.tolist() if isinstance(value, np.ndarray) else value
-                for key, value in data_to_save["ahp_results"]["sub_matrices"].items()
-            }
+    # Salin nilai sesi di thread skrip sebelum diserahkan ke worker, karena sesi tetap bisa diubah selama proses simpan.
+    # pm_results tidak disalin: setiap perangkingan atau muat proyek mengganti objeknya, tidak mengubah isinya
+    data_to_save = {
+        **to_builtin({key: value for key, value in data_to_save.items() if key != "pm_results"}),
+        "pm_results": data_to_save["pm_results"],
+    }
 
-        # Pastikan bobot dan matriks lainnya juga diubah ke list
-        if "weights_main" in data_to_save["ahp_results"]:
-            data_to_save["ahp_results"]["weights_main"] = (
-                data_to_save["ahp_results"]["weights_main"].tolist()
-                if isinstance(data_to_save["ahp_results"]["weights_main"], np.ndarray)
-                else data_to_save["ahp_results"]["weights_main"]
-            )
+    # Penulisan file berjalan di worker latar; sesi tetap bisa dipakai selama proses simpan
+    submit(
+        write_project, file_name, data_to_save,
+        bool(st.session_state.get("save_columnar")), bool(st.session_state.get("save_journal")),
+        path=os.path.join("data", file_name),
+        label=f"Menyimpan '{file_name}'",
+        message=f"Data berhasil disimpan ke: '{file_name}'",
+        error="Gagal menyimpan data",
+    )
 
-        if "sub_results" in data_to_save["ahp_results"]:
-            for key, sub_result in data_to_save["ahp_results"]["sub_results"].items():
-                if "weights_sub" in sub_result:
-                    sub_result["weights_sub"] = (
-                        sub_result["weights_sub"].tolist()
-                        if isinstance(sub_result["weights_sub"], np.ndarray)
-                        else sub_result["weights_sub"]
-                    )
+# Tulis proyek ke data/<file_name> beserta sidecar/jurnal dan salinan database (dijalankan di worker latar)
+def write_project(file_name, data_to_save, columnar=False, journal=False):
+    file_path = os.path.join("data", file_name)
+    pm_results = data_to_save["pm_results"]
+    if columnar and pm_results:
+        # Hasil perangkingan disimpan di sidecar biner; JSON hanya menyimpan rujukannya
+        columnar_path = sidecar_dir(file_path)
+        criteria = data_to_save["ahp_results"].get("criteria_labels", []) if data_to_save["ahp_results"] else []
+        write_columnar(columnar_path, pm_results, criteria=criteria)
+        data_to_save["pm_results"] = None
+        data_to_save["pm_columnar"] = {"path": os.path.basename(columnar_path), "rows": len(pm_results)}
+    else:
+        data_to_save["pm_results"] = pm_records(pm_results)
+        remove_columnar(file_path)  # Hapus sidecar lama dengan nama yang sama
 
-    # Konversi hasil perangkingan PM jika ada NumPy array
-    if data_to_save["pm_results"] and isinstance(data_to_save["pm_results"], np.ndarray):
-        data_to_save["pm_results"] = data_to_save["pm_results"].tolist()
+    if journal:
+        # Tambahkan hanya perubahan sejak penyimpanan terakhir ke jurnal proyek
+        save_incremental(file_path, data_to_save)
+    else:
+        compact(file_path, data_to_save)  # Tulis snapshot JSON lengkap (format ringkas versi 2) lalu hapus jurnal lama
 
-     # Tempat untuk menampilkan pesan sementara
-    message_placeholder = st.empty()
+    # Perbarui salinan proyek di database; jika gagal, database disinkronkan ulang dari file saat dibaca
     try:
-        with open(file_path, "w") as file:
-            json.dump(data_to_save, file)  # Simpan ke JSON tanpa error
-        
-        # Tampilkan sukses dan hilangkan setelah 1 detik
-        message_placeholder.success(f"Data berhasil disimpan ke: '{file_name}'")
-        time.sleep(1)  # Menunggu selama 1 detik
-        message_placeholder.empty()  # Menghapus pesan
-    except Exception as e:
-        st.error(f"Gagal menyimpan data: {e}")
-
-st.title("Sistem Pendukung Keputusan AHP dan Profile Matching")
-
-# Tab untuk AHP dan Profile Matching
-tabs = st.tabs(["AHP - Pembobotan", "Profile Matching - Perangkingan"])
-
-# Variabel global untuk menyimpan data
-if "ahp_results" not in st.session_state:
-    st.session_state.ahp_results = None
-
-# ----------------- TAB 1: AHP -----------------
-with tabs[0]:
-    st.header("Analytic Hierarchy Process (AHP)")
-    
-    # Pastikan nilai 'num_criteria' diinisialisasi hanya jika belum ada di session_state
-    if "num_criteria" not in st.session_state:
-        st.session_state.num_criteria = 0  # Nilai default
-
-    # Gunakan widget input untuk jumlah kriteria utama tanpa mengatur 'value'
+        save_project(file_name, data_to_save, source_path=file_path)
+    except sqlite3.Error:
+        pass
+    invalidate()
+
+# ----------------- Nilai form dari session_state -----------------
+# Setiap bagian form adalah fragment yang bisa dijalankan ulang sendiri, sehingga data antar bagian
+# dibaca dari session_state (nilai widget, atau nilai awal widget jika belum pernah ditampilkan)
+
+def form_value(key, fallback, options=None):
+    return st.session_state.get(key, form_default(key, fallback, options))
+
+# Daftar kriteria dan sub-kriteria sesuai isian bagian kriteria
+def criteria_structure():
+    criteria_labels = []
+    sub_criteria_dict = {}
+    for i in range(form_value("num_criteria", 0)):
+        criteria_name = form_value(f"criteria_{i}", f"K{i+1}")
+        if criteria_name.strip():
+            criteria_labels.append(criteria_name)
+            sub_criteria_dict[criteria_name] = [
+                form_value(f"sub_{i}_{j}", f"{criteria_name}_S{j+1}") for j in range(form_value(f"num_sub_{i}", 0))
+            ]
+    return criteria_labels, sub_criteria_dict
+
+# Matriks perbandingan berpasangan lengkap dari isian segitiga atas (key: <prefix>_<i>_<j>)
+def comparison_matrix(labels, key_prefix):
+    matrix = np.ones((len(labels), len(labels)))
+    for i in range(len(labels)):
+        for j in range(i + 1, len(labels)):
+            matrix[i, j] = form_value(f"{key_prefix}_{i}_{j}", 1.0)
+            matrix[j, i] = 1 / matrix[i, j]
+    return matrix
+
+# Jenis data setiap sub-kriteria pada profil ideal
+def sub_criteria_data_types(sub_criteria_dict):
+    return {
+        sub_criteria: form_value(f"data_type_{sub_criteria}", "Numerik", DATA_TYPES)
+        for subs in sub_criteria_dict.values() for sub_criteria in subs
+    }
+
+# ----------------- Bagian form (fragment) -----------------
+
+# Kriteria utama dan sub-kriteria. Perubahan jumlah atau nama mengubah bagian lain, jadi seluruh halaman dijalankan ulang
+@st.fragment
+def criteria_section(structure):
+    # Jumlah kriteria utama; nilai awal dari proyek yang dimuat (0 jika belum ada)
     num_criteria = st.number_input(
         "Jumlah Kriteria Utama",
         min_value=0,  # Minimal 1 kriteria utama
         step=1,
+        value=form_default("num_criteria", 0),
         key="num_criteria"  # Key otomatis menghubungkan nilai ke st.session_state
     )
 
@@ -135,27 +187,23 @@ with tabs[0]:
     if st.session_state.num_criteria != num_criteria:
         st.session_state.num_criteria = num_criteria
 
-    criteria_labels = []
     sub_criteria_dict = {}
 
-    # Input kriteria utama dan sub-kriteria
     # Input kriteria utama dan sub-kriteria
     if num_criteria >= 1:
         for i in range(num_criteria):
             with st.expander(f"Kriteria {i+1}"):
                 # Input nama kriteria utama
-                criteria_name = st.text_input(f"Nama Kriteria {i+1}", value=f"K{i+1}", key=f"criteria_{i}")
+                criteria_name = st.text_input(f"Nama Kriteria {i+1}", value=form_default(f"criteria_{i}", f"K{i+1}"), key=f"criteria_{i}")
 
                 # Validasi nama kriteria utama
                 if criteria_name.strip():
-                    criteria_labels.append(criteria_name)
-
                     # Input jumlah sub-kriteria
                     num_sub = st.number_input(
                         f"Jumlah Sub-Kriteria untuk {criteria_name}",
                         min_value=0,
                         step=1,
-                        value=0,
+                        value=form_default(f"num_sub_{i}", 0),
                         key=f"num_sub_{i}"
                     )
 
@@ -165,7 +213,7 @@ with tabs[0]:
                         for j in range(num_sub):
                             sub_name = st.text_input(
                                 f"Nama Sub-Kriteria {j+1} untuk {criteria_name}",
-                                value=f"{criteria_name}_S{j+1}",
+                                value=form_default(f"sub_{i}_{j}", f"{criteria_name}_S{j+1}"),
                                 key=f"sub_{i}_{j}"
                             )
                             sub_labels.append(sub_name)
@@ -178,92 +226,420 @@ with tabs[0]:
 
     st.session_state.sub_criteria = sub_criteria_dict
 
-    st.write(f'### Matriks Perbandingan')
-
-    # Matriks perbandingan untuk kriteria utama
+    if criteria_structure() != structure:
+        st.rerun(scope="app")
+
+# Terapkan isian editor tabel ke key matriks (<prefix>_<i>_<j>), lalu mulai editor baru tanpa sisa isian lama
+def _apply_comparison_grid(labels, key_prefix, grid_key):
+    matrix = comparison_matrix(labels, key_prefix)
+    edited = matrix.copy()
+    for row, cells in st.session_state[grid_key]["edited_rows"].items():
+        for column, value in cells.items():
+            edited[int(row), labels.index(column)] = np.nan if value is None else value
+    matrix = reciprocal_matrix(edited, matrix)
+
+    rows, cols = np.triu_indices(len(labels), 1)
+    for i, j, value in zip(rows.tolist(), cols.tolist(), matrix[rows, cols].tolist()):
+        st.session_state[f"{key_prefix}_{i}_{j}"] = value
+    versions = st.session_state[GRID_VERSIONS_KEY]
+    versions[key_prefix] = versions.get(key_prefix, 0) + 1
+
+# Editor tabel satu matriks perbandingan; semua perubahan dikirim sekaligus lewat form
+# dan segitiga bawah diisi otomatis dengan nilai kebalikannya
+def comparison_grid(labels, key_prefix):
+    version = st.session_state.setdefault(GRID_VERSIONS_KEY, {}).get(key_prefix, 0)
+    grid_key = f"{GRID_KEY_PREFIX}{key_prefix}_{version}"
+    with st.form(f"{GRID_KEY_PREFIX}{key_prefix}_form", border=False):
+        st.data_editor(
+            pd.DataFrame(comparison_matrix(labels, key_prefix), index=labels, columns=labels),
+            column_config={label: st.column_config.NumberColumn(min_value=0.1, format="%.3f") for label in labels},
+            key=grid_key
+        )
+        st.form_submit_button("Terapkan Perbandingan", on_click=_apply_comparison_grid, args=(labels, key_prefix, grid_key))
+
+# Matriks perbandingan untuk kriteria utama
+@st.fragment
+def main_matrix_section(criteria_labels):
     with st.expander("Matriks Perbandingan Kriteria Utama"):
         st.write("### Matriks Perbandingan Kriteria Utama")
-        matrix_main = []
-        for i in range(len(criteria_labels)):
-            row = []
-            for j in range(len(criteria_labels)):
-                if i == j:
-                    row.append(1.0)
-                elif i < j:
-                    val = st.number_input(
-                        f"Perbandingan {criteria_labels[i]} vs {criteria_labels[j]}",
-                        min_value=0.1,
-                        value=1.0,
-                        key=f"matrix_main_{i}_{j}",
-                        format="%.3f"
-                    )
-                    row.append(val)
-                else:
-                    row.append(1 / matrix_main[j][i])
-            matrix_main.append(row)
-        matrix_main = np.array(matrix_main)
-
-    # Matriks perbandingan untuk masing-masing sub-kriteria
-    sub_matrices = {}
-    for criteria, sub_labels in sub_criteria_dict.items():
-        if len(sub_labels) > 0:
-            with st.expander(f"Matriks Perbandingan Sub-Kriteria untuk {criteria}"):
-                st.write(f"### Matriks Perbandingan Sub-Kriteria untuk {criteria}")
-                matrix_sub = []
-                for i in range(len(sub_labels)):
-                    row = []
-                    for j in range(len(sub_labels)):
-                        if i == j:
-                            row.append(1.0)
-                        elif i < j:
-                            val = st.number_input(
-                                f"Perbandingan {sub_labels[i]} vs {sub_labels[j]} ",
-                                min_value=0.1,
-                                value=1.0,
-                                key=f"matrix_sub_{criteria}_{i}_{j}",
-                                format="%.3f"
+        comparison_grid(criteria_labels, "matrix_main")
+
+# Matriks perbandingan sub-kriteria untuk satu kriteria
+@st.fragment
+def sub_matrix_section(criteria, sub_labels):
+    with st.expander(f"Matriks Perbandingan Sub-Kriteria untuk {criteria}"):
+        st.write(f"### Matriks Perbandingan Sub-Kriteria untuk {criteria}")
+        comparison_grid(sub_labels, f"matrix_sub_{criteria}")
+
+# Profil ideal; hasilnya disimpan di st.session_state["pm_profile"] untuk bagian alternatif dan hasil.
+# Jenis data menentukan widget alternatif, jadi perubahannya menjalankan ulang seluruh halaman
+@st.fragment
+def ideal_profile_section(ahp_results, data_types):
+    criteria_labels = ahp_results["criteria_labels"]
+    weights_main = ahp_results["weights_main"]
+    sub_criteria_dict = ahp_results["sub_criteria_dict"]
+    sub_matrices = ahp_results["sub_matrices"]
+
+    st.write("### Input Nilai Profil Ideal")
+    sub_criteria_config = {}
+    sub_criteria_weights = {}
+    criteria_groups = {}
+
+    for i, criteria in enumerate(criteria_labels):
+        # Tampilkan kriteria utama hanya dengan nama dan bobot AHP
+        st.write(f"**{criteria}** (Bobot AHP: {weights_main[i]:.3f})")
+
+        # Jika kriteria memiliki sub-kriteria, tampilkan dropdown
+        if len(sub_criteria_dict[criteria]) > 0:
+            with st.expander(f"Sub-Kriteria untuk {criteria}"):
+                # Ambil bobot sub-kriteria dari cache hasil AHP (dihitung ulang hanya jika matriks berubah)
+                weights_sub, _, _, _, _ = cached_ahp_weights(sub_matrices[criteria], sub_criteria_dict[criteria])
+
+                # Buat daftar sub-kriteria untuk setiap kriteria utama
+                criteria_groups[criteria] = []
+
+                for j, sub_criteria in enumerate(sub_criteria_dict[criteria]):
+                    col1, col2, col3 = st.columns([1, 1, 1])
+                    with col1:
+                        st.selectbox(
+                            f"{sub_criteria} - Jenis Data",
+                            DATA_TYPES,
+                            index=DATA_TYPES.index(form_default(f"data_type_{sub_criteria}", "Numerik", DATA_TYPES)),
+                            key=f"data_type_{sub_criteria}"
+                        )
+                    with col2:
+                        data_type = st.session_state.get(f"data_type_{sub_criteria}", "Numerik")
+                        if data_type == "Numerik":
+                            is_range = st.checkbox(
+                                f"{sub_criteria} - Rentang Nilai?",
+                                value=form_default(f"is_range_{sub_criteria}", False),
+                                key=f"is_range_{sub_criteria}"
                             )
-                            row.append(val)
+                            if is_range:
+                                st.number_input(
+                                    f"Nilai Minimum {sub_criteria}",
+                                    value=form_default(f"min_value_{sub_criteria}", 0.0),
+                                    format="%.3f",
+                                    key=f"min_value_{sub_criteria}"
+                                )
+                                st.number_input(
+                                    f"Nilai Maksimum {sub_criteria}",
+                                    value=form_default(f"max_value_{sub_criteria}", 5.0),
+                                    format="%.3f",
+                                    key=f"max_value_{sub_criteria}"
+                                )
+                            else:
+                                st.number_input(
+                                    f"Nilai Ideal {sub_criteria}",
+                                    value=form_default(f"ideal_value_{sub_criteria}", 5.0),
+                                    format="%.3f",
+                                    key=f"ideal_value_{sub_criteria}"
+                                )
                         else:
-                            row.append(1 / matrix_sub[j][i])
-                    matrix_sub.append(row)
-                sub_matrices[criteria] = np.array(matrix_sub)
-
-    # Tombol untuk menghitung semua bobot
-    if st.button("Hitung Bobot Prioritas"):
-        # Perhitungan bobot untuk kriteria utama
-        df_main, weights_main, lambda_max_main, CI_main, CR_main, RI_main = ahp_rumus(matrix_main, criteria_labels)
-
-        # Simpan hasil ke session state
-        st.session_state.ahp_results = {
-            "criteria_labels": criteria_labels,
-            "weights_main": weights_main,
-            "sub_criteria_dict": sub_criteria_dict,
-            "sub_matrices": sub_matrices,
-            "df_main": df_main.to_dict()
-        }
-
-        # Tampilkan hasil kriteria utama
-        st.write("### Hasil Perhitungan Bobot Kriteria Utama")
-        st.dataframe(df_main.round(3))
-        st.write(f"**Lambda Max**: {lambda_max_main:.3f}")
-        st.write(f"**CI**: {CI_main:.3f}")
-        st.write(f"**RI**: {RI_main:.3f}")
-        st.write(f"**CR**: {CR_main:.3f}")
-        if CR_main < 0.1:
-            st.success("Matriks kriteria utama konsisten.")
-            st.session_state.is_consistent = True
+                            st.text_input(
+                                f"Nilai Ideal {sub_criteria} (Pisahkan dengan koma jika lebih dari satu)",
+                                value=form_default(f"ideal_value_{sub_criteria}", ""),
+                                key=f"ideal_value_{sub_criteria}"
+                            )
+                    with col3:
+                        weight = weights_sub[j]
+                        st.write(f"Bobot AHP: {weight:.3f}")
+
+                        # Simpan bobot ke dictionary
+                        sub_criteria_weights[sub_criteria] = weight
+                        criteria_groups[criteria].append(sub_criteria)
+
+                    # Simpan konfigurasi sub-kriteria
+                    ideal_value = st.session_state.get(f"ideal_value_{sub_criteria}", "")
+                    if data_type == "Kategorikal" and isinstance(ideal_value, str):
+                        ideal_value = [v.strip() for v in ideal_value.split(",") if v.strip()]
+                    sub_criteria_config[sub_criteria] = {
+                        "data_type": data_type,
+                        "ideal_value": (
+                            [st.session_state.get(f"min_value_{sub_criteria}", 0.0),
+                             st.session_state.get(f"max_value_{sub_criteria}", 5.0)]
+                            if st.session_state.get(f"is_range_{sub_criteria}", False)
+                            else ideal_value
+                        ),
+                    }
+
+    info = cache_info()
+    st.caption(f"Cache bobot AHP: {info['hits']} hit, {info['misses']} miss, {info['size']} entri")
+
+    st.session_state["pm_profile"] = {
+        "config": sub_criteria_config,
+        "weights": sub_criteria_weights,
+        "groups": criteria_groups,
+    }
+    if {key: config["data_type"] for key, config in sub_criteria_config.items()} != data_types:
+        st.rerun(scope="app")
+
+# Input alternatif (manual atau impor file); hasilnya disimpan di st.session_state["pm_alternatives"]
+@st.fragment
+def alternatives_section(criteria_labels, sub_criteria_dict):
+    sub_criteria_config = st.session_state["pm_profile"]["config"]
+
+    st.write("### Input Nilai Alternatif")
+    # Kolom input alternatif: sub-kriteria, atau kriteria itu sendiri jika tidak punya sub-kriteria
+    input_keys = [key for criteria in criteria_labels for key in (sub_criteria_dict[criteria] or [criteria])]
+    data_types = {key: config["data_type"] for key, config in sub_criteria_config.items()}
+
+    # Impor alternatif dari file: nilai langsung dipakai untuk perangkingan tanpa widget per sel
+    with st.expander("Impor Alternatif dari CSV/Excel"):
+        st.caption("Baris pertama berisi judul kolom: 'Alternatif' lalu satu kolom untuk setiap sub-kriteria.")
+        # Tipe Excel hanya ditawarkan jika paket pembacanya terpasang
+        uploaded_file = st.file_uploader("File Alternatif", type=[extension.lstrip(".") for extension in supported_extensions()])
+        if uploaded_file is not None and st.button("Impor Alternatif"):
+            try:
+                imported, errors = import_alternatives(uploaded_file, input_keys, data_types)
+            except (ImportError, ValueError) as e:
+                st.error(f"Gagal mengimpor alternatif: {e}")
+            else:
+                if errors.empty:
+                    st.session_state["imported_alternatives"] = imported
+                    st.success(f"{len(imported)} alternatif berhasil diimpor dari '{uploaded_file.name}'")
+                else:
+                    st.error(f"{len(errors)} nilai tidak valid, alternatif tidak diimpor.")
+                    st.dataframe(errors)
+
+    imported = st.session_state.get("imported_alternatives", form_default("imported_alternatives", None))
+    if imported and any(list(values) != input_keys for values in imported.values()):
+        st.warning("Kolom alternatif hasil impor tidak sesuai dengan sub-kriteria saat ini. Impor ulang file atau isi manual.")
+        imported = None
+
+    if imported:
+        alternatives = imported
+        num_alternatives = 0  # Tidak ada widget per alternatif
+        st.info(f"Memakai {len(alternatives)} alternatif hasil impor file.")
+        if st.button("Kembali ke Input Manual"):
+            st.session_state["imported_alternatives"] = None  # Tutupi juga hasil impor dari proyek yang dimuat
+            st.rerun()
+    else:
+        num_alternatives = st.number_input("Jumlah Alternatif", min_value=1, step=1, value=form_default("num_alternatives", 3), key="num_alternatives")
+        alternatives = {}
+
+    for i in range(num_alternatives):
+        with st.expander(f"Alternatif {i+1}"):
+            alt_name = st.text_input(f"Nama Alternatif {i+1}", value=form_default(f"alt_name_{i}", f"A{i+1}"), key=f"alt_name_{i}")
+            alt_values = {}
+            for criteria in criteria_labels:
+                if len(sub_criteria_dict[criteria]) > 0:
+                    for sub_criteria in sub_criteria_dict[criteria]:
+                        if sub_criteria_config[sub_criteria]["data_type"] == "Numerik":
+                            if isinstance(sub_criteria_config[sub_criteria]["ideal_value"], list):
+                                val = st.number_input(
+                                    f"Nilai {sub_criteria} untuk {alt_name}",
+                                    value=form_default(f"value_{alt_name}_{sub_criteria}", 0.0),
+                                    format="%.3f",
+                                    key=f"value_{alt_name}_{sub_criteria}"
+                                )
+                                alt_values[sub_criteria] = val
+                            else:
+                                val = st.number_input(
+                                    f"Nilai {sub_criteria} untuk {alt_name}",
+                                    value=form_default(f"value_{alt_name}_{sub_criteria}", 0.0),
+                                    format="%.3f",
+                                    key=f"value_{alt_name}_{sub_criteria}"
+                                )
+                                alt_values[sub_criteria] = val
+                        else:  # Jika data kategorikal
+                            val = st.text_input(
+                                f"Nilai {sub_criteria} untuk {alt_name}",
+                                value=form_default(f"value_{alt_name}_{sub_criteria}", ""),
+                                key=f"value_{alt_name}_{sub_criteria}"
+                            )
+                            alt_values[sub_criteria] = val
+                else:
+                    val = st.text_input(
+                        f"Nilai {criteria} untuk {alt_name}",
+                        value=form_default(f"value_{alt_name}_{criteria}", ""),
+                        key=f"value_{alt_name}_{criteria}"
+                    )
+                    alt_values[criteria] = val
+            # Hanya tambahkan alternatif jika nama alternatif tidak kosong
+            if alt_name.strip():
+                alternatives[alt_name] = alt_values
+            else:
+                st.warning(f"Alternatif {i+1} tidak dimasukkan karena nama kosong.")
+
+    st.session_state["pm_alternatives"] = alternatives
+
+# Perangkingan, ekspor dan analisis stabilitas dari profil ideal dan alternatif terakhir
+@st.fragment
+def results_section(criteria_labels, weights_main):
+    profile = st.session_state["pm_profile"]
+    sub_criteria_config = profile["config"]
+    alternatives = st.session_state["pm_alternatives"]
+
+    # Jumlah alternatif teratas yang ditampilkan (0 = semua)
+    top_k = st.number_input("Tampilkan Top-K Alternatif (0 = semua)", min_value=0, step=1, value=form_default("pm_top_k", 0), key="pm_top_k")
+
+    # Tombol hitung perangkingan
+    summary = None
+    if st.button("Hitung Perangkingan"):
+        if not alternatives:
+            # Tidak ada alternatif bernama: hasil perangkingan kosong
+            st.session_state["pm_state"] = None
+            st.session_state["pm_results"] = []
+            st.warning("Tidak ada alternatif untuk diperangkingkan.")
         else:
-            st.error("Matriks kriteria utama tidak konsisten, silakan perbaiki nilai perbandingan.")
-            st.session_state.is_consistent = False
-            # st.session_state.ahp_results = None
+            # Ideal values sesuai jenis data
+            ideal_values = {
+                key: val["ideal_value"] for key, val in sub_criteria_config.items()
+            }
+
+            # Perhitungan Profile Matching; hanya input yang berubah sejak perhitungan terakhir yang dihitung ulang
+            pm_state = sync_scoring_state(
+                st.session_state.get("pm_state"),
+                alternatives,
+                ideal_values,
+                profile["groups"],
+                profile["weights"],
+                dict(zip(criteria_labels, weights_main))
+            )
+            st.session_state["pm_state"] = pm_state
+            if top_k > 0:
+                ranked, summary = pm_state.top(top_k)
+            else:
+                ranked = pm_state.to_frame()
+            results = ranked.to_dict("records")
+
+            # Simpan hasil perangkingan ke session state
+            st.session_state["pm_results"] = results
+
+    # Tampilkan hasil perangkingan terakhir (termasuk hasil proyek yang dimuat) per halaman
+    if st.session_state.get("pm_results"):
+        st.write("### Hasil Perangkingan")
+        result_table(st.session_state["pm_results"], RESULT_VIEW_KEY)
+        if summary and summary["rest_count"]:
+            st.caption(
+                f"{summary['rest_count']} alternatif lainnya: rata-rata {summary['rest_mean']:.3f}, "
+                f"min {summary['rest_min']:.3f}, maks {summary['rest_max']:.3f}"
+            )
+
+    # Ekspor hasil perangkingan (bobot GAP, skor per kriteria dan Final Score) per potongan di thread latar
+    if st.session_state.get("pm_results"):
+        with st.expander("Ekspor Hasil Perangkingan"):
+            export_name = st.text_input("Nama File Ekspor (.csv atau .parquet)", value="hasil_perangkingan.csv", key="export_file_name")
+            export_path = session_export_path(st.session_state.setdefault(EXPORT_SESSION_KEY, uuid.uuid4().hex), export_name)
+            export_jobs = st.session_state.setdefault(EXPORT_JOBS_KEY, {})
+            status = export_status(export_jobs.get(export_path))
+            if st.button("Ekspor") and not (status and status["state"] == "running"):
+                # Dengan Top-K, pm_results hanya berisi alternatif teratas; ekspor memakai seluruh hasil status penilaian
+                pm_state = st.session_state.get("pm_state")
+                source = pm_state.to_frame() if pm_state is not None else st.session_state["pm_results"]
+                export_jobs[export_path] = start_export(source, export_path)
+                status = export_status(export_jobs[export_path])
+            if status and status["state"] == "running":
+                st.caption(f"Mengekspor {status['rows']} dari {status['total']} baris...")
+                st.button("Perbarui Status Ekspor")
+            elif status and status["state"] == "failed":
+                st.error(f"Gagal mengekspor: {status['error']}")
+            elif status and os.path.exists(export_path):
+                st.success(f"{status['rows']} baris diekspor ke '{os.path.basename(export_path)}'")
+                with open(export_path, "rb") as file:
+                    st.download_button("Unduh Hasil Ekspor", file, file_name=os.path.basename(export_path))
+
+    # Analisis stabilitas peringkat terhadap ketidakpastian penilaian AHP
+    with st.expander("Analisis Stabilitas Peringkat (SMAA)"):
+        smaa_samples = st.number_input("Jumlah Sampel Bobot", min_value=100, step=100, value=form_default("smaa_samples", 2000), key="smaa_samples")
+        smaa_sigma = st.number_input("Simpangan Penilaian (sigma log)", min_value=0.0, step=0.05, value=form_default("smaa_sigma", 0.1), format="%.2f", key="smaa_sigma")
+        smaa_max_rank = st.number_input("Jumlah Peringkat Teratas (0 = semua)", min_value=0, step=1, value=form_default("smaa_max_rank", 5), key="smaa_max_rank")
+        if st.button("Hitung Akseptabilitas Peringkat"):
+            acceptability = smaa_from_ahp(
+                st.session_state.ahp_results,
+                alternatives,
+                {key: val["ideal_value"] for key, val in sub_criteria_config.items()},
+                n_samples=int(smaa_samples),
+                sigma=smaa_sigma,
+                max_rank=smaa_max_rank if smaa_max_rank > 0 else None
+            )
+            st.write("Probabilitas setiap alternatif menempati setiap peringkat")
+            st.dataframe(acceptability.round(3))
+
+# Halaman New Data: form AHP dan Profile Matching beserta bagian simpan (dipakai juga oleh halaman Load Data).
+# Setiap bagian form adalah fragment: mengubah satu isian hanya menjalankan ulang bagian tersebut
+def render():
+    st.title("Sistem Pendukung Keputusan AHP dan Profile Matching")
+
+    # Status simpan/muat yang berjalan di latar; job yang selesai diterapkan sebelum widget form dibuat
+    job_watcher()
+
+    # Tab untuk AHP dan Profile Matching
+    tabs = st.tabs(["AHP - Pembobotan", "Profile Matching - Perangkingan"])
+
+    # Variabel global untuk menyimpan data
+    if "ahp_results" not in st.session_state:
+        st.session_state.ahp_results = None
+
+    # ----------------- TAB 1: AHP -----------------
+    with tabs[0]:
+        st.header("Analytic Hierarchy Process (AHP)")
+
+        # Input kriteria utama dan sub-kriteria
+        criteria_labels, sub_criteria_dict = criteria_structure()
+        criteria_section((criteria_labels, sub_criteria_dict))
 
-        # Perhitungan bobot untuk sub-kriteria
-        sub_results = {}
+        st.write(f'### Matriks Perbandingan')
+
+        main_matrix_section(criteria_labels)
         for criteria, sub_labels in sub_criteria_dict.items():
             if len(sub_labels) > 0:
-                matrix_sub = sub_matrices[criteria]
-                df_sub, weights_sub, lambda_max_sub, CI_sub, CR_sub, RI_sub = ahp_rumus(matrix_sub, sub_labels)
+                sub_matrix_section(criteria, sub_labels)
+
+        # Tombol untuk menghitung semua bobot
+        if st.button("Hitung Bobot Prioritas"):
+            # Matriks dibentuk dari nilai isian terakhir setiap bagian matriks
+            matrix_main = comparison_matrix(criteria_labels, "matrix_main")
+            sub_matrices = {
+                criteria: comparison_matrix(sub_labels, f"matrix_sub_{criteria}")
+                for criteria, sub_labels in sub_criteria_dict.items() if len(sub_labels) > 0
+            }
+
+            # Perhitungan bobot kriteria utama dan seluruh sub-kriteria dalam satu proses batch
+            sub_criteria_names = [criteria for criteria, sub_labels in sub_criteria_dict.items() if len(sub_labels) > 0]
+            dfs, weights_all, lambda_max_all, CI_all, CR_all, RI_all = ahp_rumus_batch(
+                [matrix_main] + [sub_matrices[criteria] for criteria in sub_criteria_names],
+                labels=[criteria_labels] + [sub_criteria_dict[criteria] for criteria in sub_criteria_names],
+                with_df=True
+            )
+            df_main = dfs[0]
+            weights_main = weights_all[0, :len(criteria_labels)]
+            lambda_max_main, CI_main, CR_main, RI_main = lambda_max_all[0], CI_all[0], CR_all[0], RI_all[0]
+
+            # Simpan hasil ke session state
+            st.session_state.ahp_results = {
+                "criteria_labels": criteria_labels,
+                "weights_main": weights_main,
+                "sub_criteria_dict": sub_criteria_dict,
+                "sub_matrices": sub_matrices,
+                "df_main": df_main.to_dict()
+            }
+
+            # Tampilkan hasil kriteria utama
+            st.write("### Hasil Perhitungan Bobot Kriteria Utama")
+            st.dataframe(df_main.round(3))
+            st.write(f"**Lambda Max**: {lambda_max_main:.3f}")
+            st.write(f"**CI**: {CI_main:.3f}")
+            st.write(f"**RI**: {RI_main:.3f}")
+            st.write(f"**CR**: {CR_main:.3f}")
+            if CR_main < 0.1:
+                st.success("Matriks kriteria utama konsisten.")
+                st.session_state.is_consistent = True
+            else:
+                st.error("Matriks kriteria utama tidak konsisten, silakan perbaiki nilai perbandingan.")
+                st.session_state.is_consistent = False
+                # st.session_state.ahp_results = None
+
+            # Perhitungan bobot untuk sub-kriteria
+            sub_results = {}
+            for k, criteria in enumerate(sub_criteria_names, start=1):
+                sub_labels = sub_criteria_dict[criteria]
+                df_sub = dfs[k]
+                weights_sub = weights_all[k, :len(sub_labels)]
+                lambda_max_sub, CI_sub, CR_sub, RI_sub = (
+                    float(lambda_max_all[k]), float(CI_all[k]), float(CR_all[k]), float(RI_all[k])
+                )
 
                 # Tampilkan hasil perhitungan
                 st.write(f"### Hasil Perhitungan Bobot Sub-Kriteria untuk {criteria}")
@@ -280,7 +656,9 @@ with tabs[0]:
                     "lambda_max_sub": lambda_max_sub,
                     "CI_sub": CI_sub,
                     "CR_sub": CR_sub,
-                    "RI_sub": RI_sub
+                    "RI_sub": RI_sub,
+                    # Hash matriks agar bobot bisa dipakai ulang dari cache setelah file dimuat
+                    "matrix_hash": cache_store(sub_matrices[criteria], sub_labels, weights_sub, lambda_max_sub, CI_sub, CR_sub, RI_sub)
                 }
 
                 # Periksa konsistensi matriks
@@ -292,194 +670,49 @@ with tabs[0]:
                     st.session_state.is_consistent = False
                     # st.session_state.ahp_results = None
 
-        # Simpan semua hasil bobot sub-kriteria ke dalam st.session_state
-        st.session_state["ahp_results"]["sub_results"] = sub_results
-
-# ----------------- TAB 2: Profile Matching -----------------
-with tabs[1]:
-    st.header("Profile Matching")
-    
-    # Pemeriksaan ketidaksesuaian kriteria dengan sub-kriteria
-    incompatible_criteria = [
-        criteria for criteria in criteria_labels 
-        if len(sub_criteria_dict.get(criteria, [])) == 0  # Mengecek jika kriteria tidak memiliki sub-kriteria
-    ]
-    
-    if incompatible_criteria:
-        st.error(f"Perhatian: Kriteria {', '.join(incompatible_criteria)} tidak memiliki sub-kriteria. Perbaiki Kriteria dan parameter")
-        st.stop()  # Hentikan eksekusi jika kriteria utama tidak memiliki sub-kriteria
-
-    # Pastikan hasil AHP sudah ada
-    if st.session_state.ahp_results is None:
-        st.warning("Silakan lakukan perhitungan AHP di tab sebelumnya terlebih dahulu!")
-    elif not st.session_state.get('is_consistent', True):  # Cek konsistensi matriks
-        st.warning("Matriks tidak konsisten. Perbaiki matriks terlebih dahulu.")
-    else:
-        ahp_results = st.session_state.ahp_results
-        criteria_labels = ahp_results["criteria_labels"]
-        weights_main = ahp_results["weights_main"]
-        sub_criteria_dict = ahp_results["sub_criteria_dict"]
-        sub_matrices = ahp_results["sub_matrices"]
-
-        # Tampilkan form input untuk Profile Matching
-        st.write("### Input Nilai Profil Ideal")
-        sub_criteria_config = {}
-        sub_criteria_weights = {}
-        criteria_groups = {}
-
-        for i, criteria in enumerate(criteria_labels):
-            # Tampilkan kriteria utama hanya dengan nama dan bobot AHP
-            st.write(f"**{criteria}** (Bobot AHP: {weights_main[i]:.3f})")
-
-            # Jika kriteria memiliki sub-kriteria, tampilkan dropdown
-            if len(sub_criteria_dict[criteria]) > 0:
-                with st.expander(f"Sub-Kriteria untuk {criteria}"):
-                    # Ambil bobot sub-kriteria dari hasil AHP
-                    df_sub, weights_sub, _, _, _, _ = ahp_rumus(sub_matrices[criteria], sub_criteria_dict[criteria])
-
-                    # Buat daftar sub-kriteria untuk setiap kriteria utama
-                    criteria_groups[criteria] = []
-
-                    for j, sub_criteria in enumerate(sub_criteria_dict[criteria]):
-                        col1, col2, col3 = st.columns([1, 1, 1])
-                        with col1:
-                            st.selectbox(
-                                f"{sub_criteria} - Jenis Data",
-                                ["Numerik", "Kategorikal"],
-                                key=f"data_type_{sub_criteria}"
-                            )
-                        with col2:
-                            data_type = st.session_state.get(f"data_type_{sub_criteria}", "Numerik")
-                            if data_type == "Numerik":
-                                is_range = st.checkbox(
-                                    f"{sub_criteria} - Rentang Nilai?",
-                                    key=f"is_range_{sub_criteria}"
-                                )
-                                if is_range:
-                                    st.number_input(
-                                        f"Nilai Minimum {sub_criteria}",
-                                        value=0.0,
-                                        format="%.3f",
-                                        key=f"min_value_{sub_criteria}"
-                                    )
-                                    st.number_input(
-                                        f"Nilai Maksimum {sub_criteria}",
-                                        value=5.0,
-                                        format="%.3f",
-                                        key=f"max_value_{sub_criteria}"
-                                    )
-                                else:
-                                    st.number_input(
-                                        f"Nilai Ideal {sub_criteria}",
-                                        value=5.0,
-                                        format="%.3f",
-                                        key=f"ideal_value_{sub_criteria}"
-                                    )
-                            else:
-                                st.text_input(
-                                    f"Nilai Ideal {sub_criteria} (Pisahkan dengan koma jika lebih dari satu)",
-                                    value="",
-                                    key=f"ideal_value_{sub_criteria}"
-                                )
-                        with col3:
-                            weight = weights_sub[j]
-                            st.write(f"Bobot AHP: {weight:.3f}")
-
-                            # Simpan bobot ke dictionary
-                            sub_criteria_weights[sub_criteria] = weight
-                            criteria_groups[criteria].append(sub_criteria)
-
-                        # Simpan konfigurasi sub-kriteria
-                        ideal_value = st.session_state.get(f"ideal_value_{sub_criteria}", "")
-                        if data_type == "Kategorikal" and isinstance(ideal_value, str):
-                            ideal_value = [v.strip() for v in ideal_value.split(",") if v.strip()]
-                        sub_criteria_config[sub_criteria] = {
-                            "data_type": data_type,
-                            "ideal_value": (
-                                [st.session_state.get(f"min_value_{sub_criteria}", 0.0),
-                                 st.session_state.get(f"max_value_{sub_criteria}", 5.0)]
-                                if st.session_state.get(f"is_range_{sub_criteria}", False)
-                                else ideal_value
-                            ),
-                        }
-
-        # Input alternatif
-        st.write("### Input Nilai Alternatif")
-        num_alternatives = st.number_input("Jumlah Alternatif", min_value=1, step=1, value=3, key="num_alternatives")
-        alternatives = {}
+            # Simpan semua hasil bobot sub-kriteria ke dalam st.session_state
+            st.session_state["ahp_results"]["sub_results"] = sub_results
 
-        for i in range(num_alternatives):
-            with st.expander(f"Alternatif {i+1}"):
-                alt_name = st.text_input(f"Nama Alternatif {i+1}", value=f"A{i+1}", key=f"alt_name_{i}")
-                alt_values = {}
-                for criteria in criteria_labels:
-                    if len(sub_criteria_dict[criteria]) > 0:
-                        for sub_criteria in sub_criteria_dict[criteria]:
-                            if sub_criteria_config[sub_criteria]["data_type"] == "Numerik":
-                                if isinstance(sub_criteria_config[sub_criteria]["ideal_value"], list):
-                                    val = st.number_input(
-                                        f"Nilai {sub_criteria} untuk {alt_name}",
-                                        value=0.0,
-                                        format="%.3f",
-                                        key=f"value_{alt_name}_{sub_criteria}"
-                                    )
-                                    alt_values[sub_criteria] = val
-                                else:
-                                    val = st.number_input(
-                                        f"Nilai {sub_criteria} untuk {alt_name}",
-                                        value=0.0,
-                                        format="%.3f",
-                                        key=f"value_{alt_name}_{sub_criteria}"
-                                    )
-                                    alt_values[sub_criteria] = val
-                            else:  # Jika data kategorikal
-                                val = st.text_input(
-                                    f"Nilai {sub_criteria} untuk {alt_name}",
-                                    value="",
-                                    key=f"value_{alt_name}_{sub_criteria}"
-                                )
-                                alt_values[sub_criteria] = val
-                    else:
-                        val = st.text_input(
-                            f"Nilai {criteria} untuk {alt_name}",
-                            value="",
-                            key=f"value_{alt_name}_{criteria}"
-                        )
-                        alt_values[criteria] = val
-                # Hanya tambahkan alternatif jika nama alternatif tidak kosong
-                if alt_name.strip():
-                    alternatives[alt_name] = alt_values
-                else:
-                    st.warning(f"Alternatif {i+1} tidak dimasukkan karena nama kosong.")
+    # ----------------- TAB 2: Profile Matching -----------------
+    with tabs[1]:
+        st.header("Profile Matching")
 
+        # Pemeriksaan ketidaksesuaian kriteria dengan sub-kriteria
+        incompatible_criteria = [
+            criteria for criteria in criteria_labels
+            if len(sub_criteria_dict.get(criteria, [])) == 0  # Mengecek jika kriteria tidak memiliki sub-kriteria
+        ]
 
+        if incompatible_criteria:
+            st.error(f"Perhatian: Kriteria {', '.join(incompatible_criteria)} tidak memiliki sub-kriteria. Perbaiki Kriteria dan parameter")
+            st.stop()  # Hentikan eksekusi jika kriteria utama tidak memiliki sub-kriteria
 
-        # Tombol hitung perangkingan
-        if st.button("Hitung Perangkingan"):
-            # Ideal values sesuai jenis data
-            ideal_values = {
-                key: val["ideal_value"] for key, val in sub_criteria_config.items()
-            }
+        # Pastikan hasil AHP sudah ada
+        if st.session_state.ahp_results is None:
+            st.warning("Silakan lakukan perhitungan AHP di tab sebelumnya terlebih dahulu!")
+        elif not st.session_state.get('is_consistent', form_default('is_consistent', True)):  # Cek konsistensi matriks
+            st.warning("Matriks tidak konsisten. Perbaiki matriks terlebih dahulu.")
+        else:
+            ahp_results = st.session_state.ahp_results
 
-            # Perhitungan Profile Matching
-            results = profile_matching_with_ranges(
-                alternatives,
-                ideal_values,
-                criteria_groups,
-                sub_criteria_weights,
-                dict(zip(criteria_labels, weights_main))
-            )
+            # Tampilkan form input untuk Profile Matching
+            ideal_profile_section(ahp_results, sub_criteria_data_types(ahp_results["sub_criteria_dict"]))
 
-            # Simpan hasil perangkingan ke session state
-            st.session_state["pm_results"] = results
+            # Input alternatif
+            alternatives_section(ahp_results["criteria_labels"], ahp_results["sub_criteria_dict"])
+
+            results_section(ahp_results["criteria_labels"], ahp_results["weights_main"])
+
+        st.write("---")
+        st.subheader("Simpan Data Perhitungan AHP dan Profile Matching")
+        # Input nama file untuk menyimpan
+        st.text_input("Nama File Simpan (contoh: data.json)", value=form_default("save_file_name", "data.json"), key="save_file_name")
+        st.checkbox("Simpan hasil perangkingan dalam format kolom biner (untuk data besar)", value=form_default("save_columnar", False), key="save_columnar")
+        st.checkbox("Simpan perubahan saja (jurnal, lebih cepat untuk proyek besar)", value=form_default("save_journal", False), key="save_journal")
+        if st.button("Simpan Data"):
+            save_to_json(st.session_state.save_file_name)
+            st.rerun()  # Tampilkan status simpan di bagian atas halaman
 
-            # Tampilkan hasil perangkingan
-            st.write("### Hasil Perangkingan")
-            st.dataframe(pd.DataFrame(results).round(3))
 
-    st.write("---")
-    st.subheader("Simpan Data Perhitungan AHP dan Profile Matching")
-    # Input nama file untuk menyimpan
-    st.text_input("Nama File Simpan (contoh: data.json)", value="data.json", key="save_file_name")
-    if st.button("Simpan Data"):
-        save_to_json(st.session_state.save_file_name)
+if __name__ == "__main__":
+    render()
@@ -0,0 +1,118 @@
+"""Benchmark serialisasi data proyek: jalur lama (konversi manual + json) vs json_codec.
+
+Contoh:
+    python bench_codec.py --file data/V1_update.json --alternatives 20000 --repeat 5
+"""
+import argparse
+import copy
+import gc
+import json
+import time
+
+import numpy as np
+
+import json_codec
+from json_codec import ahp_arrays, to_builtin
+
+# Bangun data sesi tiruan: hasil AHP dengan array NumPy, hasil PM dan widget untuk n alternatif
+def build_session(file_path, n_alternatives):
+    with open(file_path, "r") as file:
+        data = json.load(file)
+    template = data["pm_results"][0]
+    sub_criteria = [key for subs in data["ahp_results"]["sub_criteria_dict"].values() for key in subs]
+    pm_results, form_data = [], dict(data["form_data"])
+    for i in range(n_alternatives):
+        name = f"A{i}"
+        pm_results.append({**template, "Alternatif": name, "Final Score": float(np.float64(i) / 7), "Ranking": i + 1})
+        form_data[f"alt_name_{i}"] = name
+        for sub in sub_criteria:
+            form_data[f"value_{name}_{sub}"] = f"{i % 97}.5"
+    form_data["num_alternatives"] = n_alternatives
+    return {"ahp_results": ahp_arrays(data["ahp_results"]), "pm_results": pm_results, "form_data": form_data}
+
+# Jalur lama: ubah array ke list satu per satu, lalu json.dump
+def legacy_dumps(session):
+    data = copy.copy(session)
+    ahp_results = dict(data["ahp_results"])
+    ahp_results["sub_matrices"] = {
+        key: value.tolist() if isinstance(value, np.ndarray) else value
+        for key, value in ahp_results["sub_matrices"].items()
+    }
+    ahp_results["weights_main"] = (
+        ahp_results["weights_main"].tolist() if isinstance(ahp_results["weights_main"], np.ndarray) else ahp_results["weights_main"]
+    )
+    sub_results = {}
+    for key, sub_result in ahp_results["sub_results"].items():
+        sub_result = dict(sub_result)
+        if "weights_sub" in sub_result:
+            sub_result["weights_sub"] = (
+                sub_result["weights_sub"].tolist() if isinstance(sub_result["weights_sub"], np.ndarray) else sub_result["weights_sub"]
+            )
+        sub_results[key] = sub_result
+    ahp_results["sub_results"] = sub_results
+    data["ahp_results"] = ahp_results
+    return json.dumps(data)
+
+# Jalur lama: json.load lalu bangun ulang array per key
+def legacy_loads(raw):
+    data = json.loads(raw)
+    ahp_results = data["ahp_results"]
+    ahp_results["sub_matrices"] = {
+        key: np.array(value) if isinstance(value, list) else value
+        for key, value in ahp_results["sub_matrices"].items()
+    }
+    ahp_results["weights_main"] = np.array(ahp_results["weights_main"])
+    for sub_result in ahp_results["sub_results"].values():
+        if "weights_sub" in sub_result:
+            sub_result["weights_sub"] = np.array(sub_result["weights_sub"])
+    return data
+
+def codec_loads(raw, backend):
+    data = json_codec.loads(raw, backend=backend)
+    data["ahp_results"] = ahp_arrays(data["ahp_results"])
+    return data
+
+# Waktu terbaik dari beberapa kali jalan; GC dimatikan selama pengukuran seperti timeit
+def best_of(repeat, func, *args):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            result = func(*args)
+            best = min(best, time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--file", default="data/V1_update.json")
+    parser.add_argument("--alternatives", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    session = build_session(args.file, args.alternatives)
+    expected = to_builtin(session)
+
+    candidates = [("lama (json + konversi manual)", legacy_dumps, legacy_loads)]
+    backends = ["json"] + (["orjson"] if json_codec.orjson is not None else [])
+    for backend in backends:
+        candidates.append((
+            f"json_codec ({backend})",
+            lambda data, backend=backend: json_codec.dumps(data, backend=backend),
+            lambda raw, backend=backend: codec_loads(raw, backend),
+        ))
+
+    print(f"{args.alternatives} alternatif, terbaik dari {args.repeat} kali")
+    print(f"{'jalur':<32} {'ukuran':>10} {'simpan':>10} {'muat':>10} {'MB/s simpan':>12} {'sama':>6}")
+    for label, dumps, loads in candidates:
+        dump_time, raw = best_of(args.repeat, dumps, session)
+        load_time, restored = best_of(args.repeat, loads, raw)
+        size = len(raw)
+        same = to_builtin(restored) == expected
+        print(f"{label:<32} {size / 1e6:>8.2f}MB {dump_time * 1e3:>8.1f}ms {load_time * 1e3:>8.1f}ms {size / 1e6 / dump_time:>12.1f} {str(same):>6}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Benchmark waktu rerun per halaman: runpy.run_path (cara lama main.py) vs modul halaman yang diimpor sekali.
+
+Contoh:
+    python bench_pages.py --file V1_update.json --reruns 20
+"""
+import argparse
+import statistics
+import time
+
+from streamlit.testing.v1 import AppTest
+
+from project_io import JOBS_KEY
+
+# Cara lama: setiap rerun membaca, mengompilasi dan menjalankan ulang file halaman
+RUNPY_SCRIPT = """
+import runpy
+runpy.run_path({path!r}, run_name="__main__")
+"""
+
+# Cara baru: modul diimpor sekali (tersimpan di sys.modules), rerun hanya memanggil render()
+MODULE_SCRIPT = """
+import importlib
+importlib.import_module({module!r}).render()
+"""
+
+PAGES = [("New Data", "app"), ("Load Data", "load"), ("View Data", "modif")]
+
+# Muat proyek lewat halaman Load Data agar form terisi seperti pemakaian nyata
+def _load_project(at, file_name):
+    at.selectbox[0].set_value(file_name).run()
+    next(button for button in at.button if button.label == "Muat Data").click().run()
+    # Proyek dibaca di worker latar; jalankan ulang sampai job muat selesai diterapkan
+    while JOBS_KEY in at.session_state and at.session_state[JOBS_KEY]:
+        time.sleep(0.05)
+        at.run()
+
+def measure(script, reruns, file_name=None):
+    at = AppTest.from_string(script, default_timeout=120)
+    at.run()
+    if file_name is not None:
+        _load_project(at, file_name)
+    at.run()  # Pemanasan
+    times = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        at.run()
+        times.append(time.perf_counter() - start)
+        if at.exception:
+            raise RuntimeError(at.exception[0].value)
+    return statistics.median(times), min(times)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--file", default="V1_update.json", help="proyek di data/ yang dimuat untuk halaman Load Data")
+    parser.add_argument("--reruns", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"Median (minimum) dari {args.reruns} rerun, ms")
+    print(f"{'halaman':<12} {'runpy':>16} {'modul':>16} {'percepatan':>11}")
+    for title, module in PAGES:
+        file_name = args.file if module == "load" else None
+        old, old_best = measure(RUNPY_SCRIPT.format(path=f"{module}.py"), args.reruns, file_name)
+        new, new_best = measure(MODULE_SCRIPT.format(module=module), args.reruns, file_name)
+        print(f"{title:<12} {old * 1e3:>8.1f} ({old_best * 1e3:>5.1f}) {new * 1e3:>8.1f} ({new_best * 1e3:>5.1f}) {old / new:>10.2f}x")
+
+if __name__ == "__main__":
+    main()
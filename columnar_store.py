@@ -0,0 +1,193 @@
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+# Folder sidecar: data/<nama>.cols berisi satu file .npy per kelompok kolom
+SIDECAR_SUFFIX = ".cols"
+COLUMNAR_VERSION = 1
+SCHEMA_FILE = "schema.json"
+
+NAME_COLUMN = "Alternatif"
+FINAL_COLUMN = "Final Score"
+RANK_COLUMN = "Ranking"
+
+# Lokasi sidecar untuk file proyek data/<nama>.json
+def sidecar_dir(file_path):
+    root, ext = os.path.splitext(file_path)
+    return (root if ext == ".json" else file_path) + SIDECAR_SUFFIX
+
+# Hasil perangkingan yang dibuka dari sidecar lewat memory mapping
+class ColumnarTable:
+    """Tabel hasil Profile Matching berbasis kolom.
+
+    Nilai numerik dibaca dengan `np.load(mmap_mode="r")` sehingga membuka
+    tabel tidak menyalin data; baris baru dibaca saat diakses. Matriks gap
+    dan skor kriteria disimpan dengan urutan Fortran agar setiap kolom
+    bersebelahan di disk. Nama alternatif disimpan sebagai satu blok UTF-8
+    dengan tabel offset (gaya Arrow).
+    """
+
+    def __init__(self, path):
+        with open(os.path.join(path, SCHEMA_FILE), "r") as file:
+            schema = json.load(file)
+        if schema.get("version") != COLUMNAR_VERSION:
+            raise ValueError(f"Versi sidecar '{path}' tidak dikenali: {schema.get('version')}")
+
+        def load(name):
+            return np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+
+        self.path = path
+        self.columns = schema["columns"]
+        self.gap_columns = schema["gap_columns"]
+        self.criteria_columns = schema["criteria_columns"]
+        self.integer_columns = set(schema["integer_columns"])
+        self.name_bytes = load("names")
+        self.name_offsets = load("name_offsets")
+        self.gap = load("gap")
+        self.criteria = load("criteria")
+        self.final = load("final")
+        self.ranking = load("ranking")
+        self._locations = {NAME_COLUMN: ("names", None), FINAL_COLUMN: ("final", None), RANK_COLUMN: ("ranking", None)}
+        self._locations.update({key: ("gap", i) for i, key in enumerate(self.gap_columns)})
+        self._locations.update({key: ("criteria", i) for i, key in enumerate(self.criteria_columns)})
+
+    def __len__(self):
+        return len(self.final)
+
+    # Nama alternatif pada baris start..stop
+    def names(self, start=0, stop=None):
+        stop = len(self) if stop is None else min(stop, len(self))
+        if start >= stop:
+            return []
+        offsets = np.asarray(self.name_offsets[start:stop + 1]) - self.name_offsets[start]
+        raw = self.name_bytes[self.name_offsets[start]:self.name_offsets[stop]].tobytes()
+        text = raw.decode("utf-8")
+        if len(text) == len(raw):
+            # Hanya ASCII: offset byte sama dengan offset karakter
+            return [text[a:b] for a, b in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
+        return [raw[a:b].decode("utf-8") for a, b in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
+
+    # Satu kolom sebagai array (view ke file untuk kolom numerik)
+    def column(self, key, start=0, stop=None):
+        group, index = self._locations[key]
+        if group == "names":
+            return np.array(self.names(start, stop), dtype=object)
+        array = getattr(self, group)
+        values = array[start:stop] if index is None else array[start:stop, index]
+        return values.astype(np.int64) if key in self.integer_columns and values.dtype != np.int64 else values
+
+    # DataFrame untuk rentang baris (seluruh tabel jika tanpa argumen)
+    def to_frame(self, start=0, stop=None):
+        return pd.DataFrame({key: self.column(key, start, stop) for key in self.columns})
+
+    # DataFrame untuk baris pada posisi `rows` (berurutan sesuai `rows`), hanya baris tersebut yang dibaca
+    def take(self, rows):
+        rows = np.asarray(rows, dtype=np.intp)
+        starts = np.asarray(self.name_offsets[rows]).tolist()
+        stops = np.asarray(self.name_offsets[rows + 1]).tolist()
+        names = [self.name_bytes[a:b].tobytes().decode("utf-8") for a, b in zip(starts, stops)]
+        return pd.DataFrame({
+            key: np.array(names, dtype=object) if key == NAME_COLUMN else self.column(key)[rows]
+            for key in self.columns
+        })
+
+    def to_records(self):
+        return self.to_frame().to_dict("records")
+
+    # Baris peringkat pertama tanpa memuat seluruh tabel
+    def top(self):
+        if not len(self):
+            return None
+        row = int(np.argmin(self.ranking))
+        return self.to_frame(row, row + 1).to_dict("records")[0]
+
+# Tulis hasil perangkingan ke folder sidecar
+def write_columnar(path, pm_results, criteria=()):
+    """Menyimpan hasil perangkingan (list dict, DataFrame atau ColumnarTable) ke `path`.
+
+    Kolom `criteria` disimpan di matriks skor kriteria, kolom numerik lain
+    selain skor akhir dan peringkat di matriks bobot gap. File ditulis ke
+    folder sementara lalu dipindahkan agar pembaca tidak melihat sidecar
+    setengah jadi.
+    """
+    frame = pm_frame(pm_results)
+    for key in (NAME_COLUMN, FINAL_COLUMN, RANK_COLUMN):
+        if key not in frame.columns:
+            raise ValueError(f"Kolom '{key}' tidak ditemukan pada hasil perangkingan")
+    numeric = [key for key in frame.columns if key != NAME_COLUMN]
+    for key in numeric:
+        if not pd.api.types.is_numeric_dtype(frame[key]) or pd.api.types.is_bool_dtype(frame[key]):
+            raise TypeError(f"Kolom '{key}' harus numerik untuk disimpan dalam format kolom")
+    criteria_columns = [key for key in frame.columns if key in set(criteria) and key in numeric]
+    gap_columns = [key for key in numeric if key not in criteria_columns and key not in (FINAL_COLUMN, RANK_COLUMN)]
+
+    encoded = [str(name).encode("utf-8") for name in frame[NAME_COLUMN]]
+    name_offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(name) for name in encoded], out=name_offsets[1:])
+    arrays = {
+        "names": np.frombuffer(b"".join(encoded), dtype=np.uint8),
+        "name_offsets": name_offsets,
+        "gap": np.asfortranarray(frame[gap_columns].to_numpy(dtype=np.float64)),
+        "criteria": np.asfortranarray(frame[criteria_columns].to_numpy(dtype=np.float64)),
+        "final": frame[FINAL_COLUMN].to_numpy(dtype=np.float64),
+        "ranking": frame[RANK_COLUMN].to_numpy(dtype=np.int64),
+    }
+    schema = {
+        "version": COLUMNAR_VERSION,
+        "rows": len(frame),
+        "columns": list(frame.columns),
+        "gap_columns": gap_columns,
+        "criteria_columns": criteria_columns,
+        "integer_columns": [key for key in numeric if pd.api.types.is_integer_dtype(frame[key])],
+    }
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+    for name, array in arrays.items():
+        np.save(os.path.join(tmp_path, f"{name}.npy"), array)
+    with open(os.path.join(tmp_path, SCHEMA_FILE), "w") as file:
+        json.dump(schema, file)
+
+    # Folder tidak bisa ditimpa langsung; pindahkan versi lama dulu lalu hapus
+    old_path = f"{path}.{os.getpid()}.old"
+    if os.path.isdir(path):
+        os.replace(path, old_path)
+    os.replace(tmp_path, path)
+    shutil.rmtree(old_path, ignore_errors=True)
+    return schema
+
+# Buka sidecar; None jika tidak ada
+def open_columnar(path):
+    if not os.path.isfile(os.path.join(path, SCHEMA_FILE)):
+        return None
+    return ColumnarTable(path)
+
+def remove_columnar(file_path):
+    shutil.rmtree(sidecar_dir(file_path), ignore_errors=True)
+
+# Ganti referensi sidecar di dict proyek dengan tabel yang dibuka lewat memory mapping
+def attach_columnar(data, file_path):
+    reference = data.get("pm_columnar")
+    if reference and not data.get("pm_results"):
+        data["pm_results"] = open_columnar(os.path.join(os.path.dirname(file_path), reference["path"]))
+    return data
+
+# Hasil perangkingan dalam bentuk list dict (format JSON lama)
+def pm_records(pm_results):
+    if isinstance(pm_results, ColumnarTable):
+        return pm_results.to_records()
+    if isinstance(pm_results, pd.DataFrame):
+        return pm_results.to_dict("records")
+    return pm_results
+
+# Hasil perangkingan dalam bentuk DataFrame
+def pm_frame(pm_results):
+    if isinstance(pm_results, ColumnarTable):
+        return pm_results.to_frame()
+    if isinstance(pm_results, pd.DataFrame):
+        return pm_results
+    return pd.DataFrame(pm_results)
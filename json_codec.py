@@ -0,0 +1,81 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+# orjson opsional: jauh lebih cepat dan langsung mengenali array NumPy
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Backend bawaan: orjson jika terpasang, selain itu modul json standar
+BACKEND = "orjson" if orjson is not None else "json"
+
+# Konversi satu objek NumPy/pandas ke tipe bawaan Python; dipanggil encoder untuk tipe yang tidak dikenalnya
+def _default(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.to_dict()
+    raise TypeError(f"Objek bertipe {type(value).__name__} tidak dapat diserialisasi ke JSON")
+
+# Serialisasi dalam satu kali jalan; hasil selalu bytes UTF-8
+def dumps(data, backend=None):
+    """Mengubah `data` (boleh berisi array/skalar NumPy dan DataFrame) menjadi JSON ringkas.
+
+    Dengan orjson, array NumPy ditulis langsung dari buffernya. orjson menulis
+    NaN/Infinity sebagai null (JSON standar), sedangkan modul json menulis
+    literal NaN/Infinity.
+    """
+    backend = backend or BACKEND
+    if backend == "orjson":
+        return orjson.dumps(data, default=_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    if backend == "json":
+        return json.dumps(data, default=_default, separators=(",", ":")).encode("utf-8")
+    raise ValueError(f"Backend JSON tidak dikenal: {backend}")
+
+def loads(raw, backend=None):
+    backend = backend or BACKEND
+    if backend == "orjson":
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # File lama yang ditulis modul json bisa berisi literal NaN yang ditolak orjson
+            return json.loads(raw)
+    if backend == "json":
+        return json.loads(raw)
+    raise ValueError(f"Backend JSON tidak dikenal: {backend}")
+
+# Tipe bawaan yang dikembalikan apa adanya; dicek dengan type() agar skalar NumPy turunan float tidak lolos
+_SCALARS = frozenset((str, int, float, bool, type(None)))
+
+# Salinan data dengan semua objek NumPy/pandas diubah ke tipe bawaan (untuk perbandingan dan database)
+def to_builtin(data):
+    if type(data) in _SCALARS:
+        return data
+    if isinstance(data, dict):
+        return {key: to_builtin(value) for key, value in data.items()}
+    if isinstance(data, (list, tuple)):
+        return [to_builtin(value) for value in data]
+    if isinstance(data, (np.ndarray, np.generic, pd.DataFrame, pd.Series)):
+        return _default(data)
+    return data
+
+# Kembalikan matriks dan bobot hasil AHP ke array NumPy seperti saat dihitung
+def ahp_arrays(ahp_results):
+    if not ahp_results:
+        return ahp_results
+    restored = dict(ahp_results)
+    if "sub_matrices" in restored:
+        restored["sub_matrices"] = {key: np.asarray(value, dtype=float) for key, value in restored["sub_matrices"].items()}
+    if "weights_main" in restored:
+        restored["weights_main"] = np.asarray(restored["weights_main"], dtype=float)
+    if "sub_results" in restored:
+        restored["sub_results"] = {
+            key: {**result, "weights_sub": np.asarray(result["weights_sub"], dtype=float)} if "weights_sub" in result else result
+            for key, result in restored["sub_results"].items()
+        }
+    return restored
@@ -1,18 +1,20 @@
 import streamlit as st
-import runpy
+
+import app
+import load
+import modif
 
 # Set konfigurasi halaman di awal aplikasi (hanya sekali)
 st.set_page_config(layout="wide", page_title="Aplikasi Pendukung Keputusan")
 
-# Sidebar untuk navigasi
-st.sidebar.title("Navigasi")
-page = st.sidebar.radio("Pilih Jenis Data", ("New Data", "Load Data", "View Data"))
+# Halaman diimpor sekali sebagai modul; setiap interaksi hanya memanggil render() halaman yang aktif
+pages = {
+    "Navigasi": [
+        st.Page(app.render, title="New Data", url_path="new-data", default=True),
+        st.Page(load.render, title="Load Data", url_path="load-data"),
+        st.Page(modif.render, title="View Data", url_path="view-data"),
+    ]
+}
 
 # Jalankan halaman yang dipilih
-if page == "New Data":
-    runpy.run_path("app.py")
-elif page == "Load Data":
-    runpy.run_path("load.py")
-elif page == "View Data":
-    runpy.run_path("modif.py")
-
+st.navigation(pages).run()
@@ -1,140 +1,242 @@
 import streamlit as st
 import os
-import time
-import json
-import runpy
+import sqlite3
+import uuid
 import pandas as pd
-
-# Atur lebar kolom agar lebih optimal
-st.markdown(
-    """
-    <style>
-    .streamlit-expanderHeader {
-        font-size: 18px;
-        font-weight: bold;
-    }
-    .dataframe-container {
-        width: 100% !important;
-        height: 100% !important;
-    }
-    </style>
-    """, unsafe_allow_html=True
-)
+from project_store import delete_project, load_parts
+from columnar_store import open_columnar, remove_columnar, sidecar_dir
+from project_journal import read_project, remove_journal
+from result_export import EXPORT_JOBS_KEY, EXPORT_SESSION_KEY, export_status, session_export_path, start_export
+from result_view import result_table
+from app import VIEW_DATA_RESULT_KEY
+from scenario_compare import compare_scenarios, load_scenarios
+from project_index import describe, invalidate, project_index
+from project_io import job_watcher, submit
 
 # Fungsi untuk memuat data JSON
 def load_json(file_name):
     file_path = os.path.join("data", file_name)
     if os.path.exists(file_path):
-        with open(file_path, "r") as file:
-            return json.load(file)
+        return read_project(file_path)
     return None
 
+# Fungsi untuk memuat hanya bagian yang ditampilkan (hasil AHP dan perangkingan) lewat database
+def load_view_data(file_name):
+    # Hasil perangkingan dengan sidecar kolom dibuka lewat memory mapping, bukan dari database
+    table = open_columnar(sidecar_dir(os.path.join("data", file_name)))
+    parts = ("ahp_results",) if table is not None else ("ahp_results", "pm_results")
+    try:
+        data = load_parts(file_name, parts=parts)
+    except sqlite3.Error:
+        # Database tidak bisa dipakai, baca langsung dari file JSON
+        data = load_json(file_name)
+    if data is not None and table is not None:
+        data["pm_results"] = table
+    return data
+
 # Fungsi untuk menghapus file JSON
 def delete_json(file_name):
     file_path = os.path.join("data", file_name)
     if os.path.exists(file_path):
         os.remove(file_path)
+        remove_columnar(file_path)
+        remove_journal(file_path)
+        invalidate()
+        try:
+            delete_project(file_name)
+        except sqlite3.Error:
+            pass
         return True
     return False
 
-# Inisialisasi session state untuk modal konfirmasi dan reload
-if "confirm_delete" not in st.session_state:
-    st.session_state.confirm_delete = False
-
-if "file_to_delete" not in st.session_state:
-    st.session_state.file_to_delete = None
-
-if "reload" not in st.session_state:
-    st.session_state.reload = False
-
-# Jika reload flag aktif, reload halaman menggunakan JavaScript
-if st.session_state.reload:
-    st.session_state.reload = False  # Reset state agar tidak reload terus-menerus
-    st.markdown("<script>window.location.reload()</script>", unsafe_allow_html=True)
-
-# Mendapatkan daftar file JSON di folder 'data'
-existing_files = [f for f in os.listdir("data") if f.endswith(".json")]
-
-if existing_files:
-    # Dropdown untuk memilih file
-    selected_file_index = st.selectbox(
-        "Pilih file data:", 
-        range(len(existing_files)),
-        format_func=lambda x: existing_files[x],  # Tampilkan nama file di dropdown
-        key="selected_file_index"
+# Halaman View Data: lihat, ekspor, bandingkan dan hapus proyek tersimpan
+def render():
+    # Atur lebar kolom agar lebih optimal
+    st.markdown(
+        """
+        <style>
+        .streamlit-expanderHeader {
+            font-size: 18px;
+            font-weight: bold;
+        }
+        .dataframe-container {
+            width: 100% !important;
+            height: 100% !important;
+        }
+        </style>
+        """, unsafe_allow_html=True
     )
 
-    selected_file = existing_files[selected_file_index]  # Ambil nama file berdasarkan indeks
-
-    # Tombol untuk memuat data
-    if st.button("Muat Data"):
-        data = load_json(selected_file)
-
-        if data:
-            # Menampilkan hasil perhitungan AHP
-            if "ahp_results" in data and data["ahp_results"]:
-                st.subheader("Hasil Perhitungan Bobot AHP")
-
-                # Tampilkan bobot utama
-                if "weights_main" in data["ahp_results"]:
-                    df_ahp = pd.DataFrame({
-                        "Kriteria": data["ahp_results"]["criteria_labels"],
-                        "Bobot": data["ahp_results"]["weights_main"]
-                    })
-                    st.dataframe(df_ahp)
-
-                # Tampilkan bobot sub-kriteria
-                if "sub_results" in data["ahp_results"]:
-                    for key, sub_data in data["ahp_results"]["sub_results"].items():
-                        st.subheader(f"Hasil Bobot Sub-Kriteria: {key}")
-                        df_sub = pd.DataFrame(sub_data["df_sub"])
-                        st.dataframe(df_sub)
-
-            # Tampilkan dataframe
-            if "pm_results" in data and data["pm_results"]:
-                st.subheader("Hasil Perangkingan Profile Matching")
-                df_pm = pd.DataFrame(data["pm_results"])
-                st.table(df_pm)
-
-    # Tombol untuk membuka konfirmasi hapus
-    if st.button("Hapus Data Ini"):
-        st.session_state.confirm_delete = True
-        st.session_state.file_to_delete = selected_file
-
-    # Jika tombol hapus diklik, tampilkan konfirmasi
-    if st.session_state.confirm_delete and st.session_state.file_to_delete:
-        st.warning(f"Apakah Anda yakin ingin menghapus file '{st.session_state.file_to_delete}'?")
-
-        col1, col2 = st.columns(2)
-
-        message_placeholder = st.empty()
-
-        def confirm_delete():
-            success = delete_json(st.session_state.file_to_delete)
-            if success:
-                 # Tampilkan sukses dan hilangkan setelah 1 detik
-                message_placeholder.success(f"Data berhasil dihapus")
-                time.sleep(1)  # Menunggu selama 1 detik
-                message_placeholder.empty()  # Menghapus pesan
-                
-                st.session_state.confirm_delete = False
-                st.session_state.file_to_delete = None
+    # Status hapus yang berjalan di latar
+    job_watcher()
+
+    # Inisialisasi session state untuk modal konfirmasi dan reload
+    if "confirm_delete" not in st.session_state:
+        st.session_state.confirm_delete = False
+
+    if "file_to_delete" not in st.session_state:
+        st.session_state.file_to_delete = None
+
+    if "reload" not in st.session_state:
+        st.session_state.reload = False
+
+    # Jika reload flag aktif, reload halaman menggunakan JavaScript
+    if st.session_state.reload:
+        st.session_state.reload = False  # Reset state agar tidak reload terus-menerus
+        st.markdown("<script>window.location.reload()</script>", unsafe_allow_html=True)
+
+    # Mendapatkan daftar file JSON di folder 'data' beserta ringkasannya dari indeks proyek
+    project_summaries = project_index()
+    existing_files = list(project_summaries)
+
+    if existing_files:
+        # Dropdown untuk memilih file
+        selected_file_index = st.selectbox(
+            "Pilih file data:",
+            range(len(existing_files)),
+            format_func=lambda x: describe(project_summaries[existing_files[x]]),  # Tampilkan ringkasan file di dropdown
+            key="selected_file_index"
+        )
+
+        selected_file = existing_files[selected_file_index]  # Ambil nama file berdasarkan indeks
+
+        # Tombol untuk memuat data; data yang dimuat disimpan di sesi agar tabel hasil bisa dibuka per halaman
+        if st.button("Muat Data"):
+            st.session_state.view_data = (selected_file, load_view_data(selected_file))
+
+        view_file, data = st.session_state.get("view_data") or (None, None)
+        if view_file == selected_file:
+            if data:
+                # Menampilkan hasil perhitungan AHP
+                if "ahp_results" in data and data["ahp_results"]:
+                    st.subheader("Hasil Perhitungan Bobot AHP")
+
+                    # Tampilkan bobot utama
+                    if "weights_main" in data["ahp_results"]:
+                        df_ahp = pd.DataFrame({
+                            "Kriteria": data["ahp_results"]["criteria_labels"],
+                            "Bobot": data["ahp_results"]["weights_main"]
+                        })
+                        st.dataframe(df_ahp)
+
+                    # Tampilkan bobot sub-kriteria
+                    if "sub_results" in data["ahp_results"]:
+                        for key, sub_data in data["ahp_results"]["sub_results"].items():
+                            st.subheader(f"Hasil Bobot Sub-Kriteria: {key}")
+                            df_sub = pd.DataFrame(sub_data["df_sub"])
+                            st.dataframe(df_sub)
+
+                # Tampilkan dataframe
+                if "pm_results" in data and data["pm_results"]:
+                    st.subheader("Hasil Perangkingan Profile Matching")
+                    result_table(data["pm_results"], VIEW_DATA_RESULT_KEY)
+
+        # Ekspor hasil perangkingan file terpilih; sidecar kolom dibaca per potongan langsung dari disk
+        with st.expander("Ekspor Hasil Perangkingan"):
+            export_name = st.text_input(
+                "Nama File Ekspor (.csv atau .parquet)",
+                value=f"{os.path.splitext(selected_file)[0]}_perangkingan.csv",
+                key="export_file_name"
+            )
+            export_path = session_export_path(st.session_state.setdefault(EXPORT_SESSION_KEY, uuid.uuid4().hex), export_name)
+            export_jobs = st.session_state.setdefault(EXPORT_JOBS_KEY, {})
+            status = export_status(export_jobs.get(export_path))
+            if st.button("Ekspor") and not (status and status["state"] == "running"):
+                data = load_view_data(selected_file)
+                if data and data.get("pm_results"):
+                    export_jobs[export_path] = start_export(data["pm_results"], export_path)
+                    status = export_status(export_jobs[export_path])
+                else:
+                    st.warning("File ini belum memiliki hasil perangkingan.")
+            if status and status["state"] == "running":
+                st.caption(f"Mengekspor {status['rows']} dari {status['total']} baris...")
+                st.button("Perbarui Status Ekspor")
+            elif status and status["state"] == "failed":
+                st.error(f"Gagal mengekspor: {status['error']}")
+            elif status and os.path.exists(export_path):
+                st.success(f"{status['rows']} baris diekspor ke '{os.path.basename(export_path)}'")
+                with open(export_path, "rb") as file:
+                    st.download_button("Unduh Hasil Ekspor", file, file_name=os.path.basename(export_path))
+
+        # Tombol untuk membuka konfirmasi hapus
+        if st.button("Hapus Data Ini"):
+            st.session_state.confirm_delete = True
+            st.session_state.file_to_delete = selected_file
+
+        # Jika tombol hapus diklik, tampilkan konfirmasi
+        if st.session_state.confirm_delete and st.session_state.file_to_delete:
+            st.warning(f"Apakah Anda yakin ingin menghapus file '{st.session_state.file_to_delete}'?")
+
+            col1, col2 = st.columns(2)
+            file_name = st.session_state.file_to_delete
+
+            def deleted(success):
+                if not success:
+                    return f"File '{file_name}' tidak ditemukan."
+                st.session_state.view_data = None
                 st.session_state.reload = True  # Set flag untuk reload halaman
 
-        def cancel_delete():
-            st.session_state.confirm_delete = False
-            st.session_state.file_to_delete = None
-
-        with col1:
-            st.button("Ya, Hapus", on_click=confirm_delete)
-
-        with col2:
-            st.button("Batal", on_click=cancel_delete)
+            def confirm_delete():
+                # Hapus file (beserta sidecar, jurnal dan salinan database) di worker latar
+                submit(
+                    delete_json, file_name,
+                    path=os.path.join("data", file_name),
+                    label=f"Menghapus '{file_name}'",
+                    message="Data berhasil dihapus",
+                    error="Gagal menghapus data",
+                    on_done=deleted,
+                )
+                st.session_state.confirm_delete = False
+                st.session_state.file_to_delete = None
 
+            def cancel_delete():
+                st.session_state.confirm_delete = False
+                st.session_state.file_to_delete = None
 
-    #   # Tombol untuk pergi ke halaman load.py (menggunakan runpy)
-    # if st.button("Gunakan Data", key="use_data_button"):
-    #     # Mengarahkan ke halaman load.py
-    #     runpy.run_path("load.py")
-else:
-    st.warning("Tidak ada file data yang tersedia.")
+            with col1:
+                st.button("Ya, Hapus", on_click=confirm_delete)
+
+            with col2:
+                st.button("Batal", on_click=cancel_delete)
+
+
+        # Bandingkan beberapa skenario (file proyek) terhadap satu skenario acuan
+        with st.expander("Bandingkan Skenario"):
+            compare_files = st.multiselect(
+                "Pilih file skenario:",
+                existing_files,
+                format_func=lambda name: describe(project_summaries[name]),
+                key="compare_files"
+            )
+            if len(compare_files) >= 2:
+                baseline = st.selectbox("Skenario acuan:", compare_files, key="compare_baseline")
+                if st.button("Bandingkan"):
+                    try:
+                        # File diurai paralel; file yang tidak berubah sejak perbandingan sebelumnya diambil dari cache
+                        scenarios = load_scenarios(compare_files)
+                        comparison = compare_scenarios(scenarios, baseline=compare_files.index(baseline))
+                    except (OSError, ValueError, KeyError, TypeError) as e:
+                        st.error(f"Gagal membandingkan skenario: {e}")
+                    else:
+                        # Urutkan alternatif menurut peringkat pada skenario acuan
+                        order = comparison["ranking"][baseline].sort_values(na_position="last").index
+                        st.subheader("Ringkasan Skenario")
+                        st.dataframe(comparison["summary"].round(3))
+                        st.subheader("Peringkat per Skenario")
+                        st.dataframe(comparison["ranking"].loc[order])
+                        st.subheader("Pergeseran Peringkat terhadap Acuan (positif = turun)")
+                        st.dataframe(comparison["rank_shift"].loc[order])
+                        st.subheader("Selisih Final Score terhadap Acuan")
+                        st.dataframe(comparison["score_delta"].loc[order].round(3))
+                        st.subheader("Selisih Bobot Kriteria terhadap Acuan")
+                        st.dataframe(comparison["criteria_weight_delta"].round(4))
+                        st.subheader("Selisih Bobot Global Sub-Kriteria terhadap Acuan")
+                        st.dataframe(comparison["sub_weight_delta"].round(4))
+            else:
+                st.caption("Pilih minimal dua file untuk dibandingkan.")
+    else:
+        st.warning("Tidak ada file data yang tersedia.")
+
+
+if __name__ == "__main__":
+    render()
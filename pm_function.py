@@ -1,41 +1,136 @@
+import heapq
+from dataclasses import dataclass, field, replace
+
 import numpy as np
+import pandas as pd
 
-# Fungsi untuk menghitung GAP
-def calculate_gap(candidate_value, ideal_value):
-    """Menghitung GAP antara nilai kandidat dan nilai ideal."""
-    
+# Tabel bobot GAP berdasarkan aturan Profile Matching (default 1 jika GAP lebih dari ±4)
+GAP_WEIGHTS = {
+    0: 5,
+    1: 4.5,
+    -1: 4,
+    2: 3.5,
+    -2: 3,
+    3: 2.5,
+    -3: 2,
+    4: 1.5,
+    -4: 1
+}
+
+# Aturan penilaian satu sub-kriteria yang sudah divalidasi
+@dataclass(frozen=True)
+class ColumnRule:
+    kind: str                             # "exact", "range" atau "categorical"
+    ideal: float = None                   # nilai ideal tunggal (exact)
+    low: float = None                     # batas bawah rentang ideal (range)
+    high: float = None                    # batas atas rentang ideal (range)
+    categories: frozenset = frozenset()   # kategori ideal tanpa spasi (categorical)
+
+# Rencana penilaian hasil kompilasi ideal value, kelompok kriteria dan bobot
+@dataclass(frozen=True)
+class ScoringPlan:
+    """Konfigurasi Profile Matching yang sudah divalidasi dan tidak dapat diubah.
+
+    `keys` dan `rules` berisi aturan per sub-kriteria (urutan ideal_values),
+    `groups` berisi (kriteria, sub-kriteria, bobot sub-kriteria, bobot kriteria)
+    per kriteria utama. Satu rencana dapat dipakai ulang untuk banyak perhitungan.
+    """
+    keys: tuple
+    rules: tuple
+    groups: tuple
+    _index: dict = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "_index", {key: j for j, key in enumerate(self.keys)})
+
+    @property
+    def criteria(self):
+        return tuple(criteria for criteria, _, _, _ in self.groups)
+
+    def rule(self, key):
+        return self.rules[self._index[key]]
+
+    def with_ideal(self, key, ideal_value):
+        """Rencana baru dengan ideal value `key` diganti (divalidasi ulang)."""
+        rules = list(self.rules)
+        rules[self._index[key]] = compile_rule(ideal_value, key)
+        return replace(self, rules=tuple(rules))
+
+# Kompilasi satu ideal value menjadi aturan penilaian
+def compile_rule(ideal_value, key=None):
+    """Menentukan jenis penilaian dari ideal value: rentang numerik, kategori atau angka tunggal."""
     # Jika ideal_value berupa range numerik (min, max), pastikan isinya angka
     if (
-        isinstance(ideal_value, (list, tuple)) and 
-        len(ideal_value) == 2 and 
+        isinstance(ideal_value, (list, tuple)) and
+        len(ideal_value) == 2 and
         all(isinstance(v, (int, float)) for v in ideal_value)
     ):
         min_val, max_val = ideal_value
-        return interpolasi(candidate_value, min_val, max_val)
-
-    # Jika ideal_value berupa string (kategorikal)
-    elif isinstance(candidate_value, str):
-        if isinstance(ideal_value, str):  
-            # Jika ideal_value hanya satu teks, ubah menjadi list
-            ideal_value = [ideal_value.strip()]  
-        elif isinstance(ideal_value, list):  
-            # Bersihkan elemen ideal_value untuk memastikan tidak ada whitespace berlebih
-            ideal_value = [val.strip() for val in ideal_value]  
-
-        # Pastikan ideal_value benar-benar daftar string sebelum membandingkan
-        if all(isinstance(v, str) for v in ideal_value):
-            return 5 if candidate_value.strip() in ideal_value else 1
-        else:
-            raise TypeError(f"Ideal value untuk '{candidate_value}' harus berupa string atau daftar string.")
+        return ColumnRule("range", low=min_val, high=max_val)
+
+    # Jika ideal_value berupa string atau daftar string (kategorikal), spasi dibersihkan sekali di sini
+    if isinstance(ideal_value, str):
+        return ColumnRule("categorical", categories=frozenset([ideal_value.strip()]))
+    if isinstance(ideal_value, (list, tuple)):
+        if not all(isinstance(v, str) for v in ideal_value):
+            raise TypeError(f"Error in processing key '{key}': Ideal value harus berupa string atau daftar string.")
+        return ColumnRule("categorical", categories=frozenset(v.strip() for v in ideal_value))
 
     # Jika ideal_value berupa angka tunggal
-    elif isinstance(candidate_value, (int, float)) and isinstance(ideal_value, (int, float)):
-        gap = candidate_value - ideal_value
-        return gap_weight(gap)
+    if isinstance(ideal_value, (int, float)):
+        return ColumnRule("exact", ideal=ideal_value)
 
-    else:
-        # Jika tipe data tidak cocok
-        raise TypeError(f"Data ideal dan kandidat tidak cocok: {candidate_value} ({type(candidate_value)}) vs {ideal_value} ({type(ideal_value)})")
+    raise TypeError(f"Error in processing key '{key}': Tipe ideal value tidak didukung: {type(ideal_value)}")
+
+# Pastikan bobot berupa angka
+def _check_weight(weight, name):
+    if isinstance(weight, (bool, np.bool_)) or not isinstance(weight, (int, float, np.number)):
+        raise TypeError(f"Bobot '{name}' harus berupa angka, tetapi mendapatkan: {type(weight)}")
+    return weight
+
+# Fungsi untuk mengompilasi konfigurasi Profile Matching sekali sebelum penilaian
+def compile_plan(ideal_values, criteria_groups, sub_criteria_weights, criteria_weights):
+    """Validasi dan kompilasi konfigurasi menjadi ScoringPlan.
+
+    Kesalahan konfigurasi (ideal value tidak valid, bobot atau ideal value yang
+    hilang) langsung muncul di sini, bukan di tengah perulangan per alternatif.
+    """
+    keys = tuple(ideal_values)
+    rules = tuple(compile_rule(ideal_values[key], key) for key in keys)
+
+    groups = []
+    for criteria, sub_criteria in criteria_groups.items():
+        if criteria not in criteria_weights:
+            raise ValueError(f"Bobot kriteria '{criteria}' tidak ditemukan.")
+        for sub in sub_criteria:
+            if sub not in ideal_values:
+                raise ValueError(f"Ideal value untuk sub-kriteria '{sub}' tidak ditemukan.")
+            if sub not in sub_criteria_weights:
+                raise ValueError(f"Bobot sub-kriteria '{sub}' tidak ditemukan.")
+        groups.append((
+            criteria,
+            tuple(sub_criteria),
+            tuple(_check_weight(sub_criteria_weights[sub], sub) for sub in sub_criteria),
+            _check_weight(criteria_weights[criteria], criteria),
+        ))
+    return ScoringPlan(keys, rules, tuple(groups))
+
+# Bobot GAP satu nilai kandidat menurut aturan yang sudah dikompilasi
+def rule_weight(rule, candidate_value):
+    if rule.kind == "range":
+        return interpolasi(candidate_value, rule.low, rule.high)
+    if rule.kind == "categorical":
+        if not isinstance(candidate_value, str):
+            raise TypeError(f"Data ideal dan kandidat tidak cocok: {candidate_value} ({type(candidate_value)}) vs kategori {sorted(rule.categories)}")
+        return 5 if candidate_value.strip() in rule.categories else 1
+    if not isinstance(candidate_value, (int, float)):
+        raise TypeError(f"Data ideal dan kandidat tidak cocok: {candidate_value} ({type(candidate_value)}) vs {rule.ideal} ({type(rule.ideal)})")
+    return gap_weight(candidate_value - rule.ideal)
+
+# Fungsi untuk menghitung GAP
+def calculate_gap(candidate_value, ideal_value):
+    """Menghitung GAP antara nilai kandidat dan nilai ideal."""
+    return rule_weight(compile_rule(ideal_value), candidate_value)
 
 # Fungsi interpolasi untuk range numerik
 def interpolasi(x, min_val, max_val):
@@ -55,58 +150,62 @@ def interpolasi(x, min_val, max_val):
 # Fungsi untuk menentukan bobot GAP berdasarkan aturan Profile Matching
 def gap_weight(gap):
     """Menghitung bobot GAP berdasarkan aturan gap profile matching."""
-    gap_weights = {
-        0: 5,
-        1: 4.5,
-        -1: 4,
-        2: 3.5,
-        -2: 3,
-        3: 2.5,
-        -3: 2,
-        4: 1.5,
-        -4: 1
-    }
-    return gap_weights.get(gap, 1)  # Default bobot adalah 1 jika GAP lebih dari ±4
+    return GAP_WEIGHTS.get(gap, 1)  # Default bobot adalah 1 jika GAP lebih dari ±4
 
 # Fungsi utama Profile Matching
-def profile_matching_with_ranges(alternatives, ideal_values, criteria_groups, sub_criteria_weights, criteria_weights):
+def profile_matching_with_ranges(alternatives, ideal_values, criteria_groups, sub_criteria_weights, criteria_weights, top_k=None):
+    """Jika `top_k` diisi, hanya k alternatif terbaik yang dikembalikan bersama ringkasan sisanya."""
+    plan = compile_plan(ideal_values, criteria_groups, sub_criteria_weights, criteria_weights)
+    return profile_matching_with_plan(alternatives, plan, top_k=top_k)
+
+# Profile Matching per baris dengan rencana penilaian yang sudah dikompilasi
+def profile_matching_with_plan(alternatives, plan, top_k=None):
+    """Sama seperti profile_matching_with_ranges, tetapi memakai ScoringPlan yang sudah dikompilasi."""
     results = []
+    scores = []
 
     for name, candidate in alternatives.items():
         weights = {}
         for key in candidate:
             try:
-                # Periksa apakah ideal_value berupa rentang numerik
-                if isinstance(ideal_values[key], (list, tuple)) and len(ideal_values[key]) == 2:
-                    # Pastikan semua elemen dalam ideal_value adalah angka sebelum menggunakannya sebagai range
-                    if all(isinstance(v, (int, float)) for v in ideal_values[key]):
-                        min_val, max_val = ideal_values[key]
-                        weights[key] = interpolasi(candidate[key], min_val, max_val)
-                    else:
-                        weights[key] = calculate_gap(candidate[key], ideal_values[key])
-
-                # Jika ideal_value berupa string atau list string
-                else:
-                    weights[key] = calculate_gap(candidate[key], ideal_values[key])
-
+                weights[key] = rule_weight(plan.rule(key), candidate[key])
             except Exception as e:
                 raise TypeError(f"Error in processing key '{key}': {e}")
 
         # Hitung nilai kriteria utama berdasarkan sub-kriteria
         criteria_scores = {}
-        for criteria, sub_criteria in criteria_groups.items():
-            nk = sum(weights[sub] * sub_criteria_weights[sub] for sub in sub_criteria)
+        for criteria, sub_criteria, sub_weights, _ in plan.groups:
+            nk = sum(weights[sub] * weight for sub, weight in zip(sub_criteria, sub_weights))
             criteria_scores[criteria] = nk
 
         # Hitung Final Score
-        final_score = sum(criteria_scores[criteria] * criteria_weights[criteria] for criteria in criteria_scores)
+        final_score = sum(criteria_scores[criteria] * criteria_weight for criteria, _, _, criteria_weight in plan.groups)
 
-        results.append({
+        result = {
             "Alternatif": name,
             **weights,  # Tambahkan bobot GAP untuk tiap sub-kriteria
             **criteria_scores,  # Tambahkan nilai kriteria utama
             "Final Score": final_score,
-        })
+        }
+
+        if top_k is None:
+            results.append(result)
+        else:
+            # Simpan hanya k hasil terbaik dalam min-heap; seri diputus oleh urutan input
+            entry = (final_score, -len(scores), result)
+            if len(results) < top_k:
+                heapq.heappush(results, entry)
+            elif top_k > 0 and entry[:2] > results[0][:2]:
+                heapq.heapreplace(results, entry)
+            scores.append(final_score)
+
+    if top_k is not None:
+        top = sorted(results, key=lambda entry: entry[:2], reverse=True)
+        results = [result for _, _, result in top]
+        for i, result in enumerate(results, start=1):
+            result["Ranking"] = i
+        summary = score_summary(np.array(scores, dtype=float), np.array([-i for _, i, _ in top], dtype=np.intp))
+        return results, summary
 
     # Urutkan hasil berdasarkan Final Score (tertinggi ke terendah)
     results = sorted(results, key=lambda x: x["Final Score"], reverse=True)
@@ -114,3 +213,216 @@ def profile_matching_with_ranges(alternatives, ideal_values, criteria_groups, su
         result["Ranking"] = i
 
     return results
+
+# Pilih indeks k skor tertinggi tanpa mengurutkan seluruh data
+def top_k_indices(scores, k):
+    """Indeks k skor tertinggi (O(N) partisi + O(k log k) urut).
+
+    Skor yang sama diurutkan berdasarkan indeks input, sehingga hasilnya sama
+    dengan k baris pertama dari pengurutan stabil penuh.
+    """
+    scores = np.asarray(scores, dtype=float)
+    k = max(0, min(int(k), len(scores)))
+    if k == 0:
+        return np.empty(0, dtype=np.intp)
+    if k < len(scores):
+        kth_score = np.partition(scores, len(scores) - k)[len(scores) - k]
+        candidates = np.flatnonzero(scores >= kth_score)
+    else:
+        candidates = np.arange(len(scores))
+    order = np.lexsort((candidates, -scores[candidates]))
+    return candidates[order][:k]
+
+# Ringkasan statistik untuk alternatif di luar top-k
+def score_summary(scores, selected):
+    """Statistik seluruh skor dan skor yang tidak termasuk `selected`."""
+    scores = np.asarray(scores, dtype=float)
+    rest_mask = np.ones(len(scores), dtype=bool)
+    rest_mask[selected] = False
+    rest = scores[rest_mask]
+    return {
+        "total": int(len(scores)),
+        "top_k": int(len(selected)),
+        "cutoff_score": float(scores[selected[-1]]) if len(selected) else None,
+        "rest_count": int(len(rest)),
+        "rest_mean": float(rest.mean()) if len(rest) else None,
+        "rest_std": float(rest.std()) if len(rest) else None,
+        "rest_min": float(rest.min()) if len(rest) else None,
+        "rest_max": float(rest.max()) if len(rest) else None,
+    }
+
+# ----------------- Versi kolumnar (vektor) -----------------
+
+# Tabel bobot GAP untuk GAP -4..4 (indeks = GAP + 4), sama dengan aturan gap_weight
+GAP_WEIGHT_TABLE = np.array([GAP_WEIGHTS[gap] for gap in range(-4, 5)], dtype=float)
+
+# Fungsi bobot GAP untuk array
+def gap_weight_array(gap):
+    """Versi vektor dari gap_weight: GAP bulat -4..4 dipetakan ke tabel, selain itu 1."""
+    gap = np.asarray(gap, dtype=float)
+    valid = (gap == np.round(gap)) & (np.abs(gap) <= 4)
+    index = np.where(valid, gap + 4, 0).astype(np.intp)
+    return np.where(valid, GAP_WEIGHT_TABLE[index], 1.0)
+
+# Fungsi interpolasi untuk array
+def interpolasi_array(x, min_val, max_val):
+    """Versi vektor dari interpolasi terhadap rentang ideal (min_val, max_val)."""
+    x = np.asarray(x, dtype=float)
+    in_range = (min_val <= x) & (x <= max_val)
+    below = (0 <= x) & (x < min_val)
+    above = (max_val < x) & (x <= (min_val + max_val))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.select(
+            [in_range, below, above],
+            [
+                5.0,
+                1 + ((x - 0) / (min_val - 0)) * (5 - 1),
+                5 + ((x - max_val) / ((min_val + max_val) - max_val)) * (1 - 5),
+            ],
+            default=1.0,
+        )
+
+# Ubah input alternatif menjadi DataFrame (baris = alternatif, kolom = sub-kriteria)
+def _alternatives_frame(alternatives, columns=None, names=None):
+    if isinstance(alternatives, pd.DataFrame):
+        frame = alternatives
+    elif isinstance(alternatives, dict):
+        frame = pd.DataFrame.from_dict(alternatives, orient="index")
+    else:
+        values = np.asarray(alternatives)
+        if values.ndim != 2:
+            raise ValueError(f"Alternatif harus berupa array 2 dimensi, tetapi mendapatkan {values.ndim} dimensi.")
+        if columns is None:
+            raise ValueError("Parameter 'columns' wajib diisi jika alternatif berupa array.")
+        frame = pd.DataFrame(values, columns=list(columns))
+
+    if columns is not None and isinstance(alternatives, (pd.DataFrame, dict)):
+        frame = frame[list(columns)]
+    if names is not None:
+        frame = frame.set_axis(list(names), axis=0)
+    return frame
+
+# Ambil kolom sebagai array numerik
+def _numeric_column(key, column):
+    if not pd.api.types.is_numeric_dtype(column) or pd.api.types.is_bool_dtype(column):
+        try:
+            return pd.to_numeric(column, errors="raise").to_numpy(dtype=float)
+        except (TypeError, ValueError) as e:
+            raise TypeError(f"Error in processing key '{key}': Data numerik diperlukan: {e}")
+    return column.to_numpy(dtype=float)
+
+# Ubah satu kolom menjadi nilai numerik beserta spesifikasi penilaiannya
+def _encode_column(key, column, rule):
+    """Mengembalikan (nilai float, spesifikasi) untuk satu kolom sub-kriteria.
+
+    Kolom kategorikal dikodekan menjadi indeks kategori (float) dengan tabel
+    kecocokan dan daftar kategori, sehingga seluruh kolom bisa dinilai sebagai angka.
+    """
+    if rule.kind == "range":
+        return _numeric_column(key, column), ("range", rule.low, rule.high)
+
+    if rule.kind == "categorical":
+        if pd.api.types.infer_dtype(column, skipna=False) not in ("string", "empty"):
+            raise TypeError(f"Error in processing key '{key}': Nilai kandidat kategorikal harus berupa string.")
+        # Spasi dibersihkan pada daftar kategori unik saja, bukan pada setiap baris
+        codes, categories = pd.factorize(column.astype(str))
+        matches = np.asarray(pd.Index(categories).str.strip().isin(rule.categories), dtype=bool)
+        return codes.astype(float), ("categorical", matches, np.asarray(categories, dtype=object))
+
+    return _numeric_column(key, column), ("exact", rule.ideal)
+
+# Hitung bobot GAP satu kolom yang sudah dikodekan
+def column_gap_weights(values, spec):
+    kind = spec[0]
+    if kind == "range":
+        return interpolasi_array(values, spec[1], spec[2])
+    if kind == "exact":
+        return gap_weight_array(values - spec[1])
+    return np.where(spec[1][values.astype(np.intp)], 5.0, 1.0)
+
+# Kodekan seluruh alternatif menjadi satu matriks float
+def encode_alternatives(frame, plan, out=None):
+    """Mengembalikan (matriks nilai [N, m], daftar spesifikasi per kolom).
+
+    Jika `out` diberikan (misalnya array di shared memory), nilai ditulis ke sana.
+    """
+    values = np.empty((len(frame), len(frame.columns)), dtype=float) if out is None else out
+    specs = []
+    for j, key in enumerate(frame.columns):
+        if key not in plan.keys:
+            raise TypeError(f"Error in processing key '{key}': ideal value tidak ditemukan")
+        values[:, j], spec = _encode_column(key, frame[key], plan.rule(key))
+        specs.append(spec)
+    return values, specs
+
+# Susun indeks kolom dan bobot per kriteria utama
+def aggregation_groups(keys, plan):
+    """Mengembalikan daftar (indeks kolom, bobot sub-kriteria, bobot kriteria) per kriteria."""
+    column_index = {key: j for j, key in enumerate(keys)}
+    return [
+        ([column_index[sub] for sub in sub_criteria], list(sub_weights), criteria_weight)
+        for _, sub_criteria, sub_weights, criteria_weight in plan.groups
+    ]
+
+# Hitung bobot GAP, nilai kriteria dan Final Score dari matriks yang sudah dikodekan
+def score_encoded(values, specs, groups):
+    gap_matrix = np.empty(values.shape, dtype=float)
+    for j, spec in enumerate(specs):
+        gap_matrix[:, j] = column_gap_weights(values[:, j], spec)
+
+    # Penjumlahan dilakukan berurutan per kolom agar hasilnya identik dengan versi per baris
+    criteria_scores = np.zeros((len(values), len(groups)), dtype=float)
+    final_score = np.zeros(len(values), dtype=float)
+    for c, (columns, sub_weights, criteria_weight) in enumerate(groups):
+        nk = np.zeros(len(values), dtype=float)
+        for j, weight in zip(columns, sub_weights):
+            nk = nk + gap_matrix[:, j] * weight
+        criteria_scores[:, c] = nk
+        final_score = final_score + nk * criteria_weight
+
+    return gap_matrix, criteria_scores, final_score
+
+# Hitung matriks bobot GAP, nilai kriteria dan Final Score dalam bentuk array
+def score_arrays(frame, plan):
+    """Mengembalikan (bobot GAP [N, m], nilai kriteria [N, k], Final Score [N])."""
+    values, specs = encode_alternatives(frame, plan)
+    return score_encoded(values, specs, aggregation_groups(list(frame.columns), plan))
+
+# Susun DataFrame hasil dalam urutan `order`
+def results_frame(names, columns, criteria_names, gap_matrix, criteria_scores, final_score, order):
+    results = pd.DataFrame(gap_matrix[order], columns=list(columns))
+    results.insert(0, "Alternatif", np.asarray(names)[order])
+    for c, criteria in enumerate(criteria_names):
+        results[criteria] = criteria_scores[order, c]
+    results["Final Score"] = final_score[order]
+    results["Ranking"] = np.arange(1, len(results) + 1)
+    return results
+
+# Fungsi utama Profile Matching versi kolumnar
+def profile_matching_vectorized(alternatives, ideal_values, criteria_groups, sub_criteria_weights, criteria_weights, columns=None, names=None, top_k=None):
+    """Profile Matching untuk banyak alternatif sekaligus dengan operasi array.
+
+    `alternatives` dapat berupa DataFrame (index = nama alternatif), dict seperti
+    pada profile_matching_with_ranges, atau array 2D beserta `columns` dan `names`.
+    Hasilnya berupa DataFrame terurut dengan kolom yang sama seperti versi per baris.
+    Jika `top_k` diisi, dikembalikan (DataFrame k teratas, ringkasan sisanya).
+    """
+    plan = compile_plan(ideal_values, criteria_groups, sub_criteria_weights, criteria_weights)
+    return profile_matching_vectorized_plan(alternatives, plan, columns=columns, names=names, top_k=top_k)
+
+# Profile Matching kolumnar dengan rencana penilaian yang sudah dikompilasi
+def profile_matching_vectorized_plan(alternatives, plan, columns=None, names=None, top_k=None):
+    """Sama seperti profile_matching_vectorized, tetapi memakai ScoringPlan yang sudah dikompilasi."""
+    frame = _alternatives_frame(alternatives, columns, names)
+    gap_matrix, criteria_scores, final_score = score_arrays(frame, plan)
+
+    # Urutkan hasil berdasarkan Final Score (stabil, sama seperti sorted(..., reverse=True))
+    if top_k is None:
+        order = np.argsort(-final_score, kind="stable")
+    else:
+        order = top_k_indices(final_score, top_k)
+
+    results = results_frame(frame.index, frame.columns, plan.criteria, gap_matrix, criteria_scores, final_score, order)
+    if top_k is not None:
+        return results, score_summary(final_score, order)
+    return results
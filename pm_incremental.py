@@ -0,0 +1,316 @@
+from bisect import bisect_left, insort
+
+import numpy as np
+import pandas as pd
+
+from pm_function import (
+    _alternatives_frame,
+    _encode_column,
+    aggregation_groups,
+    column_gap_weights,
+    compile_plan,
+    encode_alternatives,
+    results_frame,
+    score_encoded,
+    score_summary,
+)
+
+# Jumlah kunci per blok pada daftar terurut berblok
+BLOCK_LOAD = 512
+
+# Jika lebih dari bagian ini skor berubah (perubahan ideal value), urutan dibangun ulang
+REBUILD_FRACTION = 0.125
+
+# Daftar kunci terurut berblok dengan indeks posisi (Fenwick) atas panjang blok
+class _RankedIndex:
+    """Daftar terurut kunci (-Final Score, indeks input).
+
+    Kunci disimpan dalam blok-blok kecil terurut; pencarian blok memakai bisect
+    atas kunci terbesar tiap blok, dan posisi global dihitung dari pohon Fenwick
+    atas panjang blok. Sisip, hapus dan cari peringkat berjalan dalam O(log N)
+    ditambah pergeseran di dalam satu blok (paling banyak 2 x BLOCK_LOAD).
+    """
+
+    def __init__(self, sorted_keys=()):
+        sorted_keys = list(sorted_keys)
+        self._blocks = [sorted_keys[i:i + BLOCK_LOAD] for i in range(0, len(sorted_keys), BLOCK_LOAD)]
+        self._rebuild()
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        for block in self._blocks:
+            yield from block
+
+    # Bangun ulang kunci maksimum dan pohon Fenwick setelah blok dipecah atau dihapus
+    def _rebuild(self):
+        self._maxes = [block[-1] for block in self._blocks]
+        self._tree = [0] * (len(self._blocks) + 1)
+        for b, block in enumerate(self._blocks, start=1):
+            self._tree[b] += len(block)
+            parent = b + (b & -b)
+            if parent <= len(self._blocks):
+                self._tree[parent] += self._tree[b]
+        self._size = sum(len(block) for block in self._blocks)
+
+    def _tree_add(self, b, delta):
+        b += 1
+        while b < len(self._tree):
+            self._tree[b] += delta
+            b += b & -b
+
+    def _tree_prefix(self, b):
+        total = 0
+        while b > 0:
+            total += self._tree[b]
+            b -= b & -b
+        return total
+
+    def add(self, key):
+        if not self._blocks:
+            self._blocks = [[key]]
+            self._rebuild()
+            return
+        b = min(bisect_left(self._maxes, key), len(self._blocks) - 1)
+        block = self._blocks[b]
+        insort(block, key)
+        self._maxes[b] = block[-1]
+        if len(block) > 2 * BLOCK_LOAD:
+            self._blocks[b:b + 1] = [block[:BLOCK_LOAD], block[BLOCK_LOAD:]]
+            self._rebuild()
+        else:
+            self._tree_add(b, 1)
+            self._size += 1
+
+    def remove(self, key):
+        b = bisect_left(self._maxes, key)
+        block = self._blocks[b] if b < len(self._blocks) else []
+        i = bisect_left(block, key)
+        if i == len(block) or block[i] != key:
+            raise KeyError(key)
+        del block[i]
+        if not block:
+            del self._blocks[b]
+            self._rebuild()
+        else:
+            self._maxes[b] = block[-1]
+            self._tree_add(b, -1)
+            self._size -= 1
+
+    def index(self, key):
+        """Posisi 0-based dari `key`."""
+        b = bisect_left(self._maxes, key)
+        block = self._blocks[b] if b < len(self._blocks) else []
+        i = bisect_left(block, key)
+        if i == len(block) or block[i] != key:
+            raise KeyError(key)
+        return self._tree_prefix(b) + i
+
+    def head(self, k):
+        """k kunci pertama."""
+        keys = []
+        for block in self._blocks:
+            if len(keys) >= k:
+                break
+            keys.extend(block[:k - len(keys)])
+        return keys
+
+# Status penilaian Profile Matching yang diperbarui secara inkremental
+class ScoringState:
+    """Menyimpan bobot GAP, nilai kriteria dan Final Score beserta urutan rankingnya.
+
+    Perubahan satu nilai alternatif hanya menghitung ulang satu sel, baris
+    tersebut dan posisinya di ranking (O(log N)). Perubahan satu ideal value
+    menghitung ulang satu kolom dan hanya memindahkan alternatif yang skornya
+    berubah. Hasil dan urutan ranking identik dengan profile_matching_vectorized.
+    `plan` adalah ScoringPlan dari compile_plan.
+    """
+
+    def __init__(self, alternatives, plan, columns=None, names=None):
+        frame = _alternatives_frame(alternatives, columns, names)
+        self.plan = plan
+        self.names = list(frame.index)
+        self.columns = list(frame.columns)
+        self._row = {name: i for i, name in enumerate(self.names)}
+        self._column = {key: j for j, key in enumerate(self.columns)}
+        if len(self._row) != len(self.names):
+            raise ValueError("Nama alternatif harus unik.")
+
+        self._groups = aggregation_groups(self.columns, plan)
+        self._criteria_of = {}
+        for c, (group_columns, _, _) in enumerate(self._groups):
+            for j in group_columns:
+                self._criteria_of.setdefault(j, []).append(c)
+
+        self._values, self._specs = encode_alternatives(frame, plan)
+        self._category_codes = [self._category_index(spec) for spec in self._specs]
+        self.gap, self.criteria, self.final = score_encoded(self._values, self._specs, self._groups)
+        self._build_ranking()
+
+    def matches(self, names, columns, plan):
+        """True jika alternatif, sub-kriteria, kriteria dan bobotnya sama dengan status ini."""
+        return list(names) == self.names and list(columns) == self.columns and plan.groups == self.plan.groups
+
+    # Peta kategori -> kode untuk kolom kategorikal
+    @staticmethod
+    def _category_index(spec):
+        if spec[0] != "categorical":
+            return None
+        return {category: code for code, category in enumerate(spec[2])}
+
+    def _key(self, i):
+        return (-float(self.final[i]), i)
+
+    def _build_ranking(self):
+        order = np.argsort(-self.final, kind="stable")
+        self._ranked = _RankedIndex(zip((-self.final[order]).tolist(), order.tolist()))
+
+    # Kodekan satu nilai kandidat sesuai spesifikasi kolom
+    def _encode_cell(self, j, value):
+        key, spec = self.columns[j], self._specs[j]
+        if spec[0] != "categorical":
+            try:
+                return float(value)
+            except (TypeError, ValueError) as e:
+                raise TypeError(f"Error in processing key '{key}': Data numerik diperlukan: {e}")
+
+        if not isinstance(value, str):
+            raise TypeError(f"Error in processing key '{key}': Nilai kandidat kategorikal harus berupa string.")
+        codes = self._category_codes[j]
+        if value not in codes:
+            # Kategori baru: tambahkan ke tabel kecocokan kolom ini saja
+            codes[value] = len(codes)
+            self._specs[j] = (
+                "categorical",
+                np.append(spec[1], value.strip() in self.plan.rule(key).categories),
+                np.append(spec[2], np.array([value], dtype=object)),
+            )
+        return float(codes[value])
+
+    # Hitung ulang nilai kriteria dan Final Score satu baris dengan urutan penjumlahan yang sama
+    def _rescore_row(self, i, criteria):
+        gap = self.gap[i]
+        for c in criteria:
+            group_columns, sub_weights, _ = self._groups[c]
+            nk = 0.0
+            for j, weight in zip(group_columns, sub_weights):
+                nk = nk + gap[j] * weight
+            self.criteria[i, c] = nk
+        final = 0.0
+        for c, (_, _, criteria_weight) in enumerate(self._groups):
+            final = final + self.criteria[i, c] * criteria_weight
+        self.final[i] = final
+
+    # Nilai kandidat mentah satu kolom (untuk penilaian ulang saat ideal value berubah)
+    def _raw_column(self, j):
+        spec = self._specs[j]
+        if spec[0] == "categorical":
+            return pd.Series(spec[2][self._values[:, j].astype(np.intp)], dtype=object)
+        return pd.Series(self._values[:, j])
+
+    def value(self, name, key):
+        """Nilai kandidat yang tersimpan untuk alternatif `name` dan sub-kriteria `key`."""
+        i, j = self._row[name], self._column[key]
+        spec = self._specs[j]
+        if spec[0] == "categorical":
+            return spec[2][int(self._values[i, j])]
+        return float(self._values[i, j])
+
+    def set_value(self, name, key, value):
+        """Ubah satu nilai alternatif; mengembalikan peringkat baru (1-based)."""
+        i, j = self._row[name], self._column[key]
+        encoded = self._encode_cell(j, value)
+        gap = float(column_gap_weights(np.array([encoded]), self._specs[j])[0])
+        self._values[i, j] = encoded
+        if gap != self.gap[i, j]:
+            self._ranked.remove(self._key(i))
+            self.gap[i, j] = gap
+            self._rescore_row(i, self._criteria_of.get(j, []))
+            self._ranked.add(self._key(i))
+        return self.rank_of(name)
+
+    def set_ideal(self, key, ideal_value):
+        """Ubah ideal value satu sub-kriteria; mengembalikan jumlah alternatif yang skornya berubah."""
+        j = self._column[key]
+        plan = self.plan.with_ideal(key, ideal_value)
+        self._values[:, j], spec = _encode_column(key, self._raw_column(j), plan.rule(key))
+        self._specs[j] = spec
+        self._category_codes[j] = self._category_index(spec)
+        self.plan = plan
+
+        gap = column_gap_weights(self._values[:, j], spec)
+        if np.array_equal(gap, self.gap[:, j]):
+            return 0
+        old_final = self.final.copy()
+        self.gap[:, j] = gap
+
+        # Hitung ulang hanya kriteria yang memuat kolom ini, lalu Final Score
+        for c in self._criteria_of.get(j, []):
+            group_columns, sub_weights, _ = self._groups[c]
+            nk = np.zeros(len(self.names), dtype=float)
+            for column, weight in zip(group_columns, sub_weights):
+                nk = nk + self.gap[:, column] * weight
+            self.criteria[:, c] = nk
+        final = np.zeros(len(self.names), dtype=float)
+        for c, (_, _, criteria_weight) in enumerate(self._groups):
+            final = final + self.criteria[:, c] * criteria_weight
+        self.final = final
+
+        changed = np.flatnonzero(old_final != final)
+        if len(changed) > REBUILD_FRACTION * len(self.names):
+            self._build_ranking()
+        else:
+            for i in changed.tolist():
+                self._ranked.remove((-float(old_final[i]), i))
+                self._ranked.add(self._key(i))
+        return int(len(changed))
+
+    def rank_of(self, name):
+        """Peringkat (1-based) alternatif `name`."""
+        return self._ranked.index(self._key(self._row[name])) + 1
+
+    def score_of(self, name):
+        return float(self.final[self._row[name]])
+
+    def order(self, k=None):
+        """Indeks input alternatif dalam urutan ranking (k teratas jika `k` diisi)."""
+        keys = self._ranked if k is None else self._ranked.head(k)
+        return np.fromiter((i for _, i in keys), dtype=np.intp)
+
+    def top(self, k):
+        """(DataFrame k alternatif teratas, ringkasan sisanya) seperti top_k pada profile_matching_vectorized."""
+        order = self.order(k)
+        results = results_frame(self.names, self.columns, self.plan.criteria, self.gap, self.criteria, self.final, order)
+        return results, score_summary(self.final, order)
+
+    def to_frame(self):
+        """Seluruh hasil perangkingan sebagai DataFrame terurut."""
+        return results_frame(self.names, self.columns, self.plan.criteria, self.gap, self.criteria, self.final, self.order())
+
+# Perbarui status penilaian dari input form dengan hanya menerapkan perubahan
+def sync_scoring_state(state, alternatives, ideal_values, criteria_groups, sub_criteria_weights, criteria_weights):
+    """Mengembalikan ScoringState untuk `alternatives` (dict seperti profile_matching_with_ranges).
+
+    Jika `state` dibuat dari alternatif, sub-kriteria dan bobot yang sama, hanya
+    ideal value dan nilai yang berubah yang dihitung ulang; selain itu status
+    baru dibangun dari awal.
+    """
+    plan = compile_plan(ideal_values, criteria_groups, sub_criteria_weights, criteria_weights)
+    names = list(alternatives)
+    columns = list(dict.fromkeys(key for candidate in alternatives.values() for key in candidate))
+    if state is None or not state.matches(names, columns, plan):
+        return ScoringState(alternatives, plan)
+
+    try:
+        for key in columns:
+            if plan.rule(key) != state.plan.rule(key):
+                state.set_ideal(key, ideal_values[key])
+        for name, candidate in alternatives.items():
+            for key, value in candidate.items():
+                if value != state.value(name, key):
+                    state.set_value(name, key, value)
+    except (KeyError, TypeError, ValueError):
+        # Status bisa tertinggal setengah diperbarui; bangun ulang agar galat yang sama muncul dari input lengkap
+        return ScoringState(alternatives, plan)
+    return state
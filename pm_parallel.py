@@ -0,0 +1,189 @@
+import multiprocessing as mp
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from pm_function import (
+    _alternatives_frame,
+    aggregation_groups,
+    compile_plan,
+    encode_alternatives,
+    score_encoded,
+    score_summary,
+    top_k_indices,
+)
+
+# Jumlah baris minimum per tugas agar overhead proses tidak mendominasi
+MIN_ROWS_PER_TASK = 50_000
+
+# Pool proses dibuat sekali per jumlah worker lalu dipakai ulang oleh setiap perhitungan
+_lock = threading.Lock()
+_pool = None
+_pool_workers = None
+
+# Pool proses bersama; worker dibuat dengan "spawn" karena fork dari server Streamlit yang multithread bisa deadlock
+def _process_pool(workers):
+    global _pool, _pool_workers
+    with _lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("spawn"))
+            _pool_workers = workers
+        return _pool
+
+def _reset_pool():
+    global _pool, _pool_workers
+    with _lock:
+        pool, _pool, _pool_workers = _pool, None, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+# Buat blok shared memory dan array numpy di atasnya
+def _create_shared(shape, dtype=float):
+    size = max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1)
+    block = shared_memory.SharedMemory(create=True, size=size)
+    return block, np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+# Pasang blok shared memory yang sudah dibuat proses utama
+def _attach_shared(name, shape, dtype=float):
+    # Worker memakai resource tracker yang sama dengan proses utama, sehingga
+    # blok cukup di-unlink sekali oleh proses utama
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+# Jalankan fungsi tugas dengan blok bersama yang dipasang selama tugas berjalan
+def _with_shared(shared, task, *args):
+    attached = {key: _attach_shared(*spec) for key, spec in shared.items()}
+    try:
+        return task({key: array for key, (_, array) in attached.items()}, *args)
+    finally:
+        arrays = [block for block, _ in attached.values()]
+        attached.clear()
+        for block in arrays:
+            block.close()
+
+# Kodekan dan nilai satu potongan baris, lalu tulis hasilnya ke output bersama.
+# Jika `rank`, urutan lokal potongan (indeks global, stabil) juga ditulis ke "runs"
+def _score_block(arrays, start, block, plan, groups, rank):
+    values, specs = encode_alternatives(block, plan)
+    gap_matrix, criteria_scores, final_score = score_encoded(values, specs, groups)
+    stop = start + len(block)
+    arrays["gap"][start:stop] = gap_matrix
+    arrays["criteria"][start:stop] = criteria_scores
+    arrays["final"][start:stop] = final_score
+    if rank:
+        arrays["runs"][start:stop] = start + np.argsort(-final_score, kind="stable")
+    return stop - start
+
+# Salin baris pada posisi ranking start..stop ke blok output: bobot GAP, nilai kriteria
+# (pada kolom `criteria_positions`) dan Final Score di kolom terakhir
+def _gather_block(arrays, start, stop, criteria_positions):
+    rows = arrays["order"][start:stop]
+    out = arrays["out"]
+    out[start:stop, :arrays["gap"].shape[1]] = arrays["gap"][rows]
+    out[start:stop, criteria_positions] = arrays["criteria"][rows]
+    out[start:stop, -1] = arrays["final"][rows]
+    return stop - start
+
+# Bagi N baris menjadi partisi untuk para worker
+def _partitions(n_rows, workers):
+    n_tasks = max(1, min(workers * 4, -(-n_rows // MIN_ROWS_PER_TASK)))
+    bounds = np.linspace(0, n_rows, n_tasks + 1).astype(int)
+    return [(int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+# Jalankan tugas per partisi di pool (atau di proses ini jika hanya satu partisi)
+def _run(pool, blocks, task, tasks):
+    if pool is None:
+        arrays = {key: array for key, (_, array) in blocks.items()}
+        for args in tasks:
+            task(arrays, *args)
+        return
+    shared = {key: (block.name, array.shape, array.dtype) for key, (block, array) in blocks.items()}
+    try:
+        futures = [pool.submit(_with_shared, shared, task, *args) for args in tasks]
+        for future in futures:
+            future.result()
+    except BrokenProcessPool:
+        # Worker mati (misalnya kehabisan memori): buang pool agar panggilan berikutnya membuat yang baru
+        _reset_pool()
+        raise
+
+# Fungsi utama Profile Matching paralel multi-proses
+def profile_matching_parallel(alternatives, ideal_values, criteria_groups, sub_criteria_weights, criteria_weights, columns=None, names=None, top_k=None, workers=None):
+    """Profile Matching kolumnar yang dibagi ke beberapa proses.
+
+    Setiap worker mengkodekan dan menilai satu potongan baris, lalu menulis
+    bobot GAP, nilai kriteria dan Final Score ke shared memory. Proses utama
+    hanya mengurutkan Final Score; baris hasil disalin ke blok output sesuai
+    urutan ranking juga oleh worker, sehingga DataFrame hasil dibentuk dari
+    satu blok. Pool proses ("spawn") dipakai ulang antar panggilan. Hasil dan
+    urutan ranking identik dengan profile_matching_vectorized.
+    """
+    workers = workers or os.cpu_count() or 1
+    plan = compile_plan(ideal_values, criteria_groups, sub_criteria_weights, criteria_weights)
+    frame = _alternatives_frame(alternatives, columns, names)
+    for key in frame.columns:
+        if key not in plan.keys:
+            raise TypeError(f"Error in processing key '{key}': ideal value tidak ditemukan")
+    groups = aggregation_groups(list(frame.columns), plan)
+    n_rows, n_columns = len(frame), len(frame.columns)
+
+    # Kolom hasil seperti results_frame: kriteria tanpa sub-kriteria menimpa kolom GAP bernama sama
+    labels = list(frame.columns)
+    for criteria in plan.criteria:
+        if criteria not in labels:
+            labels.append(criteria)
+    criteria_positions = [labels.index(criteria) for criteria in plan.criteria]
+
+    partitions = _partitions(n_rows, workers)
+    pool = _process_pool(workers) if workers > 1 and len(partitions) > 1 else None
+    # Potongan baris dikirim tanpa index nama; nama alternatif hanya dipakai proses utama
+    rows = frame.set_axis(pd.RangeIndex(n_rows), axis=0)
+
+    blocks = {}
+    try:
+        blocks["gap"] = _create_shared((n_rows, n_columns))
+        blocks["criteria"] = _create_shared((n_rows, len(groups)))
+        blocks["final"] = _create_shared((n_rows,))
+        rank = top_k is None
+        if rank:
+            blocks["runs"] = _create_shared((n_rows,), np.intp)
+        _run(pool, blocks, _score_block, [(start, rows.iloc[start:stop], plan, groups, rank) for start, stop in partitions])
+
+        # Penggabungan dengan hasil yang sama seperti pengurutan stabil versi serial. Potongan yang sudah
+        # terurut digabung dengan pengurutan stabil (timsort menggabungkan run yang sudah terurut), dan
+        # nilai yang sama tetap berurutan menurut indeks karena potongan disusun naik menurut indeks
+        final_score = blocks["final"][1].copy()
+        if rank:
+            runs = blocks["runs"][1].copy()
+            order = runs[np.argsort(-final_score[runs], kind="stable")]
+            summary = None
+        else:
+            order = top_k_indices(final_score, top_k)
+            summary = score_summary(final_score, order)
+
+        blocks["order"] = _create_shared(order.shape, np.intp)
+        blocks["order"][1][:] = order
+        blocks["out"] = _create_shared((len(order), len(labels) + 1))
+        _run(pool, blocks, _gather_block, [(start, stop, criteria_positions) for start, stop in _partitions(len(order), workers)])
+        output = blocks["out"][1].copy()
+    finally:
+        # Lepaskan semua view numpy sebelum blok shared memory ditutup
+        shared_blocks = [block for block, _ in blocks.values()]
+        blocks.clear()
+        for block in shared_blocks:
+            block.close()
+            block.unlink()
+
+    results = pd.DataFrame(output, columns=labels + ["Final Score"], copy=False)
+    results.insert(0, "Alternatif", frame.index.take(order).array)
+    results["Ranking"] = np.arange(1, len(results) + 1)
+    if top_k is not None:
+        return results, summary
+    return results
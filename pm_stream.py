@@ -0,0 +1,213 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from pm_function import compile_plan, score_arrays, top_k_indices
+from result_export import block_writer
+
+# Ukuran default potongan data yang dibaca dan dinilai sekaligus
+CHUNK_SIZE = 100_000
+
+# Kolom internal untuk posisi global alternatif (pemutus skor seri)
+ORDER_COLUMN = "_order"
+
+# Baca alternatif dari CSV atau Parquet per potongan
+def iter_alternative_chunks(path, plan, name_column="Alternatif", chunksize=CHUNK_SIZE):
+    """Generator DataFrame per potongan (index = nama alternatif, kolom = sub-kriteria).
+
+    Format dipilih dari ekstensi file (.csv atau .parquet). Membaca Parquet
+    memerlukan pyarrow.
+    """
+    categorical = [key for key, rule in zip(plan.keys, plan.rules) if rule.kind == "categorical"]
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension == ".csv":
+        chunks = pd.read_csv(path, chunksize=chunksize, dtype={key: str for key in categorical})
+    elif extension in (".parquet", ".pq"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Membaca file Parquet memerlukan paket 'pyarrow'.") from e
+        parquet_file = pq.ParquetFile(path)
+        chunks = (batch.to_pandas() for batch in parquet_file.iter_batches(batch_size=chunksize))
+    else:
+        raise ValueError(f"Format file '{extension}' tidak didukung. Gunakan .csv atau .parquet.")
+
+    for chunk in chunks:
+        if name_column not in chunk.columns:
+            raise ValueError(f"Kolom nama alternatif '{name_column}' tidak ditemukan di '{path}'.")
+        chunk = chunk.set_index(name_column)
+        for key in categorical:
+            if key in chunk.columns:
+                chunk[key] = chunk[key].fillna("").astype(str)
+        yield chunk
+
+# Nilai setiap potongan dengan konfigurasi ideal dan bobot yang sama
+def score_chunks(chunks, plan):
+    """Generator DataFrame hasil per potongan (belum diurutkan) dengan kolom posisi global."""
+    offset = 0
+    for chunk in chunks:
+        gap_matrix, criteria_scores, final_score = score_arrays(chunk, plan)
+        scored = pd.DataFrame(gap_matrix, columns=list(chunk.columns))
+        scored.insert(0, "Alternatif", np.asarray(chunk.index))
+        for c, criteria in enumerate(plan.criteria):
+            scored[criteria] = criteria_scores[:, c]
+        scored["Final Score"] = final_score
+        scored[ORDER_COLUMN] = np.arange(offset, offset + len(chunk))
+        offset += len(chunk)
+        yield scored
+
+# Urutan (-skor, posisi global) yang sama dengan pengurutan stabil penuh
+def _ranked_order(scored):
+    return np.lexsort((scored[ORDER_COLUMN].to_numpy(), -scored["Final Score"].to_numpy()))
+
+# Top-k berjalan dari file tanpa memuat seluruh data ke memori
+def stream_top_k(path, k, ideal_values, criteria_groups, sub_criteria_weights, criteria_weights, name_column="Alternatif", chunksize=CHUNK_SIZE):
+    """Mengembalikan (DataFrame k alternatif teratas, ringkasan sisanya) seperti top_k pada profile_matching_vectorized.
+
+    Memori yang dipakai sebanding dengan `chunksize + k`, bukan ukuran file.
+    """
+    plan = compile_plan(ideal_values, criteria_groups, sub_criteria_weights, criteria_weights)
+    best = None
+    count, total, total_sq = 0, 0.0, 0.0
+    lowest = np.inf
+
+    chunks = iter_alternative_chunks(path, plan, name_column, chunksize)
+    for scored in score_chunks(chunks, plan):
+        scores = scored["Final Score"].to_numpy()
+        count += len(scores)
+        total += float(scores.sum())
+        total_sq += float(np.square(scores).sum())
+        if len(scores):
+            lowest = min(lowest, float(scores.min()))
+
+        # Simpan k+1 teratas agar skor tertinggi di luar top-k tetap diketahui
+        candidates = scored.iloc[top_k_indices(scores, k + 1)]
+        merged = candidates if best is None else pd.concat([best, candidates], ignore_index=True)
+        best = merged.iloc[_ranked_order(merged)[:k + 1]].reset_index(drop=True)
+
+    if best is None:
+        best = pd.DataFrame(columns=["Alternatif", "Final Score", ORDER_COLUMN])
+
+    top = best.iloc[:k].drop(columns=ORDER_COLUMN).reset_index(drop=True)
+    top["Ranking"] = np.arange(1, len(top) + 1)
+
+    # Statistik sisa dihitung dari jumlah total dikurangi kontribusi top-k
+    top_scores = top["Final Score"].to_numpy(dtype=float)
+    rest_count = count - len(top)
+    summary = {
+        "total": int(count),
+        "top_k": int(len(top)),
+        "cutoff_score": float(top_scores[-1]) if len(top) else None,
+        "rest_count": int(rest_count),
+        "rest_mean": None,
+        "rest_std": None,
+        "rest_min": None,
+        "rest_max": None,
+    }
+    if rest_count:
+        rest_mean = (total - top_scores.sum()) / rest_count
+        rest_var = max((total_sq - np.square(top_scores).sum()) / rest_count - rest_mean ** 2, 0.0)
+        summary.update({
+            "rest_mean": float(rest_mean),
+            "rest_std": float(np.sqrt(rest_var)),
+            "rest_min": float(lowest),
+            "rest_max": float(best["Final Score"].iloc[k]),
+        })
+    return top, summary
+
+# Jumlah baris total yang ditampung saat penggabungan (dibagi rata ke semua run)
+MERGE_BUFFER_ROWS = 200_000
+
+# Tulis satu potongan terurut ke disk dalam format biner .npy
+def _spill_run(scored, run_dir, index):
+    ranked = scored.iloc[_ranked_order(scored)]
+    prefix = os.path.join(run_dir, f"run_{index:06d}")
+    value_columns = [column for column in ranked.columns if column not in ("Alternatif", ORDER_COLUMN)]
+    np.save(prefix + "_names.npy", ranked["Alternatif"].to_numpy(dtype=str))
+    np.save(prefix + "_values.npy", ranked[value_columns].to_numpy(dtype=float))
+    np.save(prefix + "_order.npy", ranked[ORDER_COLUMN].to_numpy(dtype=np.int64))
+    return prefix, value_columns
+
+# Buka run sebagai memmap agar hanya blok yang dibutuhkan yang dibaca
+def _open_run(prefix):
+    values = np.load(prefix + "_values.npy", mmap_mode="r")
+    return {
+        "names": np.load(prefix + "_names.npy", mmap_mode="r"),
+        "values": values,
+        "order": np.load(prefix + "_order.npy", mmap_mode="r"),
+        "position": 0,
+    }
+
+# Gabungkan run terurut per blok (vektor), menghasilkan (names, values, order) berurutan
+def _merge_runs(runs, score_index, buffer_rows=None):
+    runs = [run for run in runs if len(run["order"])]
+    block = max(1, (buffer_rows or MERGE_BUFFER_ROWS) // max(len(runs), 1))
+    while runs:
+        # Batas aman: kunci terakhir terkecil dari jendela run yang belum habis
+        bound = None
+        for run in runs:
+            end = run["position"] + block
+            if end < len(run["order"]):
+                key = (-run["values"][end - 1, score_index], run["order"][end - 1])
+                bound = key if bound is None or key < bound else bound
+
+        names, values, order = [], [], []
+        for run in runs:
+            start = run["position"]
+            stop = min(start + block, len(run["order"]))
+            window_score = -np.asarray(run["values"][start:stop, score_index])
+            window_order = np.asarray(run["order"][start:stop])
+            if bound is not None:
+                take = (window_score < bound[0]) | ((window_score == bound[0]) & (window_order <= bound[1]))
+                stop = start + int(take.sum())
+            names.append(np.asarray(run["names"][start:stop]))
+            values.append(np.asarray(run["values"][start:stop]))
+            order.append(np.asarray(run["order"][start:stop]))
+            run["position"] = stop
+
+        names, values, order = np.concatenate(names), np.concatenate(values), np.concatenate(order)
+        ranked = np.lexsort((order, -values[:, score_index]))
+        yield names[ranked], values[ranked], order[ranked]
+        runs = [run for run in runs if run["position"] < len(run["order"])]
+
+# Perangkingan penuh dengan external merge sort
+def stream_full_ranking(path, output_path, ideal_values, criteria_groups, sub_criteria_weights, criteria_weights, name_column="Alternatif", chunksize=CHUNK_SIZE, tmp_dir=None):
+    """Menulis perangkingan lengkap ke `output_path` (.csv/.parquet) dan mengembalikan jumlah alternatif.
+
+    Setiap potongan diurutkan lalu ditulis ke disk sebagai run biner terpisah,
+    kemudian semua run digabung per blok (k-way merge) sehingga memori tetap datar
+    berapa pun ukuran input. Urutan hasil identik dengan profile_matching_with_ranges.
+    """
+    plan = compile_plan(ideal_values, criteria_groups, sub_criteria_weights, criteria_weights)
+    run_dir = tempfile.mkdtemp(prefix="pm_runs_", dir=tmp_dir)
+    try:
+        prefixes = []
+        value_columns = None
+        chunks = iter_alternative_chunks(path, plan, name_column, chunksize)
+        for scored in score_chunks(chunks, plan):
+            prefix, value_columns = _spill_run(scored, run_dir, len(prefixes))
+            prefixes.append(prefix)
+
+        write, close = block_writer(output_path)
+        count = 0
+        try:
+            if value_columns is not None:
+                runs = [_open_run(prefix) for prefix in prefixes]
+                score_index = value_columns.index("Final Score")
+                for names, values, _ in _merge_runs(runs, score_index):
+                    frame = pd.DataFrame(values, columns=value_columns)
+                    frame.insert(0, "Alternatif", names)
+                    frame["Ranking"] = np.arange(count + 1, count + len(frame) + 1)
+                    write(frame)
+                    count += len(frame)
+            else:
+                write(pd.DataFrame(columns=["Alternatif", "Final Score", "Ranking"]))
+        finally:
+            close()
+        return count
+    finally:
+        shutil.rmtree(run_dir, ignore_errors=True)
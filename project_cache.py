@@ -0,0 +1,115 @@
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from types import MappingProxyType
+
+import numpy as np
+
+from columnar_store import attach_columnar
+from json_codec import ahp_arrays
+from project_journal import read_project, source_signature
+
+# Jumlah proyek berbeda yang disimpan sekaligus untuk semua sesi (yang paling lama tidak dipakai dibuang)
+MAX_SHARED_PROJECTS = 8
+
+_lock = threading.Lock()
+# (path, signature) -> SharedProject, urutan dari yang paling lama dipakai
+_projects = OrderedDict()
+_stats = {"hits": 0, "misses": 0}
+
+# Proyek yang sudah dimuat dan dipakai bersama oleh semua sesi
+@dataclass(frozen=True)
+class SharedProject:
+    """Isi satu file proyek yang dibagi antar sesi; jangan diubah.
+
+    `form_data` hanya-baca dan array hasil AHP tidak dapat ditulis. Sesi
+    menyimpan referensi ke objek ini ditambah nilai yang mereka ubah sendiri;
+    nilai form yang belum diubah dibaca dari sini lewat form_value.
+    """
+    path: str
+    signature: tuple
+    form_data: MappingProxyType
+    ahp_results: dict
+    pm_results: object
+
+    def form_value(self, key, fallback, options=None):
+        """Nilai awal widget `key`: nilai tersimpan jika tipenya cocok dengan `fallback`, selain itu `fallback`."""
+        value = self.form_data.get(key, fallback)
+        if options is not None:
+            return value if value in options else fallback
+        if isinstance(fallback, bool):
+            return value if isinstance(value, bool) else fallback
+        if isinstance(fallback, (int, float)):
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                return fallback
+            return type(fallback)(value)
+        if isinstance(fallback, str):
+            return value if isinstance(value, str) else fallback
+        return value
+
+# Kunci array NumPy hasil AHP agar tidak bisa diubah di tempat oleh salah satu sesi
+def _freeze_arrays(ahp_results):
+    if not ahp_results:
+        return ahp_results
+    arrays = [ahp_results.get("weights_main")]
+    arrays.extend((ahp_results.get("sub_matrices") or {}).values())
+    arrays.extend(result.get("weights_sub") for result in (ahp_results.get("sub_results") or {}).values())
+    for array in arrays:
+        if isinstance(array, np.ndarray):
+            array.flags.writeable = False
+    return ahp_results
+
+def _load(file_path, signature):
+    data = read_project(file_path)
+    attach_columnar(data, file_path)
+    form_data = dict(data.get("form_data") or {})
+    # Buang nama kosong seperti saat form dimuat
+    if "criteria_labels" in form_data:
+        form_data["criteria_labels"] = [c for c in form_data["criteria_labels"] if c.strip()]
+    if "sub_criteria_dict" in form_data:
+        form_data["sub_criteria_dict"] = {k: v for k, v in form_data["sub_criteria_dict"].items() if k.strip()}
+    if "alternatives" in form_data:
+        form_data["alternatives"] = {alt: vals for alt, vals in form_data["alternatives"].items() if alt.strip()}
+    return SharedProject(
+        path=file_path,
+        signature=signature,
+        form_data=MappingProxyType(form_data),
+        ahp_results=_freeze_arrays(ahp_arrays(data.get("ahp_results", None))),
+        pm_results=data.get("pm_results", None),
+    )
+
+def shared_project(file_path):
+    """SharedProject untuk isi `file_path` saat ini; dibaca dari disk hanya jika belum ada di cache.
+
+    Kunci cache adalah path beserta (mtime, ukuran) snapshot dan jurnal, sehingga
+    file yang disimpan ulang dimuat sebagai proyek baru. Sesi yang masih
+    memegang versi lama tetap memakai versinya sendiri.
+    """
+    signature = source_signature(file_path)
+    if signature is None:
+        raise FileNotFoundError(f"File '{file_path}' tidak ditemukan.")
+    key = (os.path.abspath(file_path), signature)
+    with _lock:
+        project = _projects.get(key)
+        if project is not None:
+            _projects.move_to_end(key)
+            _stats["hits"] += 1
+            return project
+        _stats["misses"] += 1
+
+    project = _load(file_path, signature)
+    with _lock:
+        # Sesi lain mungkin sudah memuat file yang sama; pakai satu objek saja
+        project = _projects.setdefault(key, project)
+        _projects.move_to_end(key)
+        # Versi lama file yang sama tidak akan diminta lagi
+        for stale in [other for other in _projects if other[0] == key[0] and other != key]:
+            del _projects[stale]
+        while len(_projects) > MAX_SHARED_PROJECTS:
+            _projects.popitem(last=False)
+    return project
+
+def cache_info():
+    with _lock:
+        return {"hits": _stats["hits"], "misses": _stats["misses"], "size": len(_projects)}
@@ -0,0 +1,145 @@
+import json
+import os
+import threading
+import time
+
+from columnar_store import ColumnarTable, attach_columnar
+from project_journal import JOURNAL_SUFFIX, read_project
+
+# Folder proyek dan file manifest (bukan .json agar tidak ikut terdaftar sebagai proyek)
+DATA_DIR = "data"
+INDEX_FILE = ".project_index"
+INDEX_VERSION = 1
+
+# Jeda minimum (detik) antar pemindaian folder; perubahan dari aplikasi ini langsung dibatalkan lewat invalidate
+POLL_INTERVAL = 2.0
+
+_lock = threading.Lock()
+_state = {}
+
+# Ringkasan satu proyek dari isi file JSON
+def summarize(data, file_path=None):
+    """Metadata proyek untuk pemilih file: kriteria, sub-kriteria, jumlah alternatif dan peringkat pertama."""
+    if file_path is not None:
+        attach_columnar(data, file_path)
+    ahp_results = data.get("ahp_results") or {}
+    form_data = data.get("form_data") or {}
+    pm_results = data.get("pm_results") or []
+
+    criteria = list(ahp_results.get("criteria_labels") or form_data.get("criteria_labels") or [])
+    sub_criteria = ahp_results.get("sub_criteria_dict") or form_data.get("sub_criteria_dict") or {}
+    num_alternatives = form_data.get("num_alternatives") or len(pm_results)
+
+    if isinstance(pm_results, ColumnarTable):
+        top = pm_results.top()
+    else:
+        top = min(pm_results, key=lambda row: row.get("Ranking", float("inf")), default=None)
+    return {
+        "criteria": criteria,
+        "sub_criteria": {key: list(value) for key, value in sub_criteria.items()},
+        "num_criteria": len(criteria),
+        "num_sub_criteria": sum(len(value) for value in sub_criteria.values()),
+        "num_alternatives": int(num_alternatives),
+        "top_alternative": top.get("Alternatif") if top else None,
+        "top_score": top.get("Final Score") if top else None,
+        "has_ahp": bool(ahp_results),
+        "has_pm": bool(pm_results),
+    }
+
+# Ringkasan untuk file yang tidak bisa dibaca
+def _broken(error):
+    return {"error": str(error)}
+
+def _load_manifest(data_dir):
+    try:
+        with open(os.path.join(data_dir, INDEX_FILE), "r") as file:
+            manifest = json.load(file)
+        if manifest.get("version") == INDEX_VERSION:
+            return manifest.get("entries", {})
+    except (OSError, ValueError):
+        pass
+    return {}
+
+# Tulis manifest secara atomik agar proses lain tidak membaca file setengah jadi
+def _save_manifest(data_dir, entries):
+    path = os.path.join(data_dir, INDEX_FILE)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "w") as file:
+            json.dump({"version": INDEX_VERSION, "entries": entries}, file)
+        os.replace(tmp_path, path)
+    except OSError:
+        # Manifest hanya cache; jika tidak bisa ditulis, indeks tetap berjalan dari memori
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+# Pindai folder dan perbarui entri yang mtime atau ukurannya (file atau jurnalnya) berubah
+def _scan(data_dir, entries):
+    current, changed = {}, False
+    files, journals = [], {}
+    with os.scandir(data_dir) as scan:
+        for entry in scan:
+            if entry.name.endswith(".json") and entry.is_file():
+                files.append(entry)
+            elif entry.name.endswith(JOURNAL_SUFFIX) and entry.is_file():
+                stat = entry.stat()
+                journals[entry.name[:-len(JOURNAL_SUFFIX)]] = [stat.st_mtime_ns, stat.st_size]
+    for entry in files:
+        stat = entry.stat()
+        journal = journals.get(entry.name[:-len(".json")])
+        cached = entries.get(entry.name)
+        if (cached and cached["mtime_ns"] == stat.st_mtime_ns and cached["size"] == stat.st_size
+                and cached.get("journal") == journal):
+            current[entry.name] = cached
+            continue
+        try:
+            summary = summarize(read_project(entry.path), entry.path)
+        except (OSError, ValueError, AttributeError, TypeError) as e:
+            summary = _broken(e)
+        current[entry.name] = {
+            "name": entry.name, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "journal": journal, **summary
+        }
+        changed = True
+    return current, changed or current.keys() != entries.keys()
+
+# Fungsi utama: daftar proyek beserta ringkasannya
+def project_index(data_dir=DATA_DIR, force=False):
+    """Mengembalikan dict nama file -> metadata (terurut berdasarkan nama).
+
+    Folder dipindai paling sering sekali per POLL_INTERVAL; hanya file yang
+    mtime atau ukurannya berubah yang dibaca ulang. Hasil disimpan di manifest
+    `data/.project_index` sehingga proses baru tidak perlu membaca semua file.
+    """
+    with _lock:
+        state = _state.get(data_dir)
+        if state is None:
+            state = _state[data_dir] = {"entries": _load_manifest(data_dir), "scanned_at": None}
+        if force or state["scanned_at"] is None or time.monotonic() - state["scanned_at"] >= POLL_INTERVAL:
+            entries, changed = _scan(data_dir, state["entries"])
+            state["entries"] = dict(sorted(entries.items()))
+            state["scanned_at"] = time.monotonic()
+            if changed:
+                _save_manifest(data_dir, state["entries"])
+        return state["entries"]
+
+# Batalkan cache setelah file disimpan atau dihapus oleh aplikasi
+def invalidate(data_dir=DATA_DIR):
+    with _lock:
+        if data_dir in _state:
+            _state[data_dir]["scanned_at"] = None
+
+# Label ringkas untuk pemilih file
+def describe(entry):
+    if entry is None:
+        return ""
+    if "error" in entry:
+        return f"{entry['name']} — tidak dapat dibaca"
+    parts = [
+        f"{entry['num_criteria']} kriteria",
+        f"{entry['num_sub_criteria']} sub-kriteria",
+        f"{entry['num_alternatives']} alternatif",
+    ]
+    if entry["top_alternative"] is not None:
+        score = entry["top_score"]
+        parts.append(f"#1 {entry['top_alternative']}" + (f" ({score:.3f})" if isinstance(score, (int, float)) else ""))
+    return f"{entry['name']} — " + ", ".join(parts)
@@ -0,0 +1,112 @@
+import itertools
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import streamlit as st
+
+# Beberapa worker untuk semua sesi; operasi pada file yang sama tetap dijalankan berurutan lewat antrean per path
+MAX_WORKERS = 4
+
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="project_io")
+_lock = threading.Lock()
+_ids = itertools.count(1)
+# Antrean job per path yang sedang memiliki job berjalan: path -> deque (future, fn, args)
+_queues = {}
+
+# Key session_state berisi job milik sesi yang belum selesai ditampilkan: id -> dict (future, label, message, error, on_done).
+# Future hanya dipegang sesi pemiliknya, sehingga ikut dibuang bersama sesi yang ditutup sebelum sempat memeriksa
+JOBS_KEY = "io_jobs"
+
+# Jeda (detik) antar pemeriksaan status job selama masih ada job yang berjalan
+POLL_SECONDS = 0.5
+
+# Jalankan satu job lalu jadwalkan job berikutnya yang menunggu path yang sama
+def _execute(future, fn, args, path):
+    if future.set_running_or_notify_cancel():
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+    if path is None:
+        return
+    with _lock:
+        queue = _queues[path]
+        following = queue.popleft() if queue else None
+        if following is None:
+            del _queues[path]
+    if following is not None:
+        _executor.submit(_execute, *following, path)
+
+def start_job(fn, *args, path=None):
+    """Menjadwalkan fn(*args) di thread latar dan langsung mengembalikan Future job.
+
+    Job dengan `path` yang sama dijalankan satu per satu sesuai urutan
+    penjadwalan; job untuk path lain tetap berjalan paralel.
+    """
+    future = Future()
+    path = os.path.abspath(path) if path is not None else None
+    with _lock:
+        waiting = path is not None and path in _queues
+        if waiting:
+            _queues[path].append((future, fn, args))
+        elif path is not None:
+            _queues[path] = deque()
+    if not waiting:
+        _executor.submit(_execute, future, fn, args, path)
+    return future
+
+def job_status(future):
+    """Status Future dari start_job: dict berisi state ("running", "done" atau "failed"), result dan error."""
+    if not future.done():
+        return {"state": "running", "result": None, "error": None}
+    error = future.exception()
+    return {"state": "failed" if error else "done", "result": None if error else future.result(), "error": error}
+
+# ----------------- Job milik sesi Streamlit -----------------
+
+def submit(fn, *args, path=None, label, message, error, on_done=None):
+    """Menjalankan fn(*args) di worker latar untuk sesi ini tanpa menahan skrip.
+
+    Selama berjalan job_watcher menampilkan `label`. Setelah selesai,
+    on_done(hasil) dipanggil di thread skrip (boleh mengubah session_state),
+    lalu `message` ditampilkan sebagai toast; jika on_done mengembalikan teks,
+    teks itu yang ditampilkan. Galat ditampilkan sebagai "`error`: <galat>".
+    `path` adalah file yang diubah atau dibaca job (lihat start_job).
+    """
+    job_id = next(_ids)
+    st.session_state.setdefault(JOBS_KEY, {})[job_id] = {
+        "future": start_job(fn, *args, path=path),
+        "label": label, "message": message, "error": error, "on_done": on_done,
+    }
+    return job_id
+
+def pending_jobs():
+    return bool(st.session_state.get(JOBS_KEY))
+
+# Pantau job sesi ini; hanya bagian ini yang dijalankan ulang secara berkala sampai semua job selesai
+@st.fragment(run_every=POLL_SECONDS)
+def _watch_jobs():
+    jobs = st.session_state.get(JOBS_KEY) or {}
+    finished = False
+    for job_id, job in list(jobs.items()):
+        status = job_status(job["future"])
+        if status["state"] == "running":
+            st.caption(f"{job['label']}...")
+            continue
+        jobs.pop(job_id, None)
+        finished = True
+        if status["state"] == "failed":
+            st.toast(f"{job['error']}: {status['error']}")
+            continue
+        message = job["on_done"](status["result"]) if job["on_done"] is not None else None
+        st.toast(message or job["message"])
+    # Halaman dijalankan ulang agar menampilkan hasil job (form proyek yang dimuat, daftar file terbaru)
+    if finished:
+        st.rerun(scope="app")
+
+def job_watcher():
+    """Tampilkan status job latar sesi ini; panggil di awal halaman sebelum widget form."""
+    if pending_jobs():
+        _watch_jobs()
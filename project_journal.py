@@ -0,0 +1,213 @@
+import os
+import threading
+import zlib
+
+from json_codec import dumps, loads, to_builtin
+from project_schema import TRANSIENT_KEYS, read_project as read_snapshot, write_project
+
+# Jurnal perubahan di samping snapshot: data/<nama>.journal (bukan .json agar tidak ikut terdaftar)
+JOURNAL_SUFFIX = ".journal"
+JOURNAL_VERSION = 1
+
+# Jurnal dipadatkan ke snapshot baru jika lebih besar dari rasio ini terhadap snapshot,
+# atau jumlah rekamannya melebihi batas
+COMPACT_RATIO = 0.5
+COMPACT_MIN_BYTES = 64 * 1024
+COMPACT_MAX_RECORDS = 200
+
+_lock = threading.RLock()
+# Keadaan terakhir file yang disimpan proses ini: path -> {signature, data, records}
+_states = {}
+
+def journal_path(file_path):
+    root, ext = os.path.splitext(file_path)
+    return (root if ext == ".json" else file_path) + JOURNAL_SUFFIX
+
+def _stat(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+# Identitas isi proyek di disk: snapshot beserta jurnalnya
+def source_signature(file_path):
+    """(mtime_ns, ukuran) gabungan snapshot dan jurnal; berubah setiap kali proyek disimpan."""
+    snapshot, journal = _stat(file_path), _stat(journal_path(file_path))
+    if snapshot is None:
+        return None
+    if journal is None:
+        return snapshot
+    return max(snapshot[0], journal[0]), snapshot[1] + journal[1]
+
+# ----------------- Rekaman delta -----------------
+
+# Perbedaan dua dict proyek (bentuk lama); hanya key form, baris hasil dan bagian yang berubah
+def diff_project(old, new):
+    delta = {}
+    old_form, new_form = old.get("form_data") or {}, new.get("form_data") or {}
+    form_set = {key: value for key, value in new_form.items() if key not in old_form or old_form[key] != value}
+    form_unset = [key for key in old_form if key not in new_form]
+    if form_set or form_unset:
+        delta["form"] = {"set": form_set, "unset": form_unset}
+
+    old_pm, new_pm = old.get("pm_results"), new.get("pm_results")
+    if isinstance(old_pm, list) and isinstance(new_pm, list):
+        rows = {str(i): row for i, row in enumerate(new_pm) if i >= len(old_pm) or old_pm[i] != row}
+        if rows or len(old_pm) != len(new_pm):
+            delta["pm"] = {"length": len(new_pm), "rows": rows}
+    elif old_pm != new_pm:
+        delta.setdefault("replace", {})["pm_results"] = new_pm
+
+    for key in new.keys() - {"form_data", "pm_results"}:
+        if key not in old or old[key] != new[key]:
+            delta.setdefault("replace", {})[key] = new[key]
+    deleted = [key for key in old.keys() - new.keys() - {"form_data", "pm_results"}]
+    if deleted:
+        delta["delete"] = deleted
+    return delta
+
+def apply_delta(data, delta):
+    if "form" in delta:
+        form = dict(data.get("form_data") or {})
+        for key in delta["form"]["unset"]:
+            form.pop(key, None)
+        form.update(delta["form"]["set"])
+        data["form_data"] = form
+    if "pm" in delta:
+        pm_results = list(data.get("pm_results") or [])[:delta["pm"]["length"]]
+        pm_results.extend([None] * (delta["pm"]["length"] - len(pm_results)))
+        for index, row in delta["pm"]["rows"].items():
+            pm_results[int(index)] = row
+        data["pm_results"] = pm_results
+    data.update(delta.get("replace", {}))
+    for key in delta.get("delete", []):
+        data.pop(key, None)
+    return data
+
+# Satu baris jurnal: "<crc32> <json>\n"; baris rusak (misalnya terpotong saat crash) tidak dibaca
+def _encode_line(record):
+    payload = dumps(record)
+    return b"%08x %s\n" % (zlib.crc32(payload), payload)
+
+def _decode_lines(raw):
+    records = []
+    for line in raw.split(b"\n"):
+        checksum, _, payload = line.partition(b" ")
+        if len(checksum) != 8 or not payload or int(checksum, 16) != zlib.crc32(payload):
+            break
+        records.append(loads(payload))
+    return records
+
+# ----------------- Baca -----------------
+
+def _read_journal(file_path):
+    """Rekaman delta yang berlaku untuk snapshot saat ini; None jika jurnal tidak ada atau milik snapshot lain."""
+    try:
+        with open(journal_path(file_path), "rb") as file:
+            records = _decode_lines(file.read())
+    except FileNotFoundError:
+        return None
+    if not records or records[0].get("journal") != JOURNAL_VERSION:
+        return None
+    # Jurnal milik snapshot lama (misalnya crash setelah pemadatan sebelum jurnal dihapus) diabaikan
+    if records[0].get("snapshot") != list(_stat(file_path) or ()):
+        return None
+    return records[1:]
+
+# Keadaan terkini proyek: dari cache proses ini jika file belum berubah, selain itu dari disk
+def _load_state(file_path):
+    signature = source_signature(file_path)
+    state = _states.get(file_path)
+    if state is not None and state["signature"] == signature:
+        return state, True
+    data = read_snapshot(file_path)
+    records = _read_journal(file_path)
+    for delta in records or []:
+        apply_delta(data, delta)
+    return {"signature": signature, "data": data, "records": None if records is None else len(records)}, False
+
+def _remember(file_path, data, records):
+    _states[file_path] = {"signature": source_signature(file_path), "data": data, "records": records}
+
+def read_project(file_path):
+    """Membaca proyek (bentuk lama) dari snapshot lalu menerapkan jurnal perubahannya."""
+    state, cached = _load_state(file_path)
+    return to_builtin(state["data"]) if cached else state["data"]
+
+# ----------------- Simpan -----------------
+
+# Buang ekor jurnal yang tidak diakhiri baris baru sebelum menambah rekaman
+def _repair_tail(file):
+    size = file.seek(0, os.SEEK_END)
+    if size == 0:
+        return
+    file.seek(size - 1)
+    if file.read(1) == b"\n":
+        return
+    position = size
+    while position > 0:
+        start = max(0, position - 4096)
+        file.seek(start)
+        newline = file.read(position - start).rfind(b"\n")
+        if newline >= 0:
+            file.truncate(start + newline + 1)
+            return
+        position = start
+    file.truncate(0)
+
+def _append(file_path, lines):
+    with open(journal_path(file_path), "ab+") as file:
+        _repair_tail(file)
+        file.seek(0, os.SEEK_END)
+        file.write(b"".join(lines))
+        file.flush()
+        os.fsync(file.fileno())
+        return file.tell()
+
+def remove_journal(file_path):
+    try:
+        os.remove(journal_path(file_path))
+    except FileNotFoundError:
+        pass
+
+def compact(file_path, data=None):
+    """Menulis snapshot baru (rename atomik) berisi keadaan terkini lalu menghapus jurnal."""
+    with _lock:
+        if data is None:
+            data = _load_state(file_path)[0]["data"]
+        write_project(file_path, data)
+        remove_journal(file_path)
+        _remember(file_path, data, None)
+
+def save_incremental(file_path, data):
+    """Menyimpan `data` dengan menambahkan hanya perubahannya ke jurnal.
+
+    Snapshot ditulis penuh jika belum ada atau jurnal sudah cukup besar
+    (lihat COMPACT_*). Mengembalikan "snapshot", "delta" atau "unchanged".
+    """
+    new = to_builtin(data)
+    # Key sementara tidak ikut snapshot (lihat project_schema); jangan dicatat sebagai perubahan
+    new["form_data"] = {key: value for key, value in (new.get("form_data") or {}).items() if key not in TRANSIENT_KEYS}
+    with _lock:
+        if _stat(file_path) is None:
+            compact(file_path, new)
+            return "snapshot"
+        state, _ = _load_state(file_path)
+        delta = diff_project(state["data"], new)
+        if not delta:
+            return "unchanged"
+
+        lines = [_encode_line(delta)]
+        if state["records"] is None:
+            # Belum ada jurnal yang berlaku untuk snapshot ini: mulai jurnal baru
+            remove_journal(file_path)
+            lines.insert(0, _encode_line({"journal": JOURNAL_VERSION, "snapshot": list(_stat(file_path))}))
+        journal_size = _append(file_path, lines)
+        records = (state["records"] or 0) + 1
+
+        if journal_size > max(COMPACT_MIN_BYTES, COMPACT_RATIO * _stat(file_path)[1]) or records >= COMPACT_MAX_RECORDS:
+            compact(file_path, new)
+            return "snapshot"
+        _remember(file_path, new, records)
+        return "delta"
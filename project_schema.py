@@ -0,0 +1,389 @@
+import os
+import re
+import threading
+
+from json_codec import dumps, loads, to_builtin
+
+# Versi format file proyek; file tanpa "schema_version" adalah format lama (versi 1)
+SCHEMA_VERSION = 2
+
+# Key session state milik halaman lain yang tidak perlu ikut disimpan
+TRANSIENT_KEYS = ("confirm_delete", "file_to_delete", "reload", "selected_file_index")
+
+# Field konfigurasi profil ideal per sub-kriteria (key widget: <field>_<sub-kriteria>)
+PROFILE_FIELDS = ("data_type", "is_range", "min_value", "max_value", "ideal_value")
+
+_MAIN_CELL = re.compile(r"matrix_main_(\d+)_(\d+)$")
+_SUB_CELL = re.compile(r"matrix_sub_(.+)_(\d+)_(\d+)$")
+
+# ----------------- Matriks perbandingan -----------------
+
+# Sel segitiga atas {(i, j): nilai} -> baris segitiga atas; None jika tidak lengkap
+def _upper_rows(cells):
+    size = max(max(i, j) for i, j in cells) + 1
+    if len(cells) != size * (size - 1) // 2 or any(i >= j for i, j in cells):
+        return None
+    return [[cells[(i, j)] for j in range(i + 1, size)] for i in range(size)]
+
+# Matriks penuh dari baris segitiga atas (sama seperti form: bawah = 1 / atas)
+def full_matrix(upper):
+    size = len(upper)
+    matrix = []
+    for i in range(size):
+        row = []
+        for j in range(size):
+            if i == j:
+                row.append(1.0)
+            elif i < j:
+                row.append(upper[i][j - i - 1])
+            else:
+                row.append(1 / matrix[j][i])
+        matrix.append(row)
+    return matrix
+
+# DataFrame.to_dict() dari matriks perbandingan ditambah kolom bobot
+def _matrix_frame(labels, matrix, weights):
+    frame = {col: {row: matrix[i][j] for i, row in enumerate(labels)} for j, col in enumerate(labels)}
+    frame["Weight"] = dict(zip(labels, weights))
+    return frame
+
+def _frame_matrix(labels, frame):
+    return [[frame[col][row] for col in labels] for row in labels]
+
+# ----------------- Form (session state) -----------------
+
+def _compact_criteria(form, used):
+    num_criteria = form.get("num_criteria")
+    if not isinstance(num_criteria, int) or isinstance(num_criteria, bool):
+        return None
+    criteria = []
+    for i in range(num_criteria):
+        if f"criteria_{i}" not in form:
+            return None
+        entry = {"name": form[f"criteria_{i}"]}
+        num_sub = form.get(f"num_sub_{i}")
+        if num_sub is not None:
+            if not isinstance(num_sub, int) or isinstance(num_sub, bool):
+                return None
+            if any(f"sub_{i}_{j}" not in form for j in range(num_sub)):
+                return None
+            entry["sub_criteria"] = [form[f"sub_{i}_{j}"] for j in range(num_sub)]
+        criteria.append(entry)
+    used.add("num_criteria")
+    for i, entry in enumerate(criteria):
+        used.add(f"criteria_{i}")
+        if "sub_criteria" in entry:
+            used.add(f"num_sub_{i}")
+            used.update(f"sub_{i}_{j}" for j in range(len(entry["sub_criteria"])))
+    return criteria
+
+def _expand_criteria(criteria, form):
+    form["num_criteria"] = len(criteria)
+    for i, entry in enumerate(criteria):
+        form[f"criteria_{i}"] = entry["name"]
+        if "sub_criteria" in entry:
+            form[f"num_sub_{i}"] = len(entry["sub_criteria"])
+            for j, name in enumerate(entry["sub_criteria"]):
+                form[f"sub_{i}_{j}"] = name
+
+# Struktur sub_criteria yang dibentuk form dari daftar kriteria
+def _sub_criteria(criteria):
+    return {
+        entry["name"]: entry.get("sub_criteria") or []
+        for entry in criteria if entry["name"].strip() and "sub_criteria" in entry
+    }
+
+def _compact_comparisons(form, used):
+    main, sub = {}, {}
+    for key, value in form.items():
+        match = _MAIN_CELL.match(key)
+        if match:
+            main[int(match[1]), int(match[2])] = value
+            continue
+        match = _SUB_CELL.match(key)
+        if match:
+            sub.setdefault(match[1], {})[int(match[2]), int(match[3])] = value
+    comparisons = {}
+    if main and (rows := _upper_rows(main)) is not None:
+        comparisons["main"] = rows
+        used.update(f"matrix_main_{i}_{j}" for i, j in main)
+    for criteria, cells in sub.items():
+        rows = _upper_rows(cells)
+        if rows is not None:
+            comparisons.setdefault("sub", {})[criteria] = rows
+            used.update(f"matrix_sub_{criteria}_{i}_{j}" for i, j in cells)
+    return comparisons
+
+def _expand_comparisons(comparisons, form):
+    for i, row in enumerate(comparisons.get("main", [])):
+        for offset, value in enumerate(row):
+            form[f"matrix_main_{i}_{i + offset + 1}"] = value
+    for criteria, rows in comparisons.get("sub", {}).items():
+        for i, row in enumerate(rows):
+            for offset, value in enumerate(row):
+                form[f"matrix_sub_{criteria}_{i}_{i + offset + 1}"] = value
+
+def _compact_profile(form, used):
+    profile = {}
+    for key, value in form.items():
+        for field in PROFILE_FIELDS:
+            prefix = f"{field}_"
+            if key.startswith(prefix) and len(key) > len(prefix):
+                profile.setdefault(key[len(prefix):], {})[field] = value
+                used.add(key)
+                break
+    return profile
+
+def _expand_profile(profile, form):
+    for sub_criteria, fields in profile.items():
+        for field, value in fields.items():
+            form[f"{field}_{sub_criteria}"] = value
+
+# Nilai alternatif disimpan per kolom sub-kriteria: satu daftar nilai sejajar dengan daftar nama
+def _compact_alternatives(form, used):
+    num_alternatives = form.get("num_alternatives")
+    if not isinstance(num_alternatives, int) or isinstance(num_alternatives, bool):
+        return None
+    names = [form.get(f"alt_name_{i}") for i in range(num_alternatives)]
+    if any(not isinstance(name, str) for name in names):
+        return None
+    used.add("num_alternatives")
+    used.update(f"alt_name_{i}" for i in range(num_alternatives))
+
+    # Pasangkan key value_<alternatif>_<sub> dengan nama alternatif terpanjang yang cocok;
+    # cukup coba setiap posisi "_" di key, bukan setiap nama alternatif
+    known = set(names)
+    cells = {}
+    for key in form:
+        if not key.startswith("value_"):
+            continue
+        rest = key[len("value_"):]
+        split = rest.rfind("_", 0, len(rest) - 1)
+        while split >= 0 and rest[:split] not in known:
+            split = rest.rfind("_", 0, split)
+        if split >= 0:
+            cells.setdefault(rest[split + 1:], {})[rest[:split]] = key
+    values = {}
+    for sub_criteria, keys in cells.items():
+        if all(name in keys for name in names):
+            values[sub_criteria] = [form[keys[name]] for name in names]
+            used.update(keys.values())
+    return {"names": names, "values": values}
+
+def _expand_alternatives(alternatives, form):
+    names = alternatives["names"]
+    form["num_alternatives"] = len(names)
+    for i, name in enumerate(names):
+        form[f"alt_name_{i}"] = name
+    for sub_criteria, column in alternatives["values"].items():
+        for name, value in zip(names, column):
+            form[f"value_{name}_{sub_criteria}"] = value
+
+def compact_form(form_data):
+    """Memecah form_data (salinan session state) menjadi bagian-bagian ternormalisasi.
+
+    Setiap kelompok key widget hanya dinormalisasi jika susunannya lengkap;
+    key lain (atau kelompok yang tidak lengkap) disimpan apa adanya di "state".
+    """
+    form = {key: value for key, value in form_data.items() if key not in TRANSIENT_KEYS}
+    used = set()
+    compact = {}
+    criteria = _compact_criteria(form, used)
+    if criteria is not None:
+        compact["criteria"] = criteria
+        # sub_criteria hanyalah turunan dari daftar kriteria
+        if form.get("sub_criteria") == _sub_criteria(criteria):
+            used.add("sub_criteria")
+    comparisons = _compact_comparisons(form, used)
+    if comparisons:
+        compact["comparisons"] = comparisons
+    profile = _compact_profile(form, used)
+    if profile:
+        compact["profile"] = profile
+    alternatives = _compact_alternatives(form, used)
+    if alternatives is not None:
+        compact["alternatives"] = alternatives
+    compact["state"] = {key: value for key, value in form.items() if key not in used}
+    return compact
+
+def expand_form(compact):
+    form = {}
+    if "criteria" in compact:
+        _expand_criteria(compact["criteria"], form)
+        if "sub_criteria" not in compact.get("state", {}):
+            form["sub_criteria"] = _sub_criteria(compact["criteria"])
+    _expand_comparisons(compact.get("comparisons", {}), form)
+    _expand_profile(compact.get("profile", {}), form)
+    if "alternatives" in compact:
+        _expand_alternatives(compact["alternatives"], form)
+    form.update(compact.get("state", {}))
+    return form
+
+# ----------------- Hasil AHP -----------------
+
+def _input_matrices(compact):
+    comparisons = compact.get("comparisons", {})
+    main = full_matrix(comparisons["main"]) if "main" in comparisons else None
+    return main, {key: full_matrix(rows) for key, rows in comparisons.get("sub", {}).items()}
+
+def _compact_ahp(ahp_results, compact):
+    labels = ahp_results["criteria_labels"]
+    sub_dict = ahp_results["sub_criteria_dict"]
+    input_main, input_subs = _input_matrices(compact)
+
+    # Matriks utama hanya tersimpan di df_main; ambil kembali dari sana
+    main = _frame_matrix(labels, ahp_results["df_main"])
+    ahp = {"weights_main": ahp_results["weights_main"], "sub_results": {}}
+    if list(sub_dict) != labels or sub_dict != _sub_criteria(compact.get("criteria", [])):
+        ahp["criteria"] = [{"name": name, "sub_criteria": sub_dict[name]} for name in labels]
+    matrices = {}
+    if main != input_main:
+        matrices["main"] = main
+    for criteria, matrix in ahp_results["sub_matrices"].items():
+        if matrix != input_subs.get(criteria):
+            matrices.setdefault("sub", {})[criteria] = matrix
+    if matrices:
+        ahp["matrices"] = matrices
+    for criteria, result in ahp_results["sub_results"].items():
+        ahp["sub_results"][criteria] = {key: value for key, value in result.items() if key != "df_sub"}
+    return ahp
+
+def _expand_ahp(ahp, compact):
+    input_main, input_subs = _input_matrices(compact)
+    if "criteria" in ahp:
+        sub_dict = {entry["name"]: entry["sub_criteria"] for entry in ahp["criteria"]}
+    else:
+        # Kriteria hasil AHP sama dengan kriteria di form
+        sub_dict = _sub_criteria(compact["criteria"])
+    labels = list(sub_dict)
+    matrices = ahp.get("matrices", {})
+    main = matrices.get("main", input_main)
+    sub_matrices = {
+        criteria: matrices.get("sub", {}).get(criteria, input_subs.get(criteria))
+        for criteria in ahp["sub_results"]
+    }
+    sub_results = {}
+    for criteria, result in ahp["sub_results"].items():
+        frame = _matrix_frame(sub_dict[criteria], sub_matrices[criteria], result["weights_sub"])
+        sub_results[criteria] = {"df_sub": frame, **result}
+    return {
+        "criteria_labels": labels,
+        "weights_main": ahp["weights_main"],
+        "sub_criteria_dict": sub_dict,
+        "sub_matrices": sub_matrices,
+        "df_main": _matrix_frame(labels, main, ahp["weights_main"]),
+        "sub_results": sub_results,
+    }
+
+# ----------------- Hasil Profile Matching -----------------
+
+# Daftar dict per alternatif -> tabel (nama kolom hanya sekali)
+def _compact_pm(pm_results):
+    columns = list(pm_results[0])
+    if any(list(row) != columns for row in pm_results):
+        return None
+    return {"columns": columns, "data": [list(row.values()) for row in pm_results]}
+
+def _expand_pm(table):
+    return [dict(zip(table["columns"], row)) for row in table["data"]]
+
+# ----------------- Dokumen proyek -----------------
+
+def compact_project(data):
+    """Mengubah dict proyek format lama (versi 1) menjadi format ternormalisasi versi 2.
+
+    Setiap bagian diperiksa dengan mengembangkannya kembali; bagian yang tidak
+    kembali sama persis disimpan dalam bentuk aslinya sehingga konversi tidak
+    pernah kehilangan data.
+    """
+    if data.get("schema_version") == SCHEMA_VERSION:
+        return data
+    form_data = data.get("form_data") or {}
+    doc = {"schema_version": SCHEMA_VERSION}
+    form = compact_form(form_data)
+    if expand_form(form) != {key: value for key, value in form_data.items() if key not in TRANSIENT_KEYS}:
+        form = {"state": {key: value for key, value in form_data.items() if key not in TRANSIENT_KEYS}}
+    doc["form"] = form
+
+    # Hasil AHP di session state berisi array NumPy; bandingkan dalam bentuk tipe bawaan
+    ahp_results = to_builtin(data.get("ahp_results"))
+    doc["ahp_results"] = ahp_results
+    if ahp_results:
+        try:
+            ahp = _compact_ahp(ahp_results, form)
+            if _expand_ahp(ahp, form) == ahp_results:
+                doc["ahp_results"] = {"compact": ahp}
+        except (KeyError, IndexError, TypeError, ZeroDivisionError):
+            pass
+
+    pm_results = data.get("pm_results")
+    doc["pm_results"] = pm_results
+    if pm_results and isinstance(pm_results, list) and all(isinstance(row, dict) for row in pm_results):
+        doc["pm_results"] = _compact_pm(pm_results) or pm_results
+
+    # Key tingkat atas lain (misalnya rujukan sidecar kolom) ikut apa adanya
+    for key, value in data.items():
+        if key not in ("ahp_results", "pm_results", "form_data"):
+            doc.setdefault(key, value)
+    return doc
+
+def expand_project(doc):
+    """Mengembalikan dict proyek dengan bentuk lama (ahp_results, pm_results, form_data)
+    dari dokumen versi 2; dokumen versi 1 dikembalikan apa adanya."""
+    version = doc.get("schema_version")
+    if version is None:
+        return doc
+    if version != SCHEMA_VERSION:
+        raise ValueError(f"Versi format proyek tidak dikenali: {version}")
+    form = doc.get("form", {})
+    ahp_results = doc.get("ahp_results")
+    if isinstance(ahp_results, dict) and "compact" in ahp_results:
+        ahp_results = _expand_ahp(ahp_results["compact"], form)
+    pm_results = doc.get("pm_results")
+    if isinstance(pm_results, dict):
+        pm_results = _expand_pm(pm_results)
+    data = {"ahp_results": ahp_results, "pm_results": pm_results, "form_data": expand_form(form)}
+    for key, value in doc.items():
+        if key not in ("schema_version", "form", "ahp_results", "pm_results"):
+            data[key] = value
+    return data
+
+# Baca file proyek dalam format apa pun dan kembalikan bentuk lama
+def read_project(file_path):
+    with open(file_path, "rb") as file:
+        return expand_project(loads(file.read()))
+
+# Tulis file proyek dalam format versi 2 secara atomik
+def write_project(file_path, data):
+    tmp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(dumps(compact_project(data)))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, file_path)
+
+# Migrasi file-file proyek lama di folder data ke format versi 2
+def migrate_data_dir(data_dir="data"):
+    """Mengonversi semua file .json versi 1 di `data_dir`; mengembalikan {nama: (ukuran lama, ukuran baru)}.
+
+    File yang sudah versi 2 dilewati.
+    """
+    migrated = {}
+    for name in sorted(os.listdir(data_dir)):
+        file_path = os.path.join(data_dir, name)
+        if not name.endswith(".json") or not os.path.isfile(file_path):
+            continue
+        with open(file_path, "rb") as file:
+            data = loads(file.read())
+        if data.get("schema_version") == SCHEMA_VERSION:
+            continue
+        old_size = os.path.getsize(file_path)
+        write_project(file_path, data)
+        migrated[name] = (old_size, os.path.getsize(file_path))
+    return migrated
+
+if __name__ == "__main__":
+    import sys
+
+    for name, (old_size, new_size) in migrate_data_dir(*sys.argv[1:2]).items():
+        print(f"{name}: {old_size} -> {new_size} byte")
@@ -0,0 +1,466 @@
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+
+from columnar_store import open_columnar
+from project_journal import read_project, source_signature
+
+# Lokasi database proyek (di folder data, berdampingan dengan file JSON)
+DB_PATH = os.path.join("data", "projects.sqlite")
+
+# Bagian proyek yang dapat dimuat terpisah
+PARTS = ("ahp_results", "pm_results", "form_data")
+
+# Scope matriks perbandingan kriteria utama (matriks sub-kriteria memakai nama kriteria)
+MAIN_SCOPE = ""
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    saved_at REAL NOT NULL,
+    source_mtime_ns INTEGER,
+    source_size INTEGER,
+    has_ahp INTEGER NOT NULL,
+    has_pm INTEGER NOT NULL,
+    has_df_main INTEGER NOT NULL,
+    pm_columnar TEXT,
+    columnar_rows INTEGER,
+    columnar_top_alternative TEXT,
+    columnar_top_score REAL
+);
+CREATE TABLE IF NOT EXISTS criteria (
+    project_id INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    weight REAL,
+    PRIMARY KEY (project_id, position)
+);
+CREATE TABLE IF NOT EXISTS sub_criteria (
+    project_id INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    criteria TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    weight REAL,
+    PRIMARY KEY (project_id, criteria, position)
+);
+CREATE TABLE IF NOT EXISTS consistency (
+    project_id INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    scope TEXT NOT NULL,
+    lambda_max REAL,
+    ci REAL,
+    cr REAL,
+    ri REAL,
+    matrix_hash TEXT,
+    PRIMARY KEY (project_id, scope)
+);
+CREATE TABLE IF NOT EXISTS matrix_cells (
+    project_id INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    scope TEXT NOT NULL,
+    row INTEGER NOT NULL,
+    col INTEGER NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (project_id, scope, row, col)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS alternatives (
+    project_id INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    ordinal INTEGER NOT NULL,
+    PRIMARY KEY (project_id, position)
+);
+CREATE TABLE IF NOT EXISTS alternative_values (
+    project_id INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    alternative TEXT NOT NULL,
+    sub_criteria TEXT NOT NULL,
+    value,
+    ordinal INTEGER NOT NULL,
+    PRIMARY KEY (project_id, alternative, sub_criteria)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS results (
+    project_id INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    alternative TEXT,
+    final_score REAL,
+    ranking INTEGER,
+    PRIMARY KEY (project_id, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS results_by_alternative ON results (alternative, project_id);
+CREATE INDEX IF NOT EXISTS results_by_ranking ON results (ranking, project_id);
+CREATE TABLE IF NOT EXISTS result_columns (
+    project_id INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    column_position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    PRIMARY KEY (project_id, column_position)
+);
+CREATE TABLE IF NOT EXISTS result_values (
+    project_id INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    column_position INTEGER NOT NULL,
+    value,
+    PRIMARY KEY (project_id, position, column_position)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS form_values (
+    project_id INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    ordinal INTEGER NOT NULL,
+    PRIMARY KEY (project_id, key)
+) WITHOUT ROWID;
+"""
+
+# Versi skema (PRAGMA user_version); database versi lain dibuat ulang karena isinya bisa diimpor lagi dari file JSON
+SCHEMA_VERSION = 3
+
+# Kolom hasil perangkingan yang disimpan di tabel results, bukan result_values
+RESULT_COLUMNS = ("Alternatif", "Final Score", "Ranking")
+
+# Database yang skemanya sudah dibuat pada proses ini
+_initialized = set()
+
+# Hapus semua tabel dan indeks (skema lama)
+def _drop_tables(conn):
+    tables = [name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'")]
+    with conn:
+        conn.execute("PRAGMA foreign_keys = OFF")
+        for name in tables:
+            conn.execute(f'DROP TABLE IF EXISTS "{name}"')
+    conn.execute("PRAGMA foreign_keys = ON")
+
+# Buka koneksi database dan pastikan skemanya ada
+def connect(db_path=None):
+    db_path = db_path or DB_PATH
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.execute("PRAGMA foreign_keys = ON")
+    if db_path not in _initialized or not os.path.exists(db_path):
+        conn.execute("PRAGMA journal_mode = WAL")
+        if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            _drop_tables(conn)
+        conn.executescript(SCHEMA)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        _initialized.add(db_path)
+    return conn
+
+# Nilai sederhana yang bisa disimpan apa adanya di kolom tanpa tipe
+def _is_scalar(value):
+    return isinstance(value, (int, float, str)) and not isinstance(value, bool)
+
+# ----------------- Simpan -----------------
+
+def _insert_ahp(conn, project_id, ahp_results):
+    labels = list(ahp_results.get("criteria_labels", []))
+    weights_main = list(ahp_results.get("weights_main", []))
+    conn.executemany(
+        "INSERT INTO criteria VALUES (?, ?, ?, ?)",
+        [(project_id, i, label, float(weights_main[i]) if i < len(weights_main) else None) for i, label in enumerate(labels)],
+    )
+
+    sub_results = ahp_results.get("sub_results", {})
+    for criteria, subs in ahp_results.get("sub_criteria_dict", {}).items():
+        weights_sub = list(sub_results.get(criteria, {}).get("weights_sub", []))
+        conn.executemany(
+            "INSERT INTO sub_criteria VALUES (?, ?, ?, ?, ?)",
+            [(project_id, criteria, i, sub, float(weights_sub[i]) if i < len(weights_sub) else None) for i, sub in enumerate(subs)],
+        )
+
+    # Matriks utama diambil dari df_main ({kolom: {baris: nilai}}), matriks sub dari sub_matrices
+    cells = []
+    df_main = ahp_results.get("df_main")
+    if df_main:
+        for j, column in enumerate(labels):
+            for i, row in enumerate(labels):
+                cells.append((project_id, MAIN_SCOPE, i, j, float(df_main[column][row])))
+    for criteria, matrix in ahp_results.get("sub_matrices", {}).items():
+        for i, row in enumerate(matrix):
+            for j, value in enumerate(row):
+                cells.append((project_id, criteria, i, j, float(value)))
+    conn.executemany("INSERT INTO matrix_cells VALUES (?, ?, ?, ?, ?)", cells)
+
+    conn.executemany(
+        "INSERT INTO consistency VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [
+            (project_id, criteria, result.get("lambda_max_sub"), result.get("CI_sub"), result.get("CR_sub"),
+             result.get("RI_sub"), result.get("matrix_hash"))
+            for criteria, result in sub_results.items()
+        ],
+    )
+
+def _insert_pm(conn, project_id, pm_results):
+    columns, results, values = {}, [], []
+    for position, row in enumerate(pm_results):
+        results.append((project_id, position, row.get("Alternatif"), row.get("Final Score"), row.get("Ranking")))
+        for key, value in row.items():
+            if key not in RESULT_COLUMNS:
+                values.append((project_id, position, columns.setdefault(key, len(columns)), value))
+    conn.executemany("INSERT INTO results VALUES (?, ?, ?, ?, ?)", results)
+    conn.executemany("INSERT INTO result_columns VALUES (?, ?, ?)", [(project_id, c, key) for key, c in columns.items()])
+    conn.executemany("INSERT INTO result_values VALUES (?, ?, ?, ?)", values)
+
+# Pisahkan nama dan nilai alternatif dari widget form; sisanya disimpan sebagai JSON per key.
+# Setiap key membawa urutan aslinya (ordinal) agar form_data dimuat dengan urutan key yang sama
+def _insert_form(conn, project_id, form_data, ahp_results):
+    form_data = dict(form_data)
+    ordinals = {key: i for i, key in enumerate(form_data)}
+    keys = list((ahp_results or {}).get("criteria_labels", []))
+    for subs in (ahp_results or {}).get("sub_criteria_dict", {}).values():
+        keys.extend(subs)
+
+    alternatives, values = [], {}
+    num_alternatives = form_data.get("num_alternatives", 0)
+    for i in range(num_alternatives if isinstance(num_alternatives, int) else 0):
+        name = form_data.get(f"alt_name_{i}")
+        if not isinstance(name, str):
+            continue
+        alternatives.append((project_id, i, form_data.pop(f"alt_name_{i}"), ordinals[f"alt_name_{i}"]))
+        for key in keys:
+            widget_key = f"value_{name}_{key}"
+            if widget_key in form_data and _is_scalar(form_data[widget_key]):
+                values[(name, key)] = (form_data.pop(widget_key), ordinals[widget_key])
+
+    conn.executemany("INSERT INTO alternatives VALUES (?, ?, ?, ?)", alternatives)
+    conn.executemany(
+        "INSERT INTO alternative_values VALUES (?, ?, ?, ?, ?)",
+        [(project_id, name, key, value, ordinal) for (name, key), (value, ordinal) in values.items()],
+    )
+    conn.executemany(
+        "INSERT INTO form_values VALUES (?, ?, ?, ?)",
+        [(project_id, key, json.dumps(value), ordinals[key]) for key, value in form_data.items()],
+    )
+
+# Jumlah baris dan peringkat pertama hasil perangkingan di sidecar kolom (dibaca lewat memory mapping)
+def _columnar_summary(reference, source_path):
+    table = open_columnar(os.path.join(os.path.dirname(source_path), reference["path"])) if source_path else None
+    if table is None:
+        return reference.get("rows"), None, None
+    top = table.top()
+    return len(table), top and top.get("Alternatif"), top and top.get("Final Score")
+
+# Fungsi utama untuk menyimpan satu proyek (menggantikan versi lama dengan nama sama)
+def save_project(name, data, source_path=None, db_path=None):
+    """Menyimpan dict proyek (format file JSON) ke database dalam satu transaksi.
+
+    Jika `source_path` diberikan, mtime dan ukuran file (beserta jurnalnya) dicatat
+    agar file yang tidak berubah tidak perlu di-parse ulang oleh sync_json_file.
+    Untuk proyek dengan sidecar kolom (`pm_columnar`) hanya rujukan, jumlah baris
+    dan peringkat pertamanya yang disimpan; baris hasil tetap dibaca dari sidecar.
+    """
+    signature = source_signature(source_path) if source_path else None
+    ahp_results = data.get("ahp_results")
+    pm_results = data.get("pm_results")
+    reference = data.get("pm_columnar")
+    columnar = _columnar_summary(reference, source_path) if reference else (None, None, None)
+    with closing(connect(db_path)) as conn, conn:
+        conn.execute("DELETE FROM projects WHERE name = ?", (name,))
+        cursor = conn.execute(
+            """
+            INSERT INTO projects (name, saved_at, source_mtime_ns, source_size, has_ahp, has_pm, has_df_main,
+                                  pm_columnar, columnar_rows, columnar_top_alternative, columnar_top_score)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                name, time.time(),
+                *(signature or (None, None)),
+                ahp_results is not None, pm_results is not None, bool(ahp_results and ahp_results.get("df_main")),
+                json.dumps(reference) if reference else None, *columnar,
+            ),
+        )
+        project_id = cursor.lastrowid
+        if ahp_results:
+            _insert_ahp(conn, project_id, ahp_results)
+        if pm_results:
+            _insert_pm(conn, project_id, pm_results)
+        _insert_form(conn, project_id, data.get("form_data", {}), ahp_results)
+    return project_id
+
+# ----------------- Muat -----------------
+
+def _matrix(conn, project_id, scope, size):
+    matrix = [[None] * size for _ in range(size)]
+    for row, col, value in conn.execute(
+        "SELECT row, col, value FROM matrix_cells WHERE project_id = ? AND scope = ?", (project_id, scope)
+    ):
+        matrix[row][col] = value
+    return matrix
+
+# Susun DataFrame AHP dalam bentuk dict {kolom: {baris: nilai}} beserta kolom Weight
+def _frame_dict(labels, matrix, weights):
+    frame = {column: {row: matrix[i][j] for i, row in enumerate(labels)} for j, column in enumerate(labels)}
+    frame["Weight"] = dict(zip(labels, weights))
+    return frame
+
+def _load_ahp(conn, project_id, has_df_main):
+    criteria = conn.execute(
+        "SELECT name, weight FROM criteria WHERE project_id = ? ORDER BY position", (project_id,)
+    ).fetchall()
+    labels = [name for name, _ in criteria]
+    weights_main = [weight for _, weight in criteria]
+
+    sub_criteria, sub_weights = {}, {}
+    for criteria_name, name, weight in conn.execute(
+        "SELECT criteria, name, weight FROM sub_criteria WHERE project_id = ? ORDER BY rowid", (project_id,)
+    ):
+        sub_criteria.setdefault(criteria_name, []).append(name)
+        sub_weights.setdefault(criteria_name, []).append(weight)
+
+    sub_matrices = {criteria_name: _matrix(conn, project_id, criteria_name, len(subs)) for criteria_name, subs in sub_criteria.items()}
+    ahp_results = {
+        "criteria_labels": labels,
+        "weights_main": weights_main,
+        "sub_criteria_dict": sub_criteria,
+        "sub_matrices": sub_matrices,
+    }
+    if has_df_main:
+        ahp_results["df_main"] = _frame_dict(labels, _matrix(conn, project_id, MAIN_SCOPE, len(labels)), weights_main)
+
+    consistency = conn.execute(
+        "SELECT scope, lambda_max, ci, cr, ri, matrix_hash FROM consistency WHERE project_id = ? ORDER BY rowid", (project_id,)
+    ).fetchall()
+    if consistency:
+        sub_results = {}
+        for scope, lambda_max, ci, cr, ri, matrix_hash in consistency:
+            subs = sub_criteria.get(scope, [])
+            sub_results[scope] = {
+                "df_sub": _frame_dict(subs, sub_matrices.get(scope, []), sub_weights.get(scope, [])),
+                "weights_sub": sub_weights.get(scope, []),
+                "lambda_max_sub": lambda_max,
+                "CI_sub": ci,
+                "CR_sub": cr,
+                "RI_sub": ri,
+            }
+            if matrix_hash is not None:
+                sub_results[scope]["matrix_hash"] = matrix_hash
+        ahp_results["sub_results"] = sub_results
+    return ahp_results
+
+def _load_pm(conn, project_id):
+    names = [name for name, in conn.execute(
+        "SELECT name FROM result_columns WHERE project_id = ? ORDER BY column_position", (project_id,)
+    )]
+    results = conn.execute(
+        "SELECT alternative, final_score, ranking FROM results WHERE project_id = ? ORDER BY position", (project_id,)
+    ).fetchall()
+    rows = [{"Alternatif": alternative} for alternative, _, _ in results]
+    for position, column, value in conn.execute(
+        "SELECT position, column_position, value FROM result_values WHERE project_id = ? ORDER BY position, column_position", (project_id,)
+    ):
+        rows[position][names[column]] = value
+    for row, (_, final_score, ranking) in zip(rows, results):
+        row["Final Score"] = final_score
+        row["Ranking"] = ranking
+    return rows
+
+def _load_form(conn, project_id):
+    entries = [(ordinal, key, json.loads(value)) for key, value, ordinal in conn.execute(
+        "SELECT key, value, ordinal FROM form_values WHERE project_id = ?", (project_id,)
+    )]
+    for position, name, ordinal in conn.execute(
+        "SELECT position, name, ordinal FROM alternatives WHERE project_id = ?", (project_id,)
+    ):
+        entries.append((ordinal, f"alt_name_{position}", name))
+    for alternative, key, value, ordinal in conn.execute(
+        "SELECT alternative, sub_criteria, value, ordinal FROM alternative_values WHERE project_id = ?", (project_id,)
+    ):
+        entries.append((ordinal, f"value_{alternative}_{key}", value))
+    # Susun kembali dengan urutan key seperti pada file JSON
+    entries.sort(key=lambda entry: entry[0])
+    return {key: value for _, key, value in entries}
+
+# Fungsi utama untuk memuat proyek, seluruhnya atau sebagian
+def load_project(name, parts=PARTS, db_path=None):
+    """Memuat proyek dalam format yang sama dengan file JSON.
+
+    Hanya bagian di `parts` yang dibaca dari database, misalnya
+    `parts=("pm_results",)` untuk menampilkan hasil perangkingan saja.
+    Mengembalikan None jika proyek tidak ada.
+    """
+    unknown = set(parts) - set(PARTS)
+    if unknown:
+        raise ValueError(f"Bagian proyek tidak dikenal: {sorted(unknown)}. Pilih dari {PARTS}.")
+    with closing(connect(db_path)) as conn:
+        row = conn.execute(
+            "SELECT id, has_ahp, has_pm, has_df_main, pm_columnar FROM projects WHERE name = ?", (name,)
+        ).fetchone()
+        if row is None:
+            return None
+        project_id, has_ahp, has_pm, has_df_main, pm_columnar = row
+        data = {}
+        if "ahp_results" in parts:
+            data["ahp_results"] = _load_ahp(conn, project_id, has_df_main) if has_ahp else None
+        if "pm_results" in parts:
+            data["pm_results"] = _load_pm(conn, project_id) if has_pm else None
+            if pm_columnar:
+                # Baris hasil ada di sidecar kolom; buka dengan columnar_store.attach_columnar
+                data["pm_columnar"] = json.loads(pm_columnar)
+        if "form_data" in parts:
+            data["form_data"] = _load_form(conn, project_id)
+        return data
+
+def delete_project(name, db_path=None):
+    with closing(connect(db_path)) as conn, conn:
+        return conn.execute("DELETE FROM projects WHERE name = ?", (name,)).rowcount > 0
+
+# ----------------- Sinkronisasi dengan file JSON -----------------
+
+# Impor ulang file JSON ke database hanya jika file berubah sejak terakhir diimpor
+def sync_json_file(file_name, data_dir="data", db_path=None):
+    """Memastikan proyek `file_name` di database sama dengan file JSON-nya.
+
+    Mengembalikan True jika file di-parse dan diimpor ulang, False jika
+    database sudah sesuai. File yang tidak ada dihapus dari database.
+    """
+    file_path = os.path.join(data_dir, file_name)
+    if not os.path.exists(file_path):
+        delete_project(file_name, db_path)
+        return False
+    # Proyek yang disimpan bertahap berubah lewat jurnalnya, jadi bandingkan snapshot beserta jurnal
+    signature = source_signature(file_path)
+    with closing(connect(db_path)) as conn:
+        row = conn.execute(
+            "SELECT source_mtime_ns, source_size FROM projects WHERE name = ?", (file_name,)
+        ).fetchone()
+    if row == signature:
+        return False
+    # Hasil perangkingan di sidecar kolom tidak diimpor; database hanya menyimpan rujukan dan ringkasannya
+    data = read_project(file_path)
+    save_project(file_name, data, source_path=file_path, db_path=db_path)
+    return True
+
+# Muat sebagian proyek dari file di folder data lewat database
+def load_parts(file_name, parts=PARTS, data_dir="data", db_path=None):
+    sync_json_file(file_name, data_dir, db_path)
+    return load_project(file_name, parts, db_path)
+
+# ----------------- Kueri lintas proyek -----------------
+
+def list_projects(db_path=None):
+    """Ringkasan semua proyek tanpa membaca file JSON: jumlah kriteria, alternatif dan peringkat pertama."""
+    with closing(connect(db_path)) as conn:
+        rows = conn.execute(
+            """
+            SELECT p.name, p.saved_at,
+                   (SELECT COUNT(*) FROM criteria c WHERE c.project_id = p.id),
+                   COALESCE(p.columnar_rows, (SELECT COUNT(*) FROM results r WHERE r.project_id = p.id)),
+                   COALESCE(best.alternative, p.columnar_top_alternative), COALESCE(best.final_score, p.columnar_top_score)
+            FROM projects p
+            LEFT JOIN results best ON best.project_id = p.id AND best.ranking = 1
+            ORDER BY p.name
+            """
+        ).fetchall()
+    columns = ("name", "saved_at", "num_criteria", "num_results", "best_alternative", "best_score")
+    return [dict(zip(columns, row)) for row in rows]
+
+def alternative_rankings(alternative, db_path=None):
+    """Peringkat dan Final Score satu alternatif di setiap proyek (proyek dengan sidecar kolom tidak termasuk)."""
+    with closing(connect(db_path)) as conn:
+        rows = conn.execute(
+            """
+            SELECT p.name, r.ranking, r.final_score
+            FROM results r JOIN projects p ON p.id = r.project_id
+            WHERE r.alternative = ?
+            ORDER BY p.name
+            """,
+            (alternative,),
+        ).fetchall()
+    return [{"name": name, "ranking": ranking, "final_score": final_score} for name, ranking, final_score in rows]
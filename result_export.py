@@ -0,0 +1,122 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from columnar_store import ColumnarTable
+
+# Folder hasil ekspor (di luar data/ agar tidak tercampur dengan file proyek)
+EXPORT_DIR = "exports"
+
+# Key session_state: token folder ekspor milik sesi dan handle job ekspor sesi per path
+EXPORT_SESSION_KEY = "export_session"
+EXPORT_JOBS_KEY = "export_jobs"
+
+# Jumlah baris yang diubah ke DataFrame dan ditulis sekaligus
+EXPORT_CHUNK_ROWS = 50_000
+
+# Ekspor berjalan di thread latar agar skrip Streamlit tidak menunggu
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="pm_export")
+
+# Penulis hasil bertahap ke CSV atau Parquet
+def block_writer(output_path):
+    """Mengembalikan (write(frame), close()) untuk menulis DataFrame per potongan ke `output_path`.
+
+    Format dipilih dari ekstensi (.csv atau .parquet); menulis Parquet memerlukan pyarrow.
+    """
+    extension = os.path.splitext(output_path)[1].lower()
+    if extension == ".csv":
+        first = [True]
+        def write(frame):
+            frame.to_csv(output_path, mode="w" if first[0] else "a", header=first[0], index=False)
+            first[0] = False
+        return write, lambda: None
+    if extension in (".parquet", ".pq"):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Menulis file Parquet memerlukan paket 'pyarrow'.") from e
+        writer = [None]
+        def write(frame):
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if writer[0] is None:
+                writer[0] = pq.ParquetWriter(output_path, table.schema)
+            writer[0].write_table(table)
+        return write, lambda: writer[0] is not None and writer[0].close()
+    raise ValueError(f"Format file '{extension}' tidak didukung. Gunakan .csv atau .parquet.")
+
+# Potong hasil perangkingan menjadi DataFrame kecil tanpa membangun satu DataFrame besar
+def iter_result_chunks(pm_results, chunksize=EXPORT_CHUNK_ROWS):
+    """Generator DataFrame per potongan dari list dict, DataFrame atau ColumnarTable.
+
+    Setiap baris berisi nama alternatif, bobot GAP per sub-kriteria, skor per
+    kriteria, Final Score dan Ranking seperti hasil perhitungan.
+    """
+    for start in range(0, len(pm_results), chunksize):
+        stop = start + chunksize
+        if isinstance(pm_results, ColumnarTable):
+            yield pm_results.to_frame(start, stop)
+        elif isinstance(pm_results, pd.DataFrame):
+            yield pm_results.iloc[start:stop]
+        else:
+            yield pd.DataFrame.from_records(pm_results[start:stop])
+
+def export_results(pm_results, output_path, chunksize=EXPORT_CHUNK_ROWS, progress=None):
+    """Menulis hasil perangkingan ke `output_path` (.csv/.parquet) per potongan; mengembalikan jumlah baris.
+
+    File ditulis dengan nama sementara lalu diganti sekaligus, sehingga file
+    tujuan tidak pernah berisi ekspor setengah jadi. `progress(rows)` dipanggil
+    setelah setiap potongan.
+    """
+    root, extension = os.path.splitext(output_path)
+    tmp_path = f"{root}.part{extension}"
+    write, close = block_writer(tmp_path)
+    rows = 0
+    try:
+        try:
+            for chunk in iter_result_chunks(pm_results, chunksize):
+                write(chunk)
+                rows += len(chunk)
+                if progress is not None:
+                    progress(rows)
+            if rows == 0:
+                write(pd.DataFrame(columns=["Alternatif", "Final Score", "Ranking"]))
+        finally:
+            close()
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return rows
+
+# ----------------- Ekspor latar -----------------
+
+# Path ekspor di folder milik satu sesi, agar file dan status ekspor tidak tercampur antar pengguna
+def session_export_path(session_token, file_name):
+    return os.path.join(EXPORT_DIR, session_token, os.path.basename(file_name))
+
+def start_export(pm_results, output_path, chunksize=EXPORT_CHUNK_ROWS):
+    """Menjadwalkan export_results di thread latar dan langsung mengembalikan handle job.
+
+    Handle disimpan oleh pemanggil (misalnya di session_state) dan dibaca lewat export_status.
+    """
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    job = {"path": output_path, "rows": 0, "total": len(pm_results)}
+    def progress(rows):
+        job["rows"] = rows
+    job["future"] = _executor.submit(export_results, pm_results, output_path, chunksize, progress)
+    return job
+
+def export_status(job):
+    """Status handle dari start_export: None jika belum ada job, selain itu dict
+    berisi state ("running", "done" atau "failed"), rows, total dan error."""
+    if job is None:
+        return None
+    future = job["future"]
+    status = {"state": "running", "rows": job["rows"], "total": job["total"], "error": None}
+    if future.done():
+        error = future.exception()
+        status.update(state="failed" if error else "done", error=error)
+    return status
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from columnar_store import NAME_COLUMN, RANK_COLUMN, ColumnarTable
+
+# Pilihan jumlah baris per halaman tabel hasil perangkingan
+PAGE_SIZES = (25, 50, 100, 250)
+
+# Nama kolom hasil perangkingan (list dict, DataFrame atau ColumnarTable)
+def result_columns(pm_results):
+    if isinstance(pm_results, (ColumnarTable, pd.DataFrame)):
+        return list(pm_results.columns)
+    return list(pm_results[0]) if len(pm_results) else []
+
+# Satu kolom utuh sebagai array; untuk ColumnarTable kolom numerik berupa view ke file
+def _column(pm_results, key):
+    if isinstance(pm_results, ColumnarTable):
+        return pm_results.column(key)
+    if isinstance(pm_results, pd.DataFrame):
+        return pm_results[key].to_numpy()
+    return np.array([row.get(key) for row in pm_results], dtype=object if key == NAME_COLUMN else float)
+
+def result_order(pm_results, sort_by=None, descending=False, query=""):
+    """Posisi baris hasil perangkingan yang cocok dengan `query` (bagian nama alternatif,
+    tanpa membedakan huruf besar/kecil), diurutkan menurut kolom `sort_by`.
+
+    Hanya kolom nama (jika difilter) dan kolom urutan yang dibaca utuh.
+    """
+    rows = np.arange(len(pm_results))
+    if query:
+        names = pd.Series(_column(pm_results, NAME_COLUMN), dtype=object).astype(str)
+        rows = rows[names.str.contains(query, case=False, regex=False).to_numpy(dtype=bool)]
+    if sort_by:
+        values = pd.Series(_column(pm_results, sort_by)[rows])
+        order = values.sort_values(ascending=not descending, kind="stable", na_position="last").index.to_numpy()
+        rows = rows[order]
+    return rows
+
+def result_rows(pm_results, rows):
+    """DataFrame berisi baris pada posisi `rows` saja, dengan urutan kolom seperti hasil perangkingan."""
+    if isinstance(pm_results, ColumnarTable):
+        return pm_results.take(rows)
+    if isinstance(pm_results, pd.DataFrame):
+        return pm_results.iloc[rows].reset_index(drop=True)
+    return pd.DataFrame.from_records([pm_results[row] for row in rows.tolist()], columns=result_columns(pm_results))
+
+# Tabel hasil perangkingan berhalaman; mengganti halaman atau urutan hanya menjalankan ulang tabel ini
+@st.fragment
+def result_table(pm_results, key, decimals=3):
+    """Menampilkan hasil perangkingan per halaman dengan pencarian nama dan pengurutan kolom.
+
+    Filter, urutan dan pemotongan halaman dihitung di server; hanya baris
+    pada halaman aktif yang dikirim ke browser. `key` menjadi awalan key widget.
+    """
+    columns = result_columns(pm_results)
+    col1, col2, col3, col4 = st.columns([2, 2, 1, 1])
+    with col1:
+        query = st.text_input("Cari Alternatif", key=f"{key}_query")
+    with col2:
+        sort_by = st.selectbox(
+            "Urutkan Berdasarkan",
+            columns,
+            index=columns.index(RANK_COLUMN) if RANK_COLUMN in columns else 0,
+            key=f"{key}_sort_by"
+        )
+    with col3:
+        descending = st.checkbox("Urutan Menurun", key=f"{key}_descending")
+    with col4:
+        page_size = st.selectbox("Baris per Halaman", PAGE_SIZES, key=f"{key}_page_size")
+
+    rows = result_order(pm_results, sort_by, descending, query.strip())
+    pages = max(1, -(-len(rows) // page_size))
+    page = min(st.number_input(f"Halaman (dari {pages})", min_value=1, step=1, key=f"{key}_page"), pages)
+
+    start = (page - 1) * page_size
+    window = rows[start:start + page_size]
+    st.dataframe(result_rows(pm_results, window).round(decimals), hide_index=True)
+    if len(rows):
+        caption = f"Baris {start + 1}-{start + len(window)} dari {len(rows)} alternatif"
+        st.caption(caption if len(rows) == len(pm_results) else f"{caption} (difilter dari {len(pm_results)})")
+    else:
+        st.caption("Tidak ada alternatif yang cocok.")
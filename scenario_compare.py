@@ -0,0 +1,203 @@
+import multiprocessing as mp
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from columnar_store import ColumnarTable, attach_columnar, pm_frame
+from project_journal import read_project, source_signature
+
+# Proyek yang sudah diurai, per path: (signature, Scenario); dipakai ulang selama file tidak berubah
+_lock = threading.Lock()
+_cache = {}
+
+# Ukuran total file (byte) minimal agar penguraian dipindah ke proses worker; di bawahnya
+# memulai worker (impor numpy/pandas) jauh lebih lama daripada mengurai file di thread pemanggil
+PARALLEL_MIN_BYTES = 32 * 1024 * 1024
+
+# Pool proses dibuat sekali saat pertama dibutuhkan lalu dipakai ulang oleh setiap perbandingan
+_pool = None
+
+# Ringkasan satu proyek tersimpan yang cukup untuk perbandingan
+@dataclass(frozen=True)
+class Scenario:
+    """Bobot AHP dan hasil perangkingan satu file proyek.
+
+    `criteria_weights` dan `sub_weights` berupa Series berindeks nama kriteria /
+    sub-kriteria; bobot sub-kriteria adalah bobot global (bobot lokal x bobot
+    kriteria). `results` berindeks nama alternatif dengan kolom skor per
+    kriteria, Final Score dan Ranking.
+    """
+    name: str
+    criteria_weights: pd.Series
+    sub_weights: pd.Series
+    results: pd.DataFrame
+
+# Bentuk Scenario dari dict proyek (bentuk lama)
+def scenario_from_data(name, data):
+    ahp_results = data.get("ahp_results") or {}
+    criteria = list(ahp_results.get("criteria_labels") or [])
+    weights_main = np.asarray(ahp_results.get("weights_main", []), dtype=float)
+    criteria_weights = pd.Series(weights_main[:len(criteria)], index=criteria[:len(weights_main)], dtype=float)
+
+    sub_criteria_dict = ahp_results.get("sub_criteria_dict") or {}
+    sub_results = ahp_results.get("sub_results") or {}
+    sub_labels, sub_values = [], []
+    for criteria_name, subs in sub_criteria_dict.items():
+        local = sub_results.get(criteria_name, {}).get("weights_sub")
+        if local is None or criteria_name not in criteria_weights.index:
+            continue
+        local = np.asarray(local, dtype=float)[:len(subs)]
+        sub_labels.extend(subs[:len(local)])
+        sub_values.append(local * criteria_weights[criteria_name])
+    sub_weights = pd.Series(np.concatenate(sub_values) if sub_values else [], index=sub_labels, dtype=float)
+
+    pm_results = data.get("pm_results")
+    columns = [column for column in criteria if column] + ["Final Score", "Ranking"]
+    if isinstance(pm_results, ColumnarTable):
+        # Sidecar kolom: ambil hanya kolom yang dibandingkan, tanpa bobot GAP
+        present = [column for column in columns if column in pm_results.columns]
+        frame = pd.DataFrame({column: pm_results.column(column) for column in ["Alternatif"] + present})
+    elif pm_results:
+        frame = pm_frame(pm_results)
+    else:
+        frame = pd.DataFrame(columns=["Alternatif"] + columns)
+    present = [column for column in columns if column in frame.columns]
+    results = frame.drop_duplicates("Alternatif").set_index("Alternatif")[present].astype(float)
+    return Scenario(name, criteria_weights, sub_weights, results)
+
+# Baca dan urai satu file; dijalankan di proses worker
+def _load_scenario(file_path):
+    data = read_project(file_path)
+    attach_columnar(data, file_path)
+    return scenario_from_data(os.path.basename(file_path), data)
+
+# Pool proses bersama; worker dibuat dengan "spawn" karena fork dari server Streamlit yang multithread bisa deadlock
+def _process_pool():
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1, mp_context=mp.get_context("spawn"))
+        return _pool
+
+def _reset_pool():
+    global _pool
+    with _lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+def load_scenarios(file_names, data_dir="data", min_parallel_bytes=PARALLEL_MIN_BYTES):
+    """Memuat beberapa proyek tersimpan sebagai Scenario (urutan sama dengan `file_names`).
+
+    File yang belum ada di cache atau berubah sejak terakhir diurai dibaca
+    di thread pemanggil, atau paralel di pool proses bersama jika ada lebih
+    dari satu file dan ukuran totalnya minimal `min_parallel_bytes`; sisanya
+    diambil dari cache.
+    """
+    paths = [os.path.join(data_dir, name) for name in file_names]
+    signatures = {path: source_signature(path) for path in paths}
+    missing = [path for path in paths if signatures[path] is None]
+    if missing:
+        raise FileNotFoundError(f"File proyek tidak ditemukan: {', '.join(os.path.basename(path) for path in missing)}")
+
+    with _lock:
+        stale = [path for path in dict.fromkeys(paths) if _cache.get(path, (None,))[0] != signatures[path]]
+    if stale:
+        if len(stale) > 1 and sum(signatures[path][1] for path in stale) >= min_parallel_bytes:
+            try:
+                loaded = list(_process_pool().map(_load_scenario, stale))
+            except BrokenProcessPool:
+                # Worker mati (misalnya kehabisan memori): buang pool agar dibuat ulang, lalu urai di thread ini
+                _reset_pool()
+                loaded = [_load_scenario(path) for path in stale]
+        else:
+            loaded = [_load_scenario(path) for path in stale]
+        with _lock:
+            _cache.update({path: (signatures[path], scenario) for path, scenario in zip(stale, loaded)})
+
+    with _lock:
+        return [_cache[path][1] for path in paths]
+
+# Susun satu nilai dari setiap skenario menjadi tabel (baris = label gabungan, kolom = skenario)
+def _aligned(series, labels):
+    frame = pd.concat(series, axis=1, join="outer", sort=False)
+    frame.columns = labels
+    return frame
+
+def compare_scenarios(scenarios, baseline=0):
+    """Membandingkan beberapa Scenario terhadap skenario acuan `baseline` (indeks).
+
+    Alternatif dan kriteria disejajarkan berdasarkan nama (gabungan semua
+    skenario; kosong/NaN jika tidak ada di suatu skenario). Mengembalikan dict
+    DataFrame: ranking, rank_shift (positif = turun peringkat), score,
+    score_delta, criteria_weights, criteria_weight_delta, sub_weights,
+    sub_weight_delta dan summary per skenario.
+    """
+    if not scenarios:
+        raise ValueError("Minimal satu skenario diperlukan untuk perbandingan.")
+    labels = [scenario.name for scenario in scenarios]
+    if len(set(labels)) != len(labels):
+        raise ValueError("Nama skenario harus unik.")
+
+    ranking = _aligned([scenario.results.get("Ranking", pd.Series(dtype=float)) for scenario in scenarios], labels)
+    score = _aligned([scenario.results.get("Final Score", pd.Series(dtype=float)) for scenario in scenarios], labels)
+    criteria_weights = _aligned([scenario.criteria_weights for scenario in scenarios], labels)
+    sub_weights = _aligned([scenario.sub_weights for scenario in scenarios], labels)
+
+    # Selisih terhadap acuan dihitung sekaligus untuk seluruh matriks
+    def delta(frame):
+        values = frame.to_numpy(dtype=float)
+        return pd.DataFrame(values - values[:, [baseline]], index=frame.index, columns=frame.columns)
+
+    rank_shift = delta(ranking)
+    score_delta = delta(score)
+
+    # Korelasi Spearman terhadap acuan, hanya pada alternatif yang ada di kedua skenario
+    ranks = ranking.to_numpy(dtype=float)
+    base = ranks[:, [baseline]]
+    common = ~np.isnan(ranks) & ~np.isnan(base)
+    within = np.where(common, ranks, np.nan)
+    base_within = np.where(common, base, np.nan)
+    # Peringkat ulang di dalam irisan agar korelasinya benar meskipun ada alternatif yang hilang
+    rank_a = pd.DataFrame(within).rank().to_numpy()
+    rank_b = pd.DataFrame(base_within).rank().to_numpy()
+    # Skenario tanpa alternatif yang sama dengan acuan: rata-rata kolom NaN, Spearman ikut NaN
+    has_common = common.any(axis=0)
+    mean_a = np.divide(np.nansum(rank_a, axis=0), common.sum(axis=0), out=np.full(len(labels), np.nan), where=has_common)
+    mean_b = np.divide(np.nansum(rank_b, axis=0), common.sum(axis=0), out=np.full(len(labels), np.nan), where=has_common)
+    centered_a = rank_a - mean_a
+    centered_b = rank_b - mean_b
+    with np.errstate(invalid="ignore", divide="ignore"):
+        spearman = np.nansum(centered_a * centered_b, axis=0) / np.sqrt(
+            np.nansum(centered_a ** 2, axis=0) * np.nansum(centered_b ** 2, axis=0)
+        )
+
+    shifts = np.abs(rank_shift.to_numpy())
+    filled = np.where(np.isnan(ranks), np.inf, ranks)
+    first = filled.argmin(axis=0) if len(ranking) else np.zeros(len(labels), dtype=int)
+    top = [ranking.index[row] if len(ranking) and np.isfinite(filled[row, j]) else None for j, row in enumerate(first)]
+    summary = pd.DataFrame({
+        "Alternatif": ranking.notna().sum().to_numpy(),
+        "Sama dengan Acuan": common.sum(axis=0),
+        "Peringkat 1": top,
+        "Spearman": spearman,
+        "Pergeseran Maks": np.nanmax(np.where(common, shifts, np.nan), axis=0, initial=0.0),
+        "Pergeseran Rata-rata": np.divide(np.nansum(np.where(common, shifts, 0.0), axis=0), np.maximum(common.sum(axis=0), 1)),
+    }, index=labels)
+
+    return {
+        "ranking": ranking,
+        "rank_shift": rank_shift,
+        "score": score,
+        "score_delta": score_delta,
+        "criteria_weights": criteria_weights,
+        "criteria_weight_delta": delta(criteria_weights),
+        "sub_weights": sub_weights,
+        "sub_weight_delta": delta(sub_weights),
+        "summary": summary,
+    }
@@ -0,0 +1,175 @@
+import numpy as np
+import pandas as pd
+
+from ahp_solver import priority_vector
+from pm_function import _alternatives_frame, compile_plan, score_arrays
+
+# Jumlah skenario bobot yang dinilai dalam satu blok perkalian matriks
+SAMPLE_BLOCK = 256
+
+# Ambil sampel bobot dari perturbasi penilaian pada matriks perbandingan
+def sample_judgment_weights(matrix, n_samples, sigma=0.1, rng=None, method="geometric"):
+    """Sampel bobot [S, n] dari matriks perbandingan yang penilaiannya diberi noise log-normal.
+
+    Setiap elemen segitiga atas dikalikan exp(N(0, sigma)), segitiga bawah diisi
+    kebalikannya, lalu bobot seluruh sampel dihitung sekaligus.
+    """
+    rng = np.random.default_rng(rng)
+    matrix = np.asarray(matrix, dtype=float)
+    n = matrix.shape[0]
+    upper = np.triu_indices(n, k=1)
+
+    log_samples = np.zeros((n_samples, n, n))
+    log_samples[:, upper[0], upper[1]] = np.log(matrix[upper]) + rng.normal(0.0, sigma, (n_samples, len(upper[0])))
+    log_samples -= np.swapaxes(log_samples, 1, 2)
+    weights, _ = priority_vector(np.exp(log_samples), method=method)
+    return weights
+
+# Ambil sampel bobot dari distribusi Dirichlet di sekitar bobot AHP
+def sample_dirichlet_weights(weights, n_samples, concentration=100.0, rng=None):
+    """Sampel bobot [S, n] dengan rata-rata `weights`; makin besar `concentration` makin sempit sebarannya."""
+    rng = np.random.default_rng(rng)
+    weights = np.asarray(weights, dtype=float)
+    return rng.dirichlet(weights * concentration, size=n_samples)
+
+# Gabungkan sampel bobot kriteria dan sub-kriteria menjadi bobot efektif per kolom
+def effective_weights(columns, criteria_groups, criteria_samples, sub_samples):
+    """Bobot efektif [S, m]: bobot kriteria x bobot sub-kriteria untuk setiap kolom `columns`.
+
+    `criteria_samples` berbentuk [S, jumlah kriteria] (urutan `criteria_groups`),
+    `sub_samples` berupa dict kriteria -> [S, jumlah sub-kriteria].
+    """
+    column_index = {key: j for j, key in enumerate(columns)}
+    effective = np.zeros((criteria_samples.shape[0], len(columns)))
+    for c, (criteria, sub_criteria) in enumerate(criteria_groups.items()):
+        for s, sub in enumerate(sub_criteria):
+            effective[:, column_index[sub]] = criteria_samples[:, c] * sub_samples[criteria][:, s]
+    return effective
+
+# Urutkan skor per skenario dan tandai skenario yang memiliki skor seri
+def _rank_order(scores, limit=None):
+    """(indeks `limit` skor terkecil per baris secara terurut, indeks baris yang memiliki seri)."""
+    n = scores.shape[1]
+    limit = n if limit is None else min(limit, n)
+    if limit < n:
+        # Ambil satu kandidat ekstra untuk memastikan tidak ada seri di batas potongan
+        candidates = np.argpartition(scores, limit, axis=1)[:, :limit + 1]
+    else:
+        candidates = np.broadcast_to(np.arange(n), scores.shape)
+    candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+    order = np.take_along_axis(candidates, np.argsort(candidate_scores, axis=1), axis=1)
+    ordered = np.take_along_axis(scores, order, axis=1)
+    tied = np.flatnonzero(np.any(ordered[:, 1:] == ordered[:, :-1], axis=1))
+    return order[:, :limit], tied
+
+# Peringkat per alternatif untuk satu skenario dengan skor seri (urutan input sebagai pemutus)
+def _tied_ranks(group_scores, inverse, n_ranks):
+    order = np.lexsort((np.arange(len(inverse)), group_scores[inverse]))[:n_ranks]
+    return order * n_ranks + np.arange(len(order))
+
+# Hitung probabilitas setiap alternatif menempati setiap peringkat
+def rank_acceptability(gap_matrix, effective, max_rank=None, block=None):
+    """Matriks akseptabilitas peringkat [N, R] dari bobot GAP [N, m] dan bobot efektif [S, m].
+
+    Alternatif dengan bobot GAP identik selalu seri, sehingga skor dihitung
+    sekali per baris unik dengan satu perkalian matriks per blok skenario, lalu
+    peringkatnya dibagikan ke anggota kelompok sesuai urutan input. Memori
+    sebanding dengan N x blok, bukan N x S. Jika `max_rank` diisi, hanya R
+    peringkat teratas yang dicatat dan hanya R kelompok teratas yang diurutkan.
+    """
+    gap_matrix = np.asarray(gap_matrix, dtype=float)
+    n_alternatives, n_samples = len(gap_matrix), len(effective)
+    n_ranks = n_alternatives if max_rank is None else min(int(max_rank), n_alternatives)
+    block = block or SAMPLE_BLOCK
+    counts = np.zeros(n_alternatives * n_ranks, dtype=np.int64)
+    if n_alternatives == 0 or n_ranks == 0:
+        return counts.reshape(n_alternatives, n_ranks)
+
+    unique_rows, inverse, group_sizes = np.unique(gap_matrix, axis=0, return_inverse=True, return_counts=True)
+    inverse = inverse.ravel()
+    n_groups = len(unique_rows)
+
+    # Posisi alternatif di dalam kelompoknya (urutan input)
+    by_group = np.lexsort((np.arange(n_alternatives), inverse))
+    group_start = np.cumsum(group_sizes) - group_sizes
+    within_group = np.empty(n_alternatives, dtype=np.int64)
+    within_group[by_group] = np.arange(n_alternatives) - group_start[inverse[by_group]]
+
+    # Paling banyak R kelompok teratas yang bisa menempati R peringkat teratas
+    partial = n_ranks < n_groups
+    if partial:
+        width = min(int(group_sizes.max()), n_ranks)
+        members = np.full((n_groups, width), -1, dtype=np.int64)
+        kept = within_group < width
+        members[inverse[kept], within_group[kept]] = np.flatnonzero(kept)
+    else:
+        alternative_offset = np.arange(n_alternatives) * n_ranks
+
+    for start in range(0, n_samples, block):
+        scores = -(effective[start:start + block] @ unique_rows.T)
+        order, tied = _rank_order(scores, n_ranks if partial else None)
+
+        # Peringkat awal setiap kelompok = jumlah anggota kelompok di atasnya
+        sizes_ordered = group_sizes[order]
+        first_rank = np.cumsum(sizes_ordered, axis=1) - sizes_ordered
+
+        if partial:
+            ranks = first_rank[:, :, None] + np.arange(width)
+            alternatives = members[order]
+            keep = (ranks < n_ranks) & (alternatives >= 0)
+            keep[tied] = False
+            flat = (alternatives * n_ranks + ranks)[keep]
+        else:
+            group_rank = np.empty_like(order)
+            np.put_along_axis(group_rank, order, first_rank, axis=1)
+            ranks = group_rank[:, inverse] + within_group
+            keep = ranks < n_ranks
+            keep[tied] = False
+            flat = (alternative_offset + ranks)[keep]
+
+        # Kelompok berbeda dengan skor sama: anggota diurutkan ulang per alternatif
+        if len(tied):
+            flat = np.concatenate([flat] + [_tied_ranks(scores[b], inverse, n_ranks) for b in tied])
+
+        if counts.size <= flat.size:
+            counts += np.bincount(flat, minlength=counts.size)
+        else:
+            np.add.at(counts, flat, 1)
+
+    return counts.reshape(n_alternatives, n_ranks) / max(n_samples, 1)
+
+# Fungsi utama SMAA dari hasil AHP yang tersimpan
+def smaa_from_ahp(ahp_results, alternatives, ideal_values, n_samples=10_000, sigma=0.1, max_rank=None, seed=None, block=None):
+    """Analisis akseptabilitas peringkat (SMAA) di sekitar hasil AHP.
+
+    Bobot kriteria utama dan sub-kriteria disampel dari perturbasi penilaian pada
+    matriks perbandingan (`df_main` dan `sub_matrices`). Jika matriks kriteria
+    utama tidak tersedia, bobot utama disampel dari Dirichlet di sekitar
+    `weights_main`. Mengembalikan DataFrame (index = alternatif, kolom = peringkat).
+    """
+    rng = np.random.default_rng(seed)
+    criteria_labels = list(ahp_results["criteria_labels"])
+    criteria_groups = {criteria: list(ahp_results["sub_criteria_dict"][criteria]) for criteria in criteria_labels}
+
+    if ahp_results.get("df_main"):
+        main_matrix = pd.DataFrame(ahp_results["df_main"]).loc[criteria_labels, criteria_labels].to_numpy(dtype=float)
+        criteria_samples = sample_judgment_weights(main_matrix, n_samples, sigma, rng)
+    else:
+        criteria_samples = sample_dirichlet_weights(ahp_results["weights_main"], n_samples, rng=rng)
+    sub_samples = {
+        criteria: sample_judgment_weights(ahp_results["sub_matrices"][criteria], n_samples, sigma, rng)
+        for criteria in criteria_labels
+    }
+
+    frame = _alternatives_frame(alternatives)
+    sub_weights = {sub: 1.0 for subs in criteria_groups.values() for sub in subs}
+    criteria_weights = {criteria: 1.0 for criteria in criteria_labels}
+    gap_matrix, _, _ = score_arrays(frame, compile_plan(ideal_values, criteria_groups, sub_weights, criteria_weights))
+
+    effective = effective_weights(list(frame.columns), criteria_groups, criteria_samples, sub_samples)
+    acceptability = rank_acceptability(gap_matrix, effective, max_rank=max_rank, block=block)
+    return pd.DataFrame(
+        acceptability,
+        index=pd.Index(frame.index, name="Alternatif"),
+        columns=[f"Peringkat {r}" for r in range(1, acceptability.shape[1] + 1)],
+    )